@@ -5,25 +5,55 @@ warnings.filterwarnings('ignore', message='.*PySoundFile failed.*')
 warnings.filterwarnings('ignore', message='.*audioread_load.*')
 warnings.filterwarnings('ignore', message='.*Deprecated as of librosa.*')
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from transformers import pipeline, Wav2Vec2ForSequenceClassification, Wav2Vec2FeatureExtractor
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
+from transformers import pipeline
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import torch
 import librosa
 import numpy as np
-import tempfile
 import os
 from typing import Dict, List, Optional
 import logging
-import requests
-from geopy.distance import geodesic
-import time
 import random
+import asyncio
+import hashlib
+import threading
+import json
+import re
+import time
 from dotenv import load_dotenv
 
 # RAG imports
-from rag_processor import RAGProcessor
+from rag_processor import RAGProcessor, WHISPER_AVAILABLE, preload_whisper
+from transcription import transcribe_segmented
+
+# In-memory audio decoding
+from audio_io import decode_audio_bytes
+
+# Streaming emotion detection
+from emotion_stream import PcmStreamDecoder, SlidingWindower, EmotionTimeline
+
+# Batched emotion inference
+from emotion_batcher import EmotionBatcher
+from emotion_backends import load_emotion_backend
+
+# Result caches
+from cache import TTLCache
+
+# Background/lazy model loading
+from model_registry import ModelRegistry, ModelNotReady, FAILED
+
+# Background ingestion jobs
+from jobs import IngestionJobQueue, TERMINAL_STATES
+
+# Bounded pools for blocking work
+from executors import cpu_pool, process_pool, ingest_pool, io_pool, get_pool_metrics, shutdown_pools
+from tomtom_client import TomTomClient
+from geo import nearest_resources, tile_search_area
+from resource_index import ResourceIndex, load_catalog
+from catalog_index import ServiceTypeClassifier
 
 # --- Load Environment Variables ---
 load_dotenv()
@@ -52,10 +82,15 @@ TOMTOM_API_KEY = os.getenv("TOMTOM_API_KEY")
 # WAV2VEC2 EMOTION DETECTION SETUP (FIXED!)
 # ============================================
 
-emotion_model = None
+emotion_model = None  # inference backend exposing predict(input_values, attention_mask)
 feature_extractor = None
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
+# Inference backend: torch (fp32), torch_int8 (dynamic quantization) or onnx (ONNX Runtime)
+EMOTION_BACKEND = os.getenv("EMOTION_BACKEND", "torch")
+EMOTION_ONNX_PATH = os.getenv("EMOTION_ONNX_PATH", "./models/wav2vec2-base-superb-er.onnx")
+ORT_INTRA_OP_THREADS = int(os.getenv("ORT_INTRA_OP_THREADS", "0")) or None
+
 # Emotion labels for the superb/wav2vec2-base-superb-er model
 EMOTION_LABELS = {
     0: "neutral",
@@ -64,18 +99,112 @@ EMOTION_LABELS = {
     3: "angry"
 }
 
+# Micro-batching: up to EMOTION_MAX_BATCH_SIZE clips or EMOTION_MAX_BATCH_WAIT_MS per forward pass
+EMOTION_MAX_BATCH_SIZE = int(os.getenv("EMOTION_MAX_BATCH_SIZE", "16"))
+EMOTION_MAX_BATCH_WAIT_MS = float(os.getenv("EMOTION_MAX_BATCH_WAIT_MS", "20"))
+
+emotion_batcher = None
+
+# Result cache keyed on the decoded waveform; EMOTION_CACHE_DB enables the on-disk tier
+emotion_cache = TTLCache(
+    "emotion",
+    max_entries=int(os.getenv("EMOTION_CACHE_MAX_ENTRIES", "10000")),
+    max_bytes=int(float(os.getenv("EMOTION_CACHE_MAX_MB", "16")) * 1024 * 1024),
+    ttl_seconds=float(os.getenv("EMOTION_CACHE_TTL_SECONDS", "3600")),
+    persist_path=os.getenv("EMOTION_CACHE_DB") or None
+)
+
+# Streaming mode: overlapping analysis windows over long recordings
+EMOTION_STREAM_WINDOW_SECONDS = float(os.getenv("EMOTION_STREAM_WINDOW_SECONDS", "4"))
+EMOTION_STREAM_HOP_SECONDS = float(os.getenv("EMOTION_STREAM_HOP_SECONDS", "2"))
+# Windows awaiting inference per connection before we stop reading from the socket
+EMOTION_STREAM_MAX_PENDING = int(os.getenv("EMOTION_STREAM_MAX_PENDING", "4"))
+
 # ============================================
 # RAG PROCESSOR SETUP
 # ============================================
 
 rag_processor = None
 
+# Transcription: WHISPER_MODEL_SIZE tiny|base|small, WHISPER_BACKEND auto|openai|faster
+# (auto uses int8 faster-whisper when installed). Loaded on the first audio upload
+# unless WHISPER_PRELOAD=1 warms a worker at startup.
+WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "base")
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "auto")
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "0") == "1"
+
+# Uploads are processed by background jobs persisted under INGESTION_JOBS_DIR
+INGESTION_JOBS_DIR = os.getenv("INGESTION_JOBS_DIR", "./ingestion_jobs")
+INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "2"))
+ingestion_queue = None
+
+# Batch retrieval: questions accepted per /api/retrieve/batch request
+RETRIEVE_BATCH_MAX_QUESTIONS = int(os.getenv("RETRIEVE_BATCH_MAX_QUESTIONS", "64"))
+
+# ============================================
+# MODEL LOADING
+# ============================================
+
+# MODEL_LOADING=background loads every model in parallel threads at startup;
+# MODEL_LOADING=lazy loads each model on the first request that needs it
+model_registry = ModelRegistry(lazy=os.getenv("MODEL_LOADING", "background") == "lazy")
+
 # ============================================
 # RESOURCE FINDER SETUP
 # ============================================
 
-# TomTom API Base URL
-TOMTOM_BASE_URL = "https://api.tomtom.com"
+# TomTom API Base URL (TOMTOM_BASE_URL can point at benchmarks/tomtom_stub.py for local testing)
+TOMTOM_BASE_URL = os.getenv("TOMTOM_BASE_URL", "https://api.tomtom.com")
+
+# Shared pooled client: every category/term search runs concurrently, limited by a token
+# bucket at the API key's QPS, with per-attempt timeouts and retries
+tomtom_client = TomTomClient(
+    TOMTOM_API_KEY,
+    base_url=TOMTOM_BASE_URL,
+    rate_per_second=float(os.getenv("TOMTOM_RATE_PER_SECOND", "5")),
+    burst=float(os.getenv("TOMTOM_BURST", "0")) or None,
+    timeout_seconds=float(os.getenv("TOMTOM_TIMEOUT_SECONDS", "5")),
+    max_retries=int(os.getenv("TOMTOM_MAX_RETRIES", "2")),
+    max_backoff_seconds=float(os.getenv("TOMTOM_MAX_BACKOFF_SECONDS", "5"))
+)
+
+# Geocodes are cached per normalized location string; POI results per (category, term,
+# geohash tile, radius), so users in the same tile share them. RESOURCE_CACHE_DB enables
+# the on-disk tier for both.
+RESOURCE_CACHE_DB = os.getenv("RESOURCE_CACHE_DB") or None
+RESOURCE_TILE_PRECISION = int(os.getenv("RESOURCE_TILE_PRECISION", "6"))  # ~1.2 x 0.6 km cells
+
+geocode_cache = TTLCache(
+    "geocode",
+    max_entries=int(os.getenv("GEOCODE_CACHE_MAX_ENTRIES", "10000")),
+    ttl_seconds=float(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(30 * 24 * 3600))),
+    persist_path=RESOURCE_CACHE_DB
+)
+poi_cache = TTLCache(
+    "poi",
+    max_entries=int(os.getenv("POI_CACHE_MAX_ENTRIES", "5000")),
+    max_bytes=int(float(os.getenv("POI_CACHE_MAX_MB", "32")) * 1024 * 1024),
+    ttl_seconds=float(os.getenv("POI_CACHE_TTL_SECONDS", str(24 * 3600))),
+    persist_path=RESOURCE_CACHE_DB
+)
+
+# Local spatial index, consulted before TomTom. RESOURCE_CATALOG (JSON/CSV) is loaded at
+# startup; TomTom results are added as they arrive and saved to RESOURCE_INDEX_PATH.
+# TomTom is only called for categories with fewer than RESOURCE_LOCAL_MIN_RESULTS local matches.
+# TomTom entries older than RESOURCE_MAX_AGE_SECONDS stop counting, so the area is fetched again;
+# keep it above POI_CACHE_TTL_SECONDS so the refetch reaches TomTom rather than the POI cache.
+RESOURCE_CATALOG = os.getenv("RESOURCE_CATALOG") or None
+RESOURCE_INDEX_PATH = os.getenv("RESOURCE_INDEX_PATH", "./resource_index.json")
+RESOURCE_SEARCH_RADIUS_KM = float(os.getenv("RESOURCE_SEARCH_RADIUS_KM", "10"))
+RESOURCE_LOCAL_MIN_RESULTS = int(os.getenv("RESOURCE_LOCAL_MIN_RESULTS", "5"))
+RESOURCE_INDEX_SAVE_EVERY = 200  # new resources between saves
+# Time a request waits for TomTom to fill uncovered categories before answering from the index alone
+RESOURCE_TOMTOM_DEADLINE_SECONDS = float(os.getenv("RESOURCE_TOMTOM_DEADLINE_SECONDS", "8"))
+RESOURCE_MAX_AGE_SECONDS = float(os.getenv("RESOURCE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+resource_index = ResourceIndex(max_age_seconds=RESOURCE_MAX_AGE_SECONDS)
+# Catalog rows without a category are categorised from their services (same keywords as server.py)
+classify_services = ServiceTypeClassifier()
+resource_fill_stats = {"fills": 0, "categories_skipped": 0, "deadline_exceeded": 0}
 
 # SEARCH PARAMS: Broader terms work better with TomTom
 SEARCH_PARAMS = {
@@ -96,135 +225,268 @@ class ResourceSearchRequest(BaseModel):
 class RAGQueryRequest(BaseModel):
     question: str
     conversation_history: Optional[List[Dict]] = None
+    doc_id: Optional[str] = None      # restrict retrieval to one document
+    page_from: Optional[int] = None   # restrict retrieval to a page range (inclusive)
+    page_to: Optional[int] = None
+
+class RAGBatchRetrieveRequest(BaseModel):
+    questions: List[str]
+    k: int = 3
+    doc_id: Optional[str] = None
+    page_from: Optional[int] = None
+    page_to: Optional[int] = None
 
 # ============================================
 # STARTUP: LOAD MODELS
 # ============================================
 
-@app.on_event("startup")
-async def load_models():
-    """Load Wav2Vec2 emotion model and RAG processor on startup"""
-    global emotion_model, feature_extractor, rag_processor
+def load_emotion_model():
+    """Load the Wav2Vec2 emotion model with the configured backend"""
+    global emotion_model, feature_extractor
+    
+    logger.info("Loading Wav2Vec2 emotion recognition model...")
+    
+    # FIXED: Use superb/wav2vec2-base-superb-er for emotion recognition
+    model_name = "superb/wav2vec2-base-superb-er"
     
     try:
-        logger.info("Loading Wav2Vec2 emotion recognition model...")
-        
-        # FIXED: Use superb/wav2vec2-base-superb-er for emotion recognition
-        model_name = "superb/wav2vec2-base-superb-er"
-        
-        feature_extractor = Wav2Vec2FeatureExtractor.from_pretrained(model_name)
-        emotion_model = Wav2Vec2ForSequenceClassification.from_pretrained(model_name)
-        emotion_model.to(device)
-        emotion_model.eval()
-        
-        logger.info(f"✅ Wav2Vec2 Emotion Model loaded successfully on {device}")
-        
+        extractor, backend = load_emotion_backend(
+            EMOTION_BACKEND,
+            model_name,
+            device,
+            onnx_path=EMOTION_ONNX_PATH,
+            intra_op_threads=ORT_INTRA_OP_THREADS
+        )
     except Exception as e:
-        logger.error(f"❌ Error loading Wav2Vec2 model: {str(e)}")
-        logger.info("Continuing without emotion model...")
+        if EMOTION_BACKEND == "torch":
+            raise
+        logger.error(f"❌ Could not load '{EMOTION_BACKEND}' emotion backend: {str(e)}")
+        logger.info("Falling back to PyTorch fp32 backend...")
+        extractor, backend = load_emotion_backend("torch", model_name, device)
+    
+    feature_extractor, emotion_model = extractor, backend
+    logger.info(f"✅ Wav2Vec2 Emotion Model loaded successfully ({emotion_model.name} backend on {device})")
+    return emotion_model
+
+
+def load_rag_processor():
+    """Initialize the RAG processor (embeddings model + Ollama client)"""
+    global rag_processor
     
+    logger.info("Initializing RAG Processor...")
+    rag_processor = RAGProcessor(
+        model_name="llava:7b",
+        embeddings_model="BAAI/bge-small-en-v1.5",
+        persist_directory="./chroma_db",
+        device="cpu",
+        whisper_model_size=WHISPER_MODEL_SIZE,
+        whisper_backend=WHISPER_BACKEND,
+        embed_batch_size=int(os.getenv("EMBED_BATCH_SIZE", "64")),
+        embed_workers=int(os.getenv("EMBED_WORKERS", "0")) or None,
+        pdf_chunking=os.getenv("PDF_CHUNKING", "page"),
+        pages_per_chunk=int(os.getenv("PDF_PAGES_PER_CHUNK", "1")),
+        answer_cache_size=int(os.getenv("ANSWER_CACHE_SIZE", "256")),
+        answer_cache_threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92")),
+        answer_cache_ttl=float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "0")) or None,
+        retrieval_mode=os.getenv("RETRIEVAL_MODE", "hybrid"),
+        query_embedding_cache_size=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096")),
+        context_token_budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500")),
+        history_token_budget=int(os.getenv("HISTORY_TOKEN_BUDGET", "400"))
+    )
+    logger.info("✅ RAG Processor initialized successfully")
+    return rag_processor
+
+
+def load_whisper_worker():
+    """Warm a process-pool worker with the Whisper model"""
+    if not WHISPER_AVAILABLE:
+        raise RuntimeError("Whisper model not available")
+    return process_pool.call(preload_whisper, WHISPER_MODEL_SIZE, WHISPER_BACKEND)
+
+
+model_registry.register("emotion", load_emotion_model, expected_load_seconds=15)
+model_registry.register("rag", load_rag_processor, expected_load_seconds=20)
+model_registry.register("whisper", load_whisper_worker, expected_load_seconds=20, lazy=None if WHISPER_PRELOAD else True)
+
+
+def require_model(name: str):
+    """Return a loaded model, or fail the request with 503 + Retry-After while it is unavailable"""
     try:
-        logger.info("Initializing RAG Processor...")
-        rag_processor = RAGProcessor(
-            model_name="llava:7b",
-            embeddings_model="BAAI/bge-small-en-v1.5",
-            persist_directory="./chroma_db",
-            device="cpu"
+        return model_registry.require(name)
+    except ModelNotReady as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Model '{e.name}' is {e.state}" + (f": {e.error}" if e.error else ""),
+            headers={"Retry-After": str(e.retry_after)}
         )
-        logger.info("✅ RAG Processor initialized successfully")
-    except Exception as e:
-        logger.error(f"❌ Error initializing RAG processor: {str(e)}")
-        logger.info("Continuing without RAG functionality...")
+
+
+@app.on_event("startup")
+async def load_models():
+    """Start the emotion batcher and load models in the background"""
+    global emotion_batcher
+    
+    emotion_batcher = EmotionBatcher(
+        predict_emotion_batch,
+        max_batch_size=EMOTION_MAX_BATCH_SIZE,
+        max_wait_ms=EMOTION_MAX_BATCH_WAIT_MS,
+        run_blocking=cpu_pool.run
+    )
+    await emotion_batcher.start()
+    
+    # Returns immediately; endpoints that need a model answer 503 until it is ready
+    model_registry.start()
+    
+    # Jobs interrupted by the last shutdown are resumed once their models are ready
+    global ingestion_queue
+    ingestion_queue = IngestionJobQueue(
+        INGESTION_JOBS_DIR,
+        handlers={"pdf": run_pdf_job, "audio": run_audio_job},
+        workers=INGESTION_WORKERS,
+        run_blocking=io_pool.run
+    )
+    await ingestion_queue.start()
+    
+    # Previously backfilled resources first, so curated catalog entries override them
+    for path in (RESOURCE_INDEX_PATH, RESOURCE_CATALOG):
+        if path and os.path.exists(path):
+            try:
+                added = resource_index.add_many(await io_pool.run(load_catalog, path, classify_services))
+                logger.info(f"Loaded {added} resources from {path}")
+            except Exception as e:
+                logger.error(f"❌ Could not load resource catalog {path}: {str(e)}")
+    resource_index.unsaved = 0
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background workers"""
+    if emotion_batcher is not None:
+        await emotion_batcher.stop()
+    if ingestion_queue is not None:
+        await ingestion_queue.stop()
+    await tomtom_client.aclose()
+    if resource_index.unsaved:
+        resource_index.save(RESOURCE_INDEX_PATH)
+    model_registry.shutdown()
+    shutdown_pools()
 
 
 # ============================================
 # WAV2VEC2 EMOTION DETECTION ENDPOINTS
 # ============================================
 
+def fit_clip_length(audio: np.ndarray, target_sr: int = 16000) -> np.ndarray:
+    """Trim or pad a 16 kHz waveform to the 1-6 second range Wav2Vec2 handles well"""
+    # Wav2Vec2 works better with shorter segments (3-6 seconds)
+    max_length = target_sr * 6  # 6 seconds
+    if len(audio) > max_length:
+        audio = audio[:max_length]
+    elif len(audio) < target_sr:  # Minimum 1 second
+        audio = np.pad(audio, (0, target_sr - len(audio)), mode='constant')
+    
+    return audio
+
+
 def preprocess_audio_wav2vec(audio_path: str, target_sr: int = 16000):
     """Load and preprocess audio file for Wav2Vec2 model"""
     try:
         # Load audio at 16kHz (required for Wav2Vec2)
         audio, sr = librosa.load(audio_path, sr=target_sr, mono=True)
+        return fit_clip_length(audio, target_sr), target_sr
         
-        # Wav2Vec2 works better with shorter segments (3-6 seconds)
-        max_length = target_sr * 6  # 6 seconds
-        if len(audio) > max_length:
-            audio = audio[:max_length]
-        elif len(audio) < target_sr:  # Minimum 1 second
-            audio = np.pad(audio, (0, target_sr - len(audio)), mode='constant')
-        
-        return audio, target_sr
+    except Exception as e:
+        logger.error(f"Error preprocessing audio: {str(e)}")
+        raise
+
+
+def preprocess_audio_bytes_wav2vec(data: bytes, filename: Optional[str] = None, target_sr: int = 16000):
+    """Decode uploaded audio bytes in memory and preprocess them for Wav2Vec2"""
+    try:
+        audio = decode_audio_bytes(data, filename, target_sr=target_sr)
+        return fit_clip_length(audio, target_sr), target_sr
         
     except Exception as e:
         logger.error(f"Error preprocessing audio: {str(e)}")
         raise
 
 
+def predict_emotion_batch(waveforms: List[np.ndarray], sr: int = 16000) -> List[np.ndarray]:
+    """Run one batched Wav2Vec2 forward pass over equal-length waveforms and return a probability vector per waveform"""
+    # EmotionBatcher only groups clips of the same length: padding is not masked out of the
+    # feature normalisation or the group-norm conv layer, so it would change the result
+    inputs = feature_extractor(
+        waveforms,
+        sampling_rate=sr,
+        return_tensors="np",
+        padding=True,
+        return_attention_mask=True
+    )
+    
+    probabilities = emotion_model.predict(inputs["input_values"], inputs.get("attention_mask"))
+    return list(probabilities)
+
+
+def emotion_cache_key(audio: np.ndarray) -> str:
+    """Hash of the preprocessed 16 kHz waveform, scoped to the active backend"""
+    digest = hashlib.sha256(np.ascontiguousarray(audio, dtype=np.float32).tobytes()).hexdigest()
+    return f"{emotion_model.name}:{digest}"
+
+
+def format_emotion_result(probabilities: np.ndarray) -> Dict:
+    """Map a probability vector to the /detect-emotion response fields"""
+    predicted_class_idx = int(np.argmax(probabilities))
+    confidence = float(probabilities[predicted_class_idx])
+    detected_emotion = EMOTION_LABELS.get(predicted_class_idx, "neutral")
+    
+    all_emotions = {}
+    for idx, prob in enumerate(probabilities):
+        emotion_name = EMOTION_LABELS.get(idx, f"emotion_{idx}")
+        all_emotions[emotion_name] = float(prob)
+    
+    return {
+        "emotion": detected_emotion,
+        "confidence": confidence,
+        "all_probabilities": all_emotions
+    }
+
+
 @app.post("/detect-emotion")
 async def detect_emotion(audio_file: UploadFile = File(...)) -> Dict:
     """Detect emotion from uploaded audio file using Wav2Vec2"""
-    temp_file_path = None
-    
-    if emotion_model is None or feature_extractor is None:
-        # Fallback response if model not loaded
-        logger.warning("Emotion model not loaded, returning neutral")
-        return {
-            "emotion": "neutral",
-            "confidence": 0.5,
-            "all_probabilities": {"neutral": 0.5, "happy": 0.2, "sad": 0.2, "angry": 0.1},
-            "status": "model_not_loaded"
-        }
+    require_model("emotion")
     
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-            content = await audio_file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        content = await audio_file.read()
         
         logger.info(f"Processing audio file: {audio_file.filename}")
         
-        # Preprocess audio
-        audio, sr = preprocess_audio_wav2vec(temp_file_path)
-        
-        # Extract features using Wav2Vec2 feature extractor
-        inputs = feature_extractor(
-            audio, 
-            sampling_rate=sr, 
-            return_tensors="pt",
-            padding=True
-        )
-        
-        # Move to device
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        
-        # Run inference
-        with torch.no_grad():
-            outputs = emotion_model(**inputs)
-            logits = outputs.logits
-            probabilities = torch.nn.functional.softmax(logits, dim=-1)
+        # Decode and preprocess audio in memory
+        audio, sr = await cpu_pool.run(preprocess_audio_bytes_wav2vec, content, audio_file.filename)
         
-        # Get predictions
-        predicted_class_idx = torch.argmax(probabilities, dim=-1).item()
-        confidence = probabilities[0][predicted_class_idx].item()
-        
-        # Map to emotion labels
-        detected_emotion = EMOTION_LABELS.get(predicted_class_idx, "neutral")
+        # Retries of the same recording are answered without touching the model
+        cache_key = emotion_cache_key(audio)
+        cached = emotion_cache.get(cache_key)
+        if cached is not None:
+            result = format_emotion_result(np.asarray(cached, dtype=np.float32))
+            logger.info(f"✅ Detected emotion (cached): {result['emotion']} (confidence: {result['confidence']:.2f})")
+            return {
+                **result,
+                "status": "success",
+                "cached": True
+            }
         
-        # Get all emotion probabilities
-        all_emotions = {}
-        for idx, prob in enumerate(probabilities[0].cpu().numpy()):
-            emotion_name = EMOTION_LABELS.get(idx, f"emotion_{idx}")
-            all_emotions[emotion_name] = float(prob)
+        # Queue for batched inference with other concurrent requests
+        probabilities = await emotion_batcher.submit(audio)
+        emotion_cache.set(cache_key, [float(p) for p in probabilities])
+        result = format_emotion_result(probabilities)
         
-        logger.info(f"✅ Detected emotion: {detected_emotion} (confidence: {confidence:.2f})")
+        logger.info(f"✅ Detected emotion: {result['emotion']} (confidence: {result['confidence']:.2f})")
         
         return {
-            "emotion": detected_emotion,
-            "confidence": confidence,
-            "all_probabilities": all_emotions,
-            "status": "success"
+            **result,
+            "status": "success",
+            "cached": False
         }
         
     except Exception as e:
@@ -237,62 +499,234 @@ async def detect_emotion(audio_file: UploadFile = File(...)) -> Dict:
             "status": "error",
             "error_message": str(e)
         }
+
+@app.websocket("/ws/detect-emotion")
+async def detect_emotion_stream(websocket: WebSocket):
+    """
+    Stream audio and receive a per-window emotion timeline
+    
+    Query params: encoding (pcm_s16le | pcm_f32le | wav), sample_rate, channels.
+    The client sends binary audio frames and a text frame "end" when done; the server
+    replies with one JSON message per window followed by a summary message.
+    """
+    await websocket.accept()
+    
+    try:
+        model_registry.require("emotion")
+    except ModelNotReady as e:
+        await websocket.send_json({
+            "type": "error",
+            "status": "model_not_loaded",
+            "model_state": e.state,
+            "retry_after": e.retry_after
+        })
+        await websocket.close(code=1013)
+        return
+    
+    params = websocket.query_params
+    try:
+        decoder = PcmStreamDecoder(
+            encoding=params.get("encoding", "pcm_s16le"),
+            sample_rate=int(params.get("sample_rate", 16000)),
+            channels=int(params.get("channels", 1))
+        )
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "status": "bad_request", "error_message": str(e)})
+        await websocket.close(code=1003)
+        return
+    
+    sr = decoder.target_sr
+    windower = SlidingWindower(
+        sample_rate=sr,
+        window_seconds=EMOTION_STREAM_WINDOW_SECONDS,
+        hop_seconds=EMOTION_STREAM_HOP_SECONDS
+    )
+    timeline = EmotionTimeline(EMOTION_LABELS)
+    
+    # Bounded hand-off between the receiving loop and the sender keeps memory to a few windows
+    pending: asyncio.Queue = asyncio.Queue(maxsize=EMOTION_STREAM_MAX_PENDING)
+    
+    async def handoff(item):
+        """Queue for the sender, failing fast if the sender has died instead of blocking on a full queue"""
+        if sender.done():
+            sender.result()
+            raise RuntimeError("Emotion stream sender stopped")
+        put = asyncio.ensure_future(pending.put(item))
+        done, _ = await asyncio.wait({put, sender}, return_when=asyncio.FIRST_COMPLETED)
+        if put not in done:
+            put.cancel()
+            # Surface inference/send failures instead of reading into a dead pipeline
+            sender.result()
+            raise RuntimeError("Emotion stream sender stopped")
+    
+    async def enqueue(windows):
+        for start, window in windows:
+            task = asyncio.ensure_future(emotion_batcher.submit(fit_clip_length(window, sr)))
+            try:
+                await handoff((start, len(window), task))
+            except BaseException:
+                task.cancel()
+                raise
+    
+    async def send_results():
+        index = 0
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            start, length, task = item
+            probabilities = await task
+            timeline.add(probabilities, (start + length) / sr)
+            await websocket.send_json({
+                "type": "window",
+                "index": index,
+                "start": round(start / sr, 2),
+                "end": round((start + length) / sr, 2),
+                **format_emotion_result(probabilities)
+            })
+            index += 1
+    
+    sender = asyncio.create_task(send_results())
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                await enqueue(windower.push(decoder.feed(message["bytes"])))
+            elif message.get("text") is not None and message["text"].strip().lower() == "end":
+                break
+        
+        await enqueue(windower.push(decoder.flush()))
+        await enqueue(windower.flush())
+        await handoff(None)
+        await sender
+        
+        await websocket.send_json({"type": "summary", **timeline.summary(), "status": "success"})
+        await websocket.close()
         
+    except WebSocketDisconnect:
+        logger.info("Emotion stream client disconnected")
+    except Exception as e:
+        logger.error(f"❌ Error in emotion stream: {str(e)}")
+        try:
+            await websocket.send_json({"type": "error", "status": "error", "error_message": str(e)})
+            await websocket.close(code=1011)
+        except Exception:
+            pass
     finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        if not sender.done():
+            sender.cancel()
+        while not pending.empty():
+            item = pending.get_nowait()
+            if item is not None:
+                item[2].cancel()
 
 # ============================================
 # RAG ENDPOINTS
 # ============================================
 
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def run_pdf_job(job: Dict, file_path: str, progress) -> Dict:
+    """Ingestion job: stream a stored PDF through extraction, chunking and embedding"""
+    processor = model_registry.require("rag")
+    # Pages are extracted in parallel on the process pool and streamed into chunking/embedding
+    return await ingest_pool.run(
+        processor.index_pdf_file,
+        file_path,
+        job["filename"],
+        job["content_hash"],
+        progress=progress,
+        executor=process_pool
+    )
+
+
+def read_upload(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+async def run_audio_job(job: Dict, file_path: str, progress) -> Dict:
+    """Ingestion job: transcribe speech segments in parallel worker processes, then embed the transcript"""
+    processor = model_registry.require("rag")
+    model_registry.require("whisper")
+    
+    content = await io_pool.run(read_upload, file_path)
+    
+    progress("transcribing", 0, None)
+    # ffmpeg/soundfile decode and resampling are CPU work
+    audio = await cpu_pool.run(decode_audio_bytes, content, job["filename"])
+    # VAD drops silence; each speech segment is decoded by a process-pool worker with its own Whisper model
+    result = await ingest_pool.run(
+        transcribe_segmented,
+        audio,
+        executor=process_pool,
+        model_size=WHISPER_MODEL_SIZE,
+        backend=WHISPER_BACKEND,
+        max_in_flight=process_pool.max_workers * 2,
+        progress=progress
+    )
+    progress("embedding", 0, None)
+    # Bulk chunk embedding is a long job; keep it off cpu_pool so live emotion inference is not starved
+    return await ingest_pool.run(
+        processor.index_transcript,
+        result["text"],
+        job["filename"],
+        job["content_hash"],
+        progress,
+        segments=result["segments"]
+    )
+
+
+async def enqueue_upload(kind: str, file: UploadFile) -> JSONResponse:
+    """Skip already-indexed content, otherwise queue an ingestion job and return its ID"""
+    content = await file.read()
+    content_hash = await cpu_pool.run(sha256_hex, content)
+    
+    existing = rag_processor.find_unchanged(file.filename, content_hash)
+    if existing is not None:
+        # Identical content is already indexed: nothing to process
+        logger.info(f"Skipping {file.filename}: content already indexed as {existing['filename']}")
+        return JSONResponse(RAGProcessor.unchanged_result(existing, file.filename))
+    
+    job = await ingestion_queue.submit(kind, file.filename, content, content_hash)
+    logger.info(f"Queued {kind} ingestion job {job['job_id']}: {file.filename}")
+    
+    return JSONResponse(
+        status_code=202,
+        content={
+            "success": True,
+            "status": "queued",
+            "filename": file.filename,
+            "job_id": job["job_id"],
+            "job_url": f"/api/jobs/{job['job_id']}"
+        }
+    )
+
+
 @app.post("/api/upload-document")
 async def upload_document(file: UploadFile = File(...)):
-    """Upload and process a PDF document"""
-    if rag_processor is None:
-        raise HTTPException(status_code=503, detail="RAG processor not initialized")
+    """Upload a PDF document; processing runs as a background job"""
+    require_model("rag")
     
     if not file.filename.endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
-    temp_file_path = None
-    
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        logger.info(f"Processing PDF: {file.filename}")
-        
-        # Process the PDF
-        result = rag_processor.process_pdf(temp_file_path, file.filename)
-        
-        logger.info(f"PDF processed: {result['chunks']} chunks created")
-        
-        return {
-            "success": True,
-            "filename": file.filename,
-            "chunks": result['chunks'],
-            "pages": result['pages'],
-            "doc_id": result['doc_id']
-        }
-        
+        return await enqueue_upload("pdf", file)
     except Exception as e:
-        logger.error(f"Error processing PDF: {str(e)}")
+        logger.error(f"Error queueing PDF: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-        
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
 
 
 @app.post("/api/upload-audio")
 async def upload_audio(file: UploadFile = File(...)):
-    """Upload and transcribe audio file"""
-    if rag_processor is None:
-        raise HTTPException(status_code=503, detail="RAG processor not initialized")
+    """Upload an audio file; transcription and indexing run as a background job"""
+    require_model("rag")
     
     # Check file extension
     allowed_extensions = ['.mp3', '.wav', '.m4a', '.ogg', '.flac']
@@ -302,79 +736,203 @@ async def upload_audio(file: UploadFile = File(...)):
             detail=f"Only audio files are supported: {', '.join(allowed_extensions)}"
         )
     
-    temp_file_path = None
+    # The first upload starts loading Whisper; its job waits in the queue until the model is ready
+    try:
+        model_registry.require("whisper")
+    except ModelNotReady as e:
+        if e.state == FAILED:
+            require_model("whisper")
     
     try:
-        # Save uploaded file temporarily
-        suffix = os.path.splitext(file.filename)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        logger.info(f"Processing audio: {file.filename}")
-        
-        # Process the audio (transcribe with Whisper)
-        result = rag_processor.process_audio(temp_file_path, file.filename)
-        
-        logger.info(f"Audio transcribed: {len(result['transcript'])} characters")
-        
-        return {
-            "success": True,
-            "filename": file.filename,
-            "transcript": result['transcript'],
-            "chunks": result['chunks'],
-            "doc_id": result['doc_id']
-        }
-        
+        return await enqueue_upload("audio", file)
     except Exception as e:
-        logger.error(f"Error processing audio: {str(e)}")
+        logger.error(f"Error queueing audio: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-        
-    finally:
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, stage, progress percentage and (when finished) result of an ingestion job"""
+    job = ingestion_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """Server-sent events with the job state on every change, ending when the job finishes"""
+    if ingestion_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def stream():
+        last_update = None
+        while True:
+            job = ingestion_queue.get(job_id)
+            if job is None:
+                return
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield f"data: {json.dumps(job)}\n\n"
+            if job["status"] in TERMINAL_STATES:
+                return
+            await asyncio.sleep(0.5)
+    
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @app.post("/api/query-document")
 async def query_document(request: RAGQueryRequest):
     """Query the uploaded documents"""
-    if rag_processor is None:
-        raise HTTPException(status_code=503, detail="RAG processor not initialized")
+    require_model("rag")
     
     try:
         logger.info(f"Processing query: {request.question}")
         
-        # Query the documents
-        result = rag_processor.query_documents(
+        # Query the documents (retrieval + Ollama HTTP call)
+        result = await io_pool.run(
+            rag_processor.query_documents,
             question=request.question,
-            conversation_history=request.conversation_history or []
+            conversation_history=request.conversation_history or [],
+            doc_id=request.doc_id,
+            page_from=request.page_from,
+            page_to=request.page_to
         )
-        
-        logger.info(f"Query processed successfully")
-        
-        return {
-            "success": True,
-            "answer": result['answer'],
-            "sources": result['sources']
-        }
-        
     except Exception as e:
         logger.error(f"Error querying documents: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+    
+    logger.info(f"Query processed successfully")
+    
+    # Cached answers carry no per-stage timings or context stats of their own
+    return {
+        "success": True,
+        "answer": result['answer'],
+        "sources": result['sources'],
+        "cached": result.get('cached', False),
+        "timings": result.get('timings'),
+        "context": result.get('context')
+    }
+
+
+@app.post("/api/query-document/stream")
+async def query_document_stream(request: RAGQueryRequest, http_request: Request):
+    """
+    Query the uploaded documents, streaming the answer as server-sent events
+    
+    Emits a "sources" event right after retrieval, one "token" event per generated
+    chunk, then "done" (full answer, time-to-first-token, tokens/sec) or "error".
+    If the client disconnects, generation is stopped.
+    """
+    require_model("rag")
+    
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+    
+    def produce():
+        stream = rag_processor.stream_query(
+            question=request.question,
+            conversation_history=request.conversation_history or [],
+            doc_id=request.doc_id,
+            page_from=request.page_from,
+            page_to=request.page_to
+        )
+        try:
+            for event in stream:
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(events.put_nowait, event)
+        except Exception as e:
+            logger.error(f"Error streaming query: {str(e)}")
+            loop.call_soon_threadsafe(events.put_nowait, {"type": "error", "error": str(e)})
+        finally:
+            # Closing the generator closes the Ollama HTTP stream, which stops generation
+            stream.close()
+            loop.call_soon_threadsafe(events.put_nowait, None)
+    
+    # Retrieval + Ollama streaming block, so they run on the I/O pool
+    producer = asyncio.ensure_future(io_pool.run(produce))
+    
+    async def sse():
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+                if await http_request.is_disconnected():
+                    break
+        finally:
+            # Client went away (or we are done): tell the producer to stop at the next token
+            cancelled.set()
+            if producer.done() and not producer.cancelled() and producer.exception() is not None:
+                logger.error(f"Query stream producer failed: {producer.exception()}")
+    
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/api/retrieve/batch")
+async def retrieve_batch(request: RAGBatchRetrieveRequest):
+    """
+    Retrieve the top-k chunks for several questions at once (no answer generation)
+    
+    Meant for evaluation runs and for clients prefetching follow-up questions.
+    """
+    require_model("rag")
+    
+    if not request.questions:
+        raise HTTPException(status_code=400, detail="questions must not be empty")
+    if len(request.questions) > RETRIEVE_BATCH_MAX_QUESTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {RETRIEVE_BATCH_MAX_QUESTIONS} questions per request"
+        )
+    if not 1 <= request.k <= 50:
+        raise HTTPException(status_code=400, detail="k must be between 1 and 50")
+    
+    try:
+        # One embedding forward for the whole batch, so this runs on the CPU pool
+        result = await cpu_pool.run(
+            rag_processor.retrieve_batch,
+            request.questions,
+            k=request.k,
+            doc_id=request.doc_id,
+            page_from=request.page_from,
+            page_to=request.page_to
+        )
+    except Exception as e:
+        logger.error(f"Error in batch retrieval: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["error"])
+    return result
 
 
 @app.get("/api/list-documents")
-async def list_documents():
-    """List all uploaded documents"""
-    if rag_processor is None:
-        raise HTTPException(status_code=503, detail="RAG processor not initialized")
+async def list_documents(offset: int = 0, limit: int = 100, type: Optional[str] = None):
+    """List uploaded documents, newest first (paginated with offset/limit)"""
+    require_model("rag")
+    
+    limit = max(1, min(limit, 1000))
+    offset = max(0, offset)
     
     try:
-        documents = rag_processor.list_documents()
+        documents = rag_processor.list_documents(offset=offset, limit=limit, doc_type=type)
         return {
             "success": True,
-            "documents": documents
+            "documents": documents,
+            "offset": offset,
+            "limit": limit,
+            "total": rag_processor.registry.count(doc_type=type)
         }
     except Exception as e:
         logger.error(f"Error listing documents: {str(e)}")
@@ -384,8 +942,7 @@ async def list_documents():
 @app.post("/api/clear-data")
 async def clear_data():
     """Clear all uploaded documents and vectorstore"""
-    if rag_processor is None:
-        raise HTTPException(status_code=503, detail="RAG processor not initialized")
+    require_model("rag")
     
     try:
         rag_processor.clear_all_data()
@@ -402,10 +959,10 @@ async def clear_data():
 @app.get("/api/rag-stats")
 async def get_rag_stats():
     """Get RAG system statistics"""
-    if rag_processor is None:
+    if not model_registry.is_ready("rag"):
         return {
             "success": False,
-            "message": "RAG processor not initialized"
+            "message": f"RAG processor {model_registry.state('rag')}"
         }
     
     try:
@@ -423,87 +980,85 @@ async def get_rag_stats():
 # RESOURCE FINDER ENDPOINTS
 # ============================================
 
-def get_coordinates_from_location(location: str) -> tuple:
+def normalize_location(location: str) -> str:
+    """Geocode cache key: case, punctuation and spacing do not change the place"""
+    return " ".join(re.sub(r"[^\w\s]", " ", location.lower()).split())
+
+
+async def get_coordinates_from_location(location: str) -> tuple:
     """Get lat/lon from location string using TomTom Geocoding API"""
+    cache_key = normalize_location(location)
+    cached = geocode_cache.get(cache_key)
+    if cached is not None:
+        return tuple(cached)
+    
     try:
-        geocode_url = f"{TOMTOM_BASE_URL}/search/2/geocode/{location}.json"
-        params = {
-            'key': TOMTOM_API_KEY,
-            'limit': 1
-        }
-        
-        response = requests.get(geocode_url, params=params, timeout=5)
-        response.raise_for_status()
-        
-        data = response.json()
-        if data.get('results'):
-            position = data['results'][0]['position']
-            return position['lat'], position['lon']
-        
-        return None, None
-        
+        lat, lon = await tomtom_client.geocode(location)
     except Exception as e:
         logger.error(f"Geocoding error: {str(e)}")
         return None, None
+    
+    # Failures and empty answers are not cached, so they are retried on the next request
+    if lat is not None:
+        geocode_cache.set(cache_key, [lat, lon])
+    return lat, lon
 
 
-def search_resources_tomtom(category: str, lat: float, lon: float, radius: int = 10000) -> List[Dict]:
-    """Search for resources using TomTom POI Search API"""
-    all_results = []
+def tomtom_result_to_resource(item: Dict, category: str) -> Dict:
+    poi = item.get('poi', {})
+    address = item.get('address', {})
+    position = item['position']
     
-    search_terms = SEARCH_PARAMS.get(category, SEARCH_PARAMS['healthcare'])
+    return {
+        'name': poi.get('name', 'Unknown'),
+        'category': category,
+        'address': address.get('freeformAddress', 'Address not available'),
+        'lat': position['lat'],
+        'lon': position['lon'],
+        'phone': poi.get('phone', 'N/A'),
+        'distance': None,
+        'source': 'TomTom',
+        'categorySet': poi.get('categorySet', []),
+        'fetched_at': time.time()
+    }
+
+
+async def search_resources_tomtom(category: str, lat: float, lon: float, radius: int = 10000) -> List[Dict]:
+    """Search for resources using TomTom POI Search API, all terms of the category concurrently"""
+    search_terms = SEARCH_PARAMS.get(category, SEARCH_PARAMS['healthcare'])[:3]  # Limit to 3 terms per category
     
-    for term in search_terms[:3]:  # Limit to 3 terms per category
-        try:
-            search_url = f"{TOMTOM_BASE_URL}/search/2/poiSearch/{term}.json"
-            params = {
-                'key': TOMTOM_API_KEY,
-                'lat': lat,
-                'lon': lon,
-                'radius': radius,
-                'limit': 10,
-                'view': 'Unified'
-            }
-            
-            response = requests.get(search_url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('results'):
-                for item in data['results']:
-                    poi = item.get('poi', {})
-                    address = item.get('address', {})
-                    position = item['position']
-                    
-                    resource = {
-                        'name': poi.get('name', 'Unknown'),
-                        'category': category,
-                        'address': address.get('freeformAddress', 'Address not available'),
-                        'lat': position['lat'],
-                        'lon': position['lon'],
-                        'phone': poi.get('phone', 'N/A'),
-                        'distance': None,
-                        'source': 'TomTom',
-                        'categorySet': poi.get('categorySet', [])
-                    }
-                    
-                    all_results.append(resource)
-            
-            time.sleep(0.1)  # Rate limiting
-            
-        except Exception as e:
-            logger.warning(f"Search error for term '{term}': {str(e)}")
+    # Searches run from the tile center with the radius widened to cover any point in the
+    # tile, so one cached result serves every user in it
+    tile, center_lat, center_lon, search_radius = tile_search_area(lat, lon, radius, RESOURCE_TILE_PRECISION)
+    
+    async def search_term(term: str) -> List[Dict]:
+        cache_key = f"{category}|{term}|{tile}|{radius}"
+        cached = poi_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        results = await tomtom_client.poi_search(term, center_lat, center_lon, search_radius)
+        resources = [tomtom_result_to_resource(item, category) for item in results]
+        poi_cache.set(cache_key, resources)
+        return resources
+    
+    responses = await asyncio.gather(*(search_term(term) for term in search_terms), return_exceptions=True)
+    
+    all_results = []
+    for term, results in zip(search_terms, responses):
+        if isinstance(results, Exception):
+            logger.warning(f"Search error for term '{term}': {str(results)}")
             continue
+        # Copies: distance is filled in per request and must not leak into the cache
+        all_results.extend(dict(resource) for resource in results)
     
     return all_results
 
 
 @app.post("/find-resources")
 async def find_resources(request: ResourceSearchRequest) -> Dict:
-    """Find autism/dyslexia support resources using TomTom API"""
+    """Find autism/dyslexia support resources from the local index, filling gaps with TomTom"""
     
-    if not TOMTOM_API_KEY:
+    if not TOMTOM_API_KEY and not len(resource_index):
         raise HTTPException(status_code=500, detail="TomTom API key not configured")
     
     try:
@@ -511,7 +1066,7 @@ async def find_resources(request: ResourceSearchRequest) -> Dict:
         if request.userLat and request.userLon:
             user_lat, user_lon = request.userLat, request.userLon
         else:
-            user_lat, user_lon = get_coordinates_from_location(request.location)
+            user_lat, user_lon = await get_coordinates_from_location(request.location)
             
             if not user_lat or not user_lon:
                 raise HTTPException(
@@ -529,37 +1084,61 @@ async def find_resources(request: ResourceSearchRequest) -> Dict:
         else:
             categories = [request.resourceType]
         
+        # Local index first; TomTom only for categories it cannot cover yet
+        uncovered = []
         for category in categories:
-            resources = search_resources_tomtom(category, user_lat, user_lon)
-            all_resources.extend(resources)
+            local = resource_index.within_radius(
+                user_lat, user_lon, RESOURCE_SEARCH_RADIUS_KM, category=category, limit=20
+            )
+            all_resources.extend(local)
+            if len(local) < RESOURCE_LOCAL_MIN_RESULTS:
+                uncovered.append(category)
+        local_found = len(all_resources)
         
-        # Calculate distances
-        user_location = (user_lat, user_lon)
-        for resource in all_resources:
-            resource_location = (resource['lat'], resource['lon'])
-            distance = geodesic(user_location, resource_location).kilometers
-            resource['distance'] = round(distance, 2)
-        
-        # Sort by distance
-        all_resources.sort(key=lambda x: x['distance'])
+        skipped = []
+        if uncovered and TOMTOM_API_KEY:
+            # Every category (and every term within it) is searched concurrently; categories
+            # still running at the deadline are dropped and the index answers alone
+            tasks = {
+                asyncio.ensure_future(search_resources_tomtom(
+                    category, user_lat, user_lon, int(RESOURCE_SEARCH_RADIUS_KM * 1000)
+                )): category
+                for category in uncovered
+            }
+            done, not_done = await asyncio.wait(tasks, timeout=RESOURCE_TOMTOM_DEADLINE_SECONDS)
+            for task in not_done:
+                task.cancel()
+            
+            resource_fill_stats["fills"] += 1
+            if not_done:
+                skipped = [tasks[task] for task in not_done]
+                resource_fill_stats["deadline_exceeded"] += 1
+                resource_fill_stats["categories_skipped"] += len(skipped)
+                logger.warning(
+                    f"TomTom fill exceeded {RESOURCE_TOMTOM_DEADLINE_SECONDS}s, skipped: {', '.join(skipped)}"
+                )
+            
+            fetched = [resource for task in done for resource in task.result()]
+            all_resources.extend(fetched)
+            
+            resource_index.add_many(fetched)
+            if resource_index.unsaved >= RESOURCE_INDEX_SAVE_EVERY:
+                await io_pool.run(resource_index.save, RESOURCE_INDEX_PATH)
         
-        # Remove duplicates
-        seen = set()
-        unique_resources = []
-        for resource in all_resources:
-            key = (resource['name'], resource['address'])
-            if key not in seen:
-                seen.add(key)
-                unique_resources.append(resource)
+        # Remove duplicates, compute all distances at once and keep the 20 nearest
+        nearest, total_found = nearest_resources(all_resources, user_lat, user_lon, k=20)
         
-        logger.info(f"Found {len(unique_resources)} resources")
+        logger.info(f"Found {total_found} resources")
         
         return {
             "status": "success",
             "location": request.location,
             "coordinates": {"lat": user_lat, "lon": user_lon},
-            "resources": unique_resources[:20],  # Return top 20
-            "total_found": len(unique_resources)
+            "resources": nearest,  # Top 20 by distance
+            "local_found": local_found,
+            "tomtom_categories": uncovered if TOMTOM_API_KEY else [],
+            "tomtom_skipped": skipped,
+            "total_found": total_found
         }
         
     except HTTPException:
@@ -578,12 +1157,48 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "emotion_model_loaded": emotion_model is not None,
-        "rag_processor_loaded": rag_processor is not None,
+        "models": model_registry.status(),
+        "emotion_model_loaded": model_registry.is_ready("emotion"),
+        "emotion_backend": emotion_model.name if emotion_model is not None else None,
+        "emotion_cache": {"hits": emotion_cache.hits + emotion_cache.disk_hits, "misses": emotion_cache.misses},
+        "rag_processor_loaded": model_registry.is_ready("rag"),
         "tomtom_api_configured": bool(TOMTOM_API_KEY)
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics for the inference and request pipelines"""
+    return {
+        "emotion_batcher": emotion_batcher.get_metrics() if emotion_batcher is not None else None,
+        "emotion_cache": emotion_cache.get_metrics(),
+        "ingestion_jobs": ingestion_queue.get_metrics() if ingestion_queue is not None else None,
+        "answer_streaming": rag_processor.generation_stats.get_metrics() if rag_processor is not None else None,
+        "answer_cache": (
+            rag_processor.answer_cache.get_metrics()
+            if rag_processor is not None and rag_processor.answer_cache is not None else None
+        ),
+        "retrieval": rag_processor.retrieval_stats.get_metrics() if rag_processor is not None else None,
+        "tomtom": tomtom_client.get_metrics(),
+        "resource_index": resource_index.get_metrics(),
+        "resource_fill": resource_fill_stats,
+        "resource_cache": {
+            "geocode": geocode_cache.get_metrics(),
+            "poi": poi_cache.get_metrics(),
+            "upstream_calls": tomtom_client.requests,
+            # Every geocode or POI cache hit is one TomTom request not made
+            "upstream_calls_saved": (
+                geocode_cache.hits + geocode_cache.disk_hits + poi_cache.hits + poi_cache.disk_hits
+            )
+        },
+        "query_embedding_cache": (
+            rag_processor.query_embedding_cache.get_metrics()
+            if rag_processor is not None and rag_processor.query_embedding_cache is not None else None
+        ),
+        "pools": get_pool_metrics()
+    }
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -592,11 +1207,16 @@ async def root():
         "version": "2.0",
         "endpoints": {
             "emotion_detection": "/detect-emotion",
+            "emotion_stream": "/ws/detect-emotion",
             "resource_finder": "/find-resources",
             "document_upload": "/api/upload-document",
             "audio_upload": "/api/upload-audio",
+            "ingestion_job": "/api/jobs/{job_id}",
             "query_documents": "/api/query-document",
-            "health": "/health"
+            "query_documents_stream": "/api/query-document/stream",
+            "retrieve_batch": "/api/retrieve/batch",
+            "health": "/health",
+            "metrics": "/metrics"
         }
     }
 
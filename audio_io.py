@@ -0,0 +1,141 @@
+"""
+In-memory audio decoding
+Decodes uploaded audio bytes straight into a float32 mono NumPy buffer without temp-file round trips
+"""
+
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Optional
+
+import numpy as np
+import librosa
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TARGET_SAMPLE_RATE = 16000
+
+FFMPEG_PATH = shutil.which("ffmpeg")
+
+# ISO base media files (mp4/m4a/mov/3gp) carry this box type at byte offset 4
+_ISO_BMFF_MARKER = b"ftyp"
+
+
+def needs_seeking(data: bytes) -> bool:
+    """
+    True for containers that cannot be decoded from a pipe
+
+    MP4-family files are only streamable when the 'moov' index comes before the
+    media data ('faststart'); otherwise the demuxer has to seek to the end.
+    """
+    if data[4:8] != _ISO_BMFF_MARKER:
+        return False
+    moov = data.find(b"moov")
+    mdat = data.find(b"mdat")
+    return moov == -1 or (mdat != -1 and mdat < moov)
+
+
+def _to_mono_float32(audio: np.ndarray) -> np.ndarray:
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def _decode_soundfile(data: bytes, target_sr: int) -> Optional[np.ndarray]:
+    """Decode with libsndfile from a BytesIO (wav/flac/ogg, mp3 on libsndfile >= 1.1)"""
+    if not SOUNDFILE_AVAILABLE:
+        return None
+    try:
+        audio, sr = sf.read(io.BytesIO(data), dtype="float32", always_2d=False)
+    except Exception:
+        return None
+
+    audio = _to_mono_float32(audio)
+    if sr != target_sr:
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=target_sr)
+    return audio
+
+
+def _decode_ffmpeg_pipe(data: bytes, target_sr: int) -> Optional[np.ndarray]:
+    """Decode any streamable container by piping bytes through ffmpeg"""
+    if FFMPEG_PATH is None:
+        return None
+
+    cmd = [
+        FFMPEG_PATH, "-nostdin", "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0",
+        "-f", "f32le", "-ac", "1", "-ar", str(target_sr),
+        "pipe:1"
+    ]
+    try:
+        proc = subprocess.run(cmd, input=data, capture_output=True, check=True)
+    except (subprocess.CalledProcessError, OSError) as e:
+        stderr = getattr(e, "stderr", b"") or b""
+        logger.debug(f"ffmpeg pipe decode failed: {stderr.decode(errors='ignore').strip()}")
+        return None
+
+    if not proc.stdout:
+        return None
+    return np.frombuffer(proc.stdout, dtype=np.float32).copy()
+
+
+def _decode_from_disk(data: bytes, target_sr: int, suffix: str) -> np.ndarray:
+    """Last resort for containers that need random access"""
+    temp_file_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            temp_file.write(data)
+            temp_file_path = temp_file.name
+        audio, _ = librosa.load(temp_file_path, sr=target_sr, mono=True)
+        return np.ascontiguousarray(audio, dtype=np.float32)
+    finally:
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+
+
+def decode_audio_bytes(
+    data: bytes,
+    filename: Optional[str] = None,
+    target_sr: int = TARGET_SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Decode uploaded audio bytes to float32 mono samples at target_sr
+
+    Tries libsndfile on a BytesIO first, then an ffmpeg pipe, and only writes a
+    temporary file for containers that need seeking.
+
+    Args:
+        data: Raw uploaded file content
+        filename: Original filename (used for the temp-file suffix on fallback)
+        target_sr: Output sample rate
+
+    Returns:
+        1-D float32 array
+    """
+    if not data:
+        raise ValueError("Empty audio upload")
+
+    suffix = os.path.splitext(filename)[1] if filename else ".wav"
+
+    if needs_seeking(data):
+        return _decode_from_disk(data, target_sr, suffix or ".m4a")
+
+    audio = _decode_soundfile(data, target_sr)
+    if audio is not None:
+        return audio
+
+    audio = _decode_ffmpeg_pipe(data, target_sr)
+    if audio is not None:
+        return audio
+
+    logger.info(f"In-memory decode failed for {filename or 'upload'}, falling back to disk")
+    return _decode_from_disk(data, target_sr, suffix or ".wav")
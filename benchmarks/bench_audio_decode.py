@@ -0,0 +1,84 @@
+"""
+Benchmark: in-memory audio decoding vs the temp-file + librosa.load path
+
+Usage (from the repository root):
+    python benchmarks/bench_audio_decode.py --seconds 5 --iterations 50
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import preprocess_audio_wav2vec, preprocess_audio_bytes_wav2vec  # noqa: E402
+
+
+def make_clip(seconds: float, sr: int, fmt: str) -> bytes:
+    """Synthesize a speech-like test clip and encode it"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sr)) / sr
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 3 * t)) / 2
+    audio += 0.02 * rng.standard_normal(len(t))
+    buf = io.BytesIO()
+    sf.write(buf, audio.astype(np.float32), sr, format=fmt)
+    return buf.getvalue()
+
+
+def temp_file_path(data: bytes, suffix: str):
+    """Current /detect-emotion behaviour: write the upload, re-read it, delete it"""
+    path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            temp_file.write(data)
+            path = temp_file.name
+        return preprocess_audio_wav2vec(path)[0]
+    finally:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+def in_memory_path(data: bytes, suffix: str):
+    return preprocess_audio_bytes_wav2vec(data, f"clip{suffix}")[0]
+
+
+def bench(fn, data: bytes, suffix: str, iterations: int) -> float:
+    fn(data, suffix)  # warm-up (resampler/codec initialisation)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(data, suffix)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0, help="Clip length in seconds")
+    parser.add_argument("--sample-rate", type=int, default=44100, help="Sample rate of the encoded clip")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.seconds:.1f}s clips at {args.sample_rate} Hz, {args.iterations} iterations\n")
+    print(f"{'format':<8}{'temp file (clips/s)':>22}{'in memory (clips/s)':>22}{'speedup':>10}{'max |diff|':>12}")
+
+    for fmt, suffix in (("WAV", ".wav"), ("FLAC", ".flac"), ("OGG", ".ogg")):
+        data = make_clip(args.seconds, args.sample_rate, fmt)
+
+        baseline = bench(temp_file_path, data, suffix, args.iterations)
+        candidate = bench(in_memory_path, data, suffix, args.iterations)
+
+        a = temp_file_path(data, suffix)
+        b = in_memory_path(data, suffix)
+        n = min(len(a), len(b))
+        diff = float(np.max(np.abs(a[:n] - b[:n]))) if n else 0.0
+
+        print(f"{fmt:<8}{baseline:>22.1f}{candidate:>22.1f}{candidate / baseline:>9.2f}x{diff:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
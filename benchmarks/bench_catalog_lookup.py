@@ -0,0 +1,136 @@
+"""
+Benchmark: /api/search-resources lookups, substring chain + keyword scan vs CatalogIndex
+
+Builds a synthetic catalog (50k resources across 200 areas by default, each area
+with a few aliases) and answers the same random location/type queries both ways:
+the previous per-request code path (an `in` test per alias in priority order,
+then every keyword against every service of every resource in the area) and
+catalog_index.CatalogIndex (Aho-Corasick area/keyword matching, (area, type)
+index built once). Checks that both return the same resources for every query.
+
+Usage (from the repository root):
+    python benchmarks/bench_catalog_lookup.py --resources 50000 --areas 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from catalog_index import TYPE_KEYWORDS, CatalogIndex  # noqa: E402
+
+FILLER_SERVICES = ['Home visits', 'Weekend sessions', 'Online consultations', 'Transport help', 'Sliding-scale fees']
+STREETS = ['road', 'street', 'colony', 'nagar', 'layout', 'cross', 'main']
+
+
+def make_catalog(resource_count: int, area_count: int, seed: int = 11):
+    rng = random.Random(seed)
+    keywords = [keyword for keywords in TYPE_KEYWORDS.values() for keyword in keywords]
+    areas = [f"area{i:03d} hills" for i in range(area_count)]
+    aliases = {area: [f"area{i:03d}", f"a-{i:03d}", f"zone {i:03d}"] for i, area in enumerate(areas)}
+
+    resources_by_area = {area: [] for area in areas + ['default']}
+    for i in range(resource_count):
+        area = rng.choice(areas + ['default'])
+        services = [f"{rng.choice(keywords).title()} {rng.choice(['services', 'support', 'program'])}"
+                    for _ in range(rng.randint(1, 3))]
+        services += rng.sample(FILLER_SERVICES, rng.randint(0, 2))
+        resources_by_area[area].append({
+            'id': f"r{i}",
+            'name': f"Resource {i}",
+            'address': f"{rng.randint(1, 999)} {rng.choice(STREETS)}, {area}",
+            'services': services
+        })
+    return resources_by_area, aliases
+
+
+def make_queries(aliases, count: int, seed: int = 13):
+    rng = random.Random(seed)
+    areas = list(aliases)
+    types = list(TYPE_KEYWORDS) + ['all']
+    queries = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.2:
+            location = rng.choice(areas)
+        elif roll < 0.9:
+            location = f"{rng.randint(1, 99)} {rng.choice(STREETS)} near {rng.choice(aliases[rng.choice(areas)])}, hyderabad"
+        else:
+            location = f"{rng.randint(1, 99)} {rng.choice(STREETS)}, secunderabad"
+        queries.append((location, rng.choice(types)))
+    return queries
+
+
+def linear_search(resources_by_area, aliases, location, resource_type):
+    """The previous search_resources/filter_by_type code path, generalised to many areas"""
+    if location in resources_by_area:
+        resources = resources_by_area[location]
+    else:
+        resources = resources_by_area['default']
+        for area, area_aliases in aliases.items():
+            if any(alias in location for alias in area_aliases):
+                resources = resources_by_area[area]
+                break
+    if resource_type == 'all':
+        return resources
+
+    keywords = TYPE_KEYWORDS.get(resource_type, [])
+    filtered_results = []
+    for resource in resources:
+        for service in resource.get('services', []):
+            if any(keyword.lower() in service.lower() for keyword in keywords):
+                filtered_results.append(resource)
+                break
+    return filtered_results
+
+
+def timed(fn, queries, repeats):
+    walls = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        results = [fn(location, resource_type) for location, resource_type in queries]
+        walls.append(time.perf_counter() - started)
+    return results, walls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resources", type=int, default=50000)
+    parser.add_argument("--areas", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    resources_by_area, aliases = make_catalog(args.resources, args.areas)
+    queries = make_queries(aliases, args.queries)
+
+    started = time.perf_counter()
+    catalog = CatalogIndex(resources_by_area, aliases, TYPE_KEYWORDS)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    baseline, baseline_walls = timed(
+        lambda location, resource_type: linear_search(resources_by_area, aliases, location, resource_type),
+        queries, args.repeats
+    )
+    indexed, indexed_walls = timed(catalog.search, queries, args.repeats)
+
+    print(f"{args.resources} resources, {args.areas} areas, {args.queries} queries; index built in {build_ms:.0f} ms\n")
+    for label, walls in (("linear scan", baseline_walls), ("CatalogIndex", indexed_walls)):
+        per_query_us = statistics.median(walls) / args.queries * 1e6
+        print(f"{label:<13} median {statistics.median(walls) * 1000:>9.2f} ms   {per_query_us:>9.1f} us/query")
+    print(f"\nspeedup: {statistics.median(baseline_walls) / statistics.median(indexed_walls):.1f}x")
+
+    mismatched = sum(
+        [r['id'] for r in expected] != [r['id'] for r in actual]
+        for expected, actual in zip(baseline, indexed)
+    )
+    print("results match" if not mismatched else f"RESULT MISMATCH in {mismatched} queries")
+    sys.exit(0 if not mismatched else 1)
+
+
+if __name__ == "__main__":
+    main()
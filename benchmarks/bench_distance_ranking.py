@@ -0,0 +1,113 @@
+"""
+Benchmark: find_resources ranking, geodesic loop vs vectorized haversine + top-k
+
+Generates synthetic POIs around a point (10k by default, ~10% duplicates as
+several search terms return the same place) and ranks them both ways: the
+previous per-resource geopy geodesic loop with a full sort and dedup, and
+geo.nearest_resources (hash dedup, NumPy haversine, argpartition). Checks that
+both return the same places with distances within tolerance.
+
+Usage (from the repository root):
+    python benchmarks/bench_distance_ranking.py --pois 10000 --k 20
+"""
+
+import argparse
+import copy
+import os
+import random
+import statistics
+import sys
+import time
+
+from geopy.distance import geodesic
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geo import nearest_resources  # noqa: E402
+
+CENTER = (17.385, 78.4867)
+
+
+def make_pois(count: int, duplicate_share: float, seed: int = 7):
+    rng = random.Random(seed)
+    pois = []
+    for i in range(count):
+        if pois and rng.random() < duplicate_share:
+            pois.append(dict(rng.choice(pois)))
+            continue
+        pois.append({
+            'name': f"Resource {i}",
+            'category': 'healthcare',
+            'address': f"{rng.randint(1, 999)} Road {i}, Hyderabad",
+            'lat': CENTER[0] + rng.uniform(-0.3, 0.3),
+            'lon': CENTER[1] + rng.uniform(-0.3, 0.3),
+            'phone': 'N/A',
+            'distance': None,
+            'source': 'TomTom'
+        })
+    return pois
+
+
+def geodesic_ranking(resources, lat, lon, k):
+    """The previous find_resources code path"""
+    user_location = (lat, lon)
+    for resource in resources:
+        resource['distance'] = round(geodesic(user_location, (resource['lat'], resource['lon'])).kilometers, 2)
+    resources.sort(key=lambda x: x['distance'])
+    seen = set()
+    unique_resources = []
+    for resource in resources:
+        key = (resource['name'], resource['address'])
+        if key not in seen:
+            seen.add(key)
+            unique_resources.append(resource)
+    return unique_resources[:k], len(unique_resources)
+
+
+def timed(fn, pois, args):
+    walls = []
+    for _ in range(args.repeats):
+        data = copy.deepcopy(pois)
+        started = time.perf_counter()
+        result = fn(data, CENTER[0], CENTER[1], args.k)
+        walls.append(time.perf_counter() - started)
+    return result, walls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pois", type=int, default=10000)
+    parser.add_argument("--duplicates", type=float, default=0.1, help="Share of duplicate POIs")
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=0.005, help="Allowed relative distance difference")
+    args = parser.parse_args()
+
+    pois = make_pois(args.pois, args.duplicates)
+    (baseline, baseline_total), baseline_walls = timed(geodesic_ranking, pois, args)
+    (vectorized, vectorized_total), vectorized_walls = timed(nearest_resources, pois, args)
+
+    print(f"{args.pois} POIs, top {args.k}\n")
+    for label, walls in (("geodesic loop", baseline_walls), ("vectorized", vectorized_walls)):
+        print(f"{label:<15} median {statistics.median(walls) * 1000:>9.2f} ms   min {min(walls) * 1000:>9.2f} ms")
+    print(f"\nspeedup: {statistics.median(baseline_walls) / statistics.median(vectorized_walls):.1f}x")
+
+    # Rankings may only differ where two distances are closer than the haversine error
+    reference = {(r['name'], r['address']): r['distance'] for r in baseline}
+    mismatched = [r for r in vectorized if (r['name'], r['address']) not in reference]
+    kth = baseline[-1]['distance']
+    ok = baseline_total == vectorized_total and all(
+        abs(r['distance'] - kth) <= args.tolerance * kth + 0.01 for r in mismatched
+    )
+    errors = [
+        abs(r['distance'] - reference[(r['name'], r['address'])])
+        for r in vectorized if (r['name'], r['address']) in reference
+    ]
+    print(f"unique: {baseline_total} vs {vectorized_total}, top-{args.k} differences: {len(mismatched)}, "
+          f"max distance difference: {max(errors) if errors else 0:.3f} km")
+    print("ranking matches within tolerance" if ok else "RANKING MISMATCH")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark and accuracy-parity check for the emotion model backends
+
+Runs every backend over the same fixed clip set, compares predictions against
+PyTorch fp32 and reports latency/throughput. Exits non-zero if a backend's top-1
+agreement with fp32 falls below --min-agreement.
+
+Usage (from the repository root):
+    python benchmarks/bench_emotion_backends.py --clips path/to/clips --batch-size 8
+    python benchmarks/bench_emotion_backends.py              # seeded synthetic clips
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_io import decode_audio_bytes  # noqa: E402
+from emotion_backends import BACKENDS, load_emotion_backend  # noqa: E402
+
+MODEL_NAME = "superb/wav2vec2-base-superb-er"
+SR = 16000
+
+
+def load_clips(clips_dir, count: int):
+    """Load audio files from a directory, or synthesize a deterministic clip set"""
+    if clips_dir:
+        paths = sorted(
+            p for p in glob.glob(os.path.join(clips_dir, "*"))
+            if p.lower().endswith((".wav", ".flac", ".ogg", ".mp3", ".m4a"))
+        )
+        clips = []
+        for path in paths[:count]:
+            with open(path, "rb") as f:
+                clips.append(decode_audio_bytes(f.read(), path)[:SR * 6])
+        return clips
+
+    rng = np.random.default_rng(1234)
+    clips = []
+    for _ in range(count):
+        seconds = rng.uniform(1.0, 6.0)
+        t = np.arange(int(seconds * SR)) / SR
+        f0 = rng.uniform(100, 300)
+        envelope = (1 + np.sin(2 * np.pi * rng.uniform(2, 6) * t)) / 2
+        audio = 0.3 * envelope * np.sin(2 * np.pi * f0 * t) + 0.03 * rng.standard_normal(len(t))
+        clips.append(audio.astype(np.float32))
+    return clips
+
+
+def run_backend(backend, feature_extractor, clips, batch_size: int):
+    """Return (probabilities, per-batch latencies in seconds)"""
+    outputs, latencies = [], []
+    for i in range(0, len(clips), batch_size):
+        batch = clips[i:i + batch_size]
+        start = time.perf_counter()
+        inputs = feature_extractor(
+            batch, sampling_rate=SR, return_tensors="np", padding=True, return_attention_mask=True
+        )
+        outputs.append(backend.predict(inputs["input_values"], inputs.get("attention_mask")))
+        latencies.append(time.perf_counter() - start)
+    return np.concatenate(outputs), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clips", help="Directory of audio clips (default: 32 synthetic clips)")
+    parser.add_argument("--count", type=int, default=32, help="Number of clips to use")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--onnx-path", default="./models/wav2vec2-base-superb-er.onnx")
+    parser.add_argument("--threads", type=int, default=None, help="ONNX Runtime intra-op threads")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    device = torch.device("cpu")
+    clips = load_clips(args.clips, args.count)
+    total_audio = sum(len(c) for c in clips) / SR
+    print(f"{len(clips)} clips, {total_audio:.1f}s of audio, batch size {args.batch_size}\n")
+
+    reference = None
+    failed = False
+    print(f"{'backend':<12}{'p50 ms':>10}{'p95 ms':>10}{'clips/s':>10}{'top-1 agree':>13}{'max |dp|':>10}")
+
+    # fp32 always runs first: it is the parity reference
+    backends = ["torch"] + [b for b in args.backends.split(",") if b and b != "torch"]
+    for name in backends:
+        try:
+            feature_extractor, backend = load_emotion_backend(
+                name, MODEL_NAME, device, onnx_path=args.onnx_path, intra_op_threads=args.threads
+            )
+        except Exception as e:
+            print(f"{name:<12}unavailable: {e}")
+            continue
+
+        run_backend(backend, feature_extractor, clips[:args.batch_size], args.batch_size)  # warm-up
+        probs, latencies = run_backend(backend, feature_extractor, clips, args.batch_size)
+
+        if reference is None:
+            reference = probs
+        agreement = float(np.mean(np.argmax(probs, axis=1) == np.argmax(reference, axis=1)))
+        max_diff = float(np.max(np.abs(probs - reference)))
+        if agreement < args.min_agreement:
+            failed = True
+
+        lat_ms = np.array(latencies) * 1000
+        throughput = len(clips) / sum(latencies)
+        print(
+            f"{name:<12}{np.percentile(lat_ms, 50):>10.1f}{np.percentile(lat_ms, 95):>10.1f}"
+            f"{throughput:>10.1f}{agreement:>12.1%}{max_diff:>11.4f}"
+        )
+
+    if failed:
+        print(f"\nParity check FAILED: a backend agreed with fp32 on fewer than {args.min_agreement:.0%} of clips")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark: streaming/parallel PDF extraction vs the join-everything-then-split path
+
+Generates a synthetic text PDF (500 pages by default), then runs each path in a
+fresh subprocess and reports wall time, peak RSS and chunk count for
+extraction + chunking (embedding is identical in both paths and left out).
+
+Usage (from the repository root):
+    python benchmarks/bench_pdf_extraction.py --pages 500 --workers 4
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = (
+    "autism support therapy speech occupational sensory learning dyslexia reading "
+    "assessment intervention parent coaching classroom routine visual schedule "
+    "communication social skills development progress report session goals"
+).split()
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 45):
+    """Write a minimal multi-page PDF with Helvetica text on every page"""
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # filled in below
+    page_ids = []
+
+    for p in range(pages):
+        lines = []
+        for l in range(lines_per_page):
+            words = [WORDS[(p * 7 + l * 3 + i) % len(WORDS)] for i in range(12)]
+            lines.append(f"Page {p + 1} line {l + 1}: " + " ".join(words))
+        stream = "BT /F1 9 Tf 40 800 Td 11 TL " + " ".join(f"({line}) '" for line in lines) + " ET"
+        data = stream.encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def make_splitter():
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+    except ImportError:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+    return RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200, length_function=len)
+
+
+def run_baseline(pdf_path: str) -> int:
+    """Previous process_pdf behaviour: every page into one string, then split"""
+    from pypdf import PdfReader
+    try:
+        from langchain_core.documents import Document
+    except ImportError:
+        from langchain.schema.document import Document
+
+    reader = PdfReader(pdf_path)
+    all_text = []
+    for i, page in enumerate(reader.pages):
+        text = page.extract_text()
+        if text.strip():
+            all_text.append(f"[Page {i + 1}]\n{text}")
+    full_text = "\n\n".join(all_text)
+    documents = [Document(page_content=full_text, metadata={"source": "bench.pdf"})]
+    return len(make_splitter().split_documents(documents))
+
+
+def run_streaming(pdf_path: str, workers: int) -> int:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from pdf_stream import iter_pdf_pages, iter_text_chunks
+
+    executor = None
+    if workers > 0:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        pages = iter_pdf_pages(pdf_path, executor=executor, max_in_flight=workers * 2 or 1)
+        # Chunks are consumed one by one, as the embedding pipeline would
+        return sum(1 for _ in iter_text_chunks(pages, make_splitter(), {"source": "bench.pdf"}))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def child(mode: str, pdf_path: str, workers: int):
+    start = time.perf_counter()
+    chunks = run_baseline(pdf_path) if mode == "baseline" else run_streaming(pdf_path, workers)
+    wall = time.perf_counter() - start
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(json.dumps({"wall": wall, "rss_kb": self_rss, "worker_rss_kb": children_rss, "chunks": chunks}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4, help="Extraction processes for the streaming path (0 = serial)")
+    parser.add_argument("--child", choices=["baseline", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--pdf", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.pdf, args.workers)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "bench.pdf")
+        make_pdf(pdf_path, args.pages)
+        print(f"Synthetic PDF: {args.pages} pages, {os.path.getsize(pdf_path) / 1e6:.1f} MB\n")
+        print(f"{'path':<22}{'wall s':>10}{'peak RSS MB':>14}{'worker RSS MB':>15}{'chunks':>9}")
+
+        runs = [("baseline", 0), ("streaming (serial)", 0), (f"streaming ({args.workers} procs)", args.workers)]
+        for label, workers in runs:
+            mode = "baseline" if label == "baseline" else "streaming"
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--pdf", pdf_path, "--workers", str(workers)],
+                capture_output=True, text=True, check=True
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            worker_rss = f"{r['worker_rss_kb'] / 1024:.1f}" if workers else "-"
+            print(f"{label:<22}{r['wall']:>10.2f}{r['rss_kb'] / 1024:>14.1f}{worker_rss:>15}{r['chunks']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: Ollama prefill time with and without the context token budget
+
+Retrieves context for each question from the existing vector store, builds the
+prompt twice (all k chunks concatenated as before vs. the budgeted, de-duplicated
+and merged context) and sends both to Ollama with a one-token generation. Ollama
+reports prompt tokens and prompt evaluation (prefill) time, which are compared.
+
+Each prompt starts with a unique request line so Ollama cannot reuse the KV cache
+of the previous prompt and under-report prefill.
+
+Usage (from the repository root, with Ollama running and documents indexed):
+    python benchmarks/bench_prefill.py --questions questions.txt --k 4 --budget 1500
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import uuid
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from context_budget import ContextAssembler  # noqa: E402
+from rag_processor import RAGProcessor  # noqa: E402
+
+DEFAULT_QUESTIONS = [
+    "What strategies help with sensory overload in the classroom?",
+    "How is dyslexia assessed?",
+    "What does the report say about speech therapy progress?",
+    "Which visual supports are recommended for daily routines?",
+    "What are the goals for the next therapy session?"
+]
+
+
+def prefill(ollama_url: str, model: str, prompt: str) -> dict:
+    response = requests.post(
+        f"{ollama_url}/api/generate",
+        json={
+            "model": model,
+            "prompt": f"Request {uuid.uuid4().hex}\n{prompt}",
+            "stream": False,
+            "options": {"num_predict": 1, "temperature": 0}
+        },
+        timeout=600
+    )
+    response.raise_for_status()
+    data = response.json()
+    return {
+        "prompt_tokens": data.get("prompt_eval_count", 0),
+        "prefill_ms": data.get("prompt_eval_duration", 0) / 1e6
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", help="Text file with one question per line")
+    parser.add_argument("--k", type=int, default=4, help="Chunks retrieved per question")
+    parser.add_argument("--budget", type=int, default=1500, help="Context token budget")
+    parser.add_argument("--model", default="llava:7b")
+    parser.add_argument("--ollama-url", default="http://localhost:11434")
+    parser.add_argument("--persist-directory", default="./chroma_db")
+    args = parser.parse_args()
+
+    questions = DEFAULT_QUESTIONS
+    if args.questions:
+        with open(args.questions) as f:
+            questions = [line.strip() for line in f if line.strip()]
+
+    processor = RAGProcessor(
+        model_name=args.model,
+        persist_directory=args.persist_directory,
+        answer_cache_size=0,
+        context_token_budget=args.budget
+    )
+    if processor.vectorstore is None:
+        sys.exit(f"No documents indexed in {args.persist_directory}")
+
+    # The pre-budget prompt: every chunk, no de-duplication or merging, no limit
+    unbounded = ContextAssembler(max_tokens=10 ** 9, duplicate_threshold=2.0, merge_adjacent=False)
+    budgeted = processor.context_assembler
+
+    # Warm the model so the first measurement does not include loading it
+    prefill(args.ollama_url, args.model, "Hello")
+
+    results = {"before": [], "after": []}
+    print(f"{'question':<42}{'before tok':>11}{'before ms':>11}{'after tok':>11}{'after ms':>11}")
+    for question in questions:
+        row = {}
+        for label, assembler in (("before", unbounded), ("after", budgeted)):
+            processor.context_assembler = assembler
+            prepared = processor._prepare_query(question, [], args.k, None, None, None)
+            if "prompt" not in prepared:
+                break
+            row[label] = prefill(args.ollama_url, args.model, prepared["prompt"])
+            results[label].append(row[label])
+        if len(row) < 2:
+            print(f"{question[:40]:<42}{'no context retrieved':>44}")
+            continue
+        print(
+            f"{question[:40]:<42}"
+            f"{row['before']['prompt_tokens']:>11}{row['before']['prefill_ms']:>11.0f}"
+            f"{row['after']['prompt_tokens']:>11}{row['after']['prefill_ms']:>11.0f}"
+        )
+
+    if results["after"]:
+        print()
+        for label in ("before", "after"):
+            tokens = [r["prompt_tokens"] for r in results[label]]
+            ms = [r["prefill_ms"] for r in results[label]]
+            print(
+                f"{label:<7} mean prompt tokens {statistics.mean(tokens):>7.0f}   "
+                f"mean prefill {statistics.mean(ms):>7.0f} ms   max prefill {max(ms):>7.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
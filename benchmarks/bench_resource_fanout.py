@@ -0,0 +1,118 @@
+"""
+Benchmark: resource-finder fan-out, sequential requests vs the pooled async client
+
+Starts the TomTom stub locally and runs an "all" search (4 categories x 3 terms)
+both ways: the previous loop of blocking requests.get calls with a 0.1 s sleep
+after each, and TomTomClient running every search concurrently under its token
+bucket. Reports wall time per search and client metrics.
+
+Usage (from the repository root):
+    python benchmarks/bench_resource_fanout.py --latency-ms 150 --rounds 5
+    python benchmarks/bench_resource_fanout.py --error-rate 0.1 --stub-qps 5 --rate 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tomtom_client import TomTomClient  # noqa: E402
+from tomtom_stub import start_stub  # noqa: E402
+
+SEARCH_PARAMS = {
+    'healthcare': ['Autism', 'Psychiatrist', 'Psychologist'],
+    'education': ['Special Education', 'Learning Center', 'Dyslexia'],
+    'community': ['Rehabilitation', 'Social Service', 'Community Center'],
+    'therapy': ['Speech Therapy', 'Occupational Therapy', 'Physiotherapy']
+}
+LAT, LON = 17.385, 78.4867
+
+
+def sequential_search(base_url: str) -> int:
+    """The previous implementation: one blocking request per term, 0.1 s apart"""
+    found = 0
+    for terms in SEARCH_PARAMS.values():
+        for term in terms:
+            try:
+                response = requests.get(
+                    f"{base_url}/search/2/poiSearch/{term}.json",
+                    params={"key": "stub", "lat": LAT, "lon": LON, "radius": 10000, "limit": 10, "view": "Unified"},
+                    timeout=5
+                )
+                response.raise_for_status()
+                found += len(response.json().get("results", []))
+                time.sleep(0.1)
+            except Exception:
+                continue
+    return found
+
+
+async def concurrent_search(client: TomTomClient) -> int:
+    responses = await asyncio.gather(
+        *(client.poi_search(term, LAT, LON) for terms in SEARCH_PARAMS.values() for term in terms),
+        return_exceptions=True
+    )
+    return sum(len(r) for r in responses if not isinstance(r, Exception))
+
+
+async def run_concurrent(base_url: str, args) -> list:
+    client = TomTomClient("stub", base_url=base_url, rate_per_second=args.rate, burst=args.burst or None)
+    timings = []
+    try:
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            found = await concurrent_search(client)
+            timings.append((time.perf_counter() - started, found))
+            await asyncio.sleep(1.0)  # let the bucket refill between rounds
+    finally:
+        await client.aclose()
+    print(f"client metrics: {client.get_metrics()}")
+    return timings
+
+
+def report(label: str, timings: list):
+    walls = [wall for wall, _ in timings]
+    print(
+        f"{label:<12} mean {statistics.mean(walls) * 1000:>8.0f} ms   "
+        f"min {min(walls) * 1000:>8.0f} ms   POIs/search {timings[-1][1]}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="Stub response latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub share of 503 responses")
+    parser.add_argument("--stub-qps", type=float, default=0.0, help="Stub QPS limit (0 = unlimited)")
+    parser.add_argument("--rate", type=float, default=20.0, help="Client token-bucket rate")
+    parser.add_argument("--burst", type=float, default=0.0, help="Client burst (0 = rate)")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    server, state = start_stub(latency_ms=args.latency_ms, error_rate=args.error_rate, qps=args.stub_qps)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    print(f"Stub at {base_url}: latency {args.latency_ms:.0f} ms, error rate {args.error_rate}, qps {args.stub_qps or '-'}\n")
+
+    sequential = []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        found = sequential_search(base_url)
+        sequential.append((time.perf_counter() - started, found))
+
+    concurrent = asyncio.run(run_concurrent(base_url, args))
+
+    print()
+    report("sequential", sequential)
+    report("concurrent", concurrent)
+    print(f"\nstub: {state.requests} requests, {state.rejected} rejected with 429")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: real-time factor of the transcription backends
+
+Transcribes the same fixed audio set with every installed backend and model size
+and reports load time, wall time and real-time factor (processing seconds per
+second of audio; below 1.0 is faster than real time).
+
+Usage (from the repository root):
+    python benchmarks/bench_whisper_rtf.py --audio path/to/recordings
+    python benchmarks/bench_whisper_rtf.py --audio path/to/recordings --backends faster --sizes tiny base --threads 4
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_io import TARGET_SAMPLE_RATE, decode_audio_bytes  # noqa: E402
+from whisper_backends import (  # noqa: E402
+    FASTER_WHISPER_AVAILABLE,
+    MODEL_SIZES,
+    OPENAI_WHISPER_AVAILABLE,
+    load_whisper_backend
+)
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".mp3", ".m4a")
+
+
+def load_audio_set(audio_dir: str, limit: int):
+    paths = sorted(
+        p for p in glob.glob(os.path.join(audio_dir, "*"))
+        if p.lower().endswith(AUDIO_EXTENSIONS)
+    )[:limit]
+    clips = []
+    for path in paths:
+        with open(path, "rb") as f:
+            clips.append((os.path.basename(path), decode_audio_bytes(f.read(), path)))
+    return clips
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio", required=True, help="Directory with the fixed audio set")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of files")
+    parser.add_argument("--backends", nargs="+", default=["openai", "faster"], choices=["openai", "faster"])
+    parser.add_argument("--sizes", nargs="+", default=list(MODEL_SIZES), choices=MODEL_SIZES)
+    parser.add_argument("--threads", type=int, default=0, help="faster-whisper CPU threads (0 = default)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed transcriptions before measuring")
+    args = parser.parse_args()
+
+    clips = load_audio_set(args.audio, args.limit)
+    if not clips:
+        sys.exit(f"No audio files found in {args.audio}")
+    audio_seconds = sum(len(audio) for _, audio in clips) / TARGET_SAMPLE_RATE
+    print(f"Audio set: {len(clips)} files, {audio_seconds:.1f}s total\n")
+
+    available = {"openai": OPENAI_WHISPER_AVAILABLE, "faster": FASTER_WHISPER_AVAILABLE}
+    print(f"{'backend':<10}{'size':<8}{'load s':>9}{'wall s':>10}{'RTF':>8}{'words':>8}")
+
+    for backend in args.backends:
+        if not available[backend]:
+            print(f"{backend:<10}{'-':<8}{'not installed':>43}")
+            continue
+        for size in args.sizes:
+            started = time.perf_counter()
+            model = load_whisper_backend(backend, size, cpu_threads=args.threads)
+            load_seconds = time.perf_counter() - started
+
+            for _, audio in clips[:args.warmup]:
+                model.transcribe(audio[:TARGET_SAMPLE_RATE * 10])
+
+            words = 0
+            started = time.perf_counter()
+            for _, audio in clips:
+                words += len(model.transcribe(audio)["text"].split())
+            wall = time.perf_counter() - started
+
+            print(f"{backend:<10}{size:<8}{load_seconds:>9.2f}{wall:>10.2f}{wall / audio_seconds:>8.3f}{words:>8}")
+            del model
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Local stub of the TomTom Search API (geocode + POI search) for tests and benchmarks
+
+Serves the same paths and response shape as api.tomtom.com with deterministic
+synthetic POIs around the requested point, plus configurable latency, error rate
+and a QPS limit answered with 429 like the real API.
+
+Usage (from the repository root):
+    python benchmarks/tomtom_stub.py --port 8089 --latency-ms 150 --qps 5
+    TOMTOM_BASE_URL=http://127.0.0.1:8089 TOMTOM_API_KEY=stub uvicorn app:app
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+# Geocoded when the query matches no entry: central Hyderabad
+DEFAULT_POSITION = (17.385, 78.4867)
+
+KNOWN_LOCATIONS = {
+    "hyderabad": (17.385, 78.4867),
+    "banjara hills": (17.4156, 78.4347),
+    "gachibowli": (17.4401, 78.3489),
+    "secunderabad": (17.4399, 78.4983)
+}
+
+
+class StubState:
+    def __init__(
+        self,
+        latency_ms: float,
+        jitter_ms: float,
+        error_rate: float,
+        qps: float,
+        results: int,
+        retry_after: int = 1
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.qps = qps
+        self.results = results
+        self.retry_after = retry_after
+        self.requests = 0
+        self.rejected = 0
+        self._window = []
+        self._lock = threading.Lock()
+
+    def admit(self) -> bool:
+        """Sliding one-second window, like a per-key QPS limit"""
+        with self._lock:
+            self.requests += 1
+            if not self.qps:
+                return True
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 1.0]
+            if len(self._window) >= self.qps:
+                self.rejected += 1
+                return False
+            self._window.append(now)
+            return True
+
+
+def make_pois(term: str, lat: float, lon: float, radius: int, count: int):
+    """Deterministic POIs for (term, rounded position) scattered within the radius"""
+    seed = hashlib.sha256(f"{term}:{lat:.3f}:{lon:.3f}".encode()).digest()
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        distance = rng.uniform(0.05, 1.0) * radius
+        bearing = rng.uniform(0, 2 * math.pi)
+        d_lat = distance * math.cos(bearing) / 111320
+        d_lon = distance * math.sin(bearing) / (111320 * max(0.01, math.cos(math.radians(lat))))
+        results.append({
+            "type": "POI",
+            "id": f"stub-{seed.hex()[:8]}-{i}",
+            "poi": {
+                "name": f"{term} Centre {i + 1}",
+                "phone": f"+91 90000 {rng.randint(10000, 99999)}",
+                "categorySet": [{"id": 7321}]
+            },
+            "address": {"freeformAddress": f"{rng.randint(1, 999)} Stub Road, Hyderabad"},
+            "position": {"lat": round(lat + d_lat, 6), "lon": round(lon + d_lon, 6)},
+            "dist": round(distance, 1)
+        })
+    return results
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # concurrent fan-out would otherwise overflow the listen backlog
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up before the (delayed) answer is written
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: dict):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            if status == 429:
+                self.send_header("Retry-After", str(state.retry_after))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            time.sleep(max(0.0, state.latency_ms + random.uniform(-state.jitter_ms, state.jitter_ms)) / 1000)
+
+            if "key" not in query:
+                return self._send(403, {"errorText": "Missing key"})
+            if not state.admit():
+                return self._send(429, {"errorText": "Too Many Requests"})
+            if state.error_rate and random.random() < state.error_rate:
+                return self._send(503, {"errorText": "Service Unavailable"})
+
+            parts = url.path.split("/")
+            if url.path.startswith("/search/2/geocode/") and url.path.endswith(".json"):
+                location = unquote(parts[-1][:-len(".json")]).lower()
+                lat, lon = next(
+                    (position for name, position in KNOWN_LOCATIONS.items() if name in location),
+                    DEFAULT_POSITION
+                )
+                return self._send(200, {"results": [{"position": {"lat": lat, "lon": lon}}]})
+
+            if url.path.startswith("/search/2/poiSearch/") and url.path.endswith(".json"):
+                term = unquote(parts[-1][:-len(".json")])
+                lat, lon = float(query["lat"]), float(query["lon"])
+                count = min(int(query.get("limit", 10)), state.results)
+                pois = make_pois(term, lat, lon, int(query.get("radius", 10000)), count)
+                return self._send(200, {"summary": {"numResults": len(pois)}, "results": pois})
+
+            self._send(404, {"errorText": "Not found"})
+
+    return Handler
+
+
+def start_stub(
+    port: int = 0,
+    latency_ms: float = 150.0,
+    jitter_ms: float = 30.0,
+    error_rate: float = 0.0,
+    qps: float = 0.0,
+    results: int = 10,
+    retry_after: int = 1
+):
+    """Start the stub on a background thread; returns (server, state) with server.server_port set"""
+    state = StubState(latency_ms, jitter_ms, error_rate, qps, results, retry_after)
+    server = StubServer(("127.0.0.1", port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    parser.add_argument("--qps", type=float, default=0.0, help="Requests per second before 429 (0 = unlimited)")
+    parser.add_argument("--results", type=int, default=10, help="POIs per search")
+    args = parser.parse_args()
+
+    server, _ = start_stub(args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.qps, args.results)
+    print(f"TomTom stub listening on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Incremental BM25 keyword index for document chunks
+An inverted index in SQLite next to the Chroma store; chunks are added and removed during
+ingestion, so queries only read postings for their own terms
+"""
+
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "bm25.sqlite3"
+
+# Short tokens are kept on purpose: acronyms such as "OT" or "ABA" are often the whole query
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+_STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i if in into is it its me my of on or our
+she so that the their them then there these they this to was we were what when where which who why
+will with you your do does did can could would should about how not no
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over an incrementally maintained SQLite inverted index"""
+
+    def __init__(self, persist_directory: str, k1: float = 1.5, b: float = 0.75):
+        os.makedirs(persist_directory, exist_ok=True)
+        self.path = os.path.join(persist_directory, INDEX_FILENAME)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                chunk_id TEXT PRIMARY KEY,
+                doc_id TEXT NOT NULL,
+                length INTEGER NOT NULL,
+                page_start INTEGER,
+                page_end INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_bm25_chunks_doc ON chunks(doc_id);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                tf INTEGER NOT NULL,
+                PRIMARY KEY (term, chunk_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_bm25_postings_chunk ON postings(chunk_id);
+        """)
+        self._conn.commit()
+
+        # Corpus statistics are kept in memory and adjusted on every add/remove
+        self._n_chunks, self._total_length = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks"
+        ).fetchone()
+
+    def __len__(self) -> int:
+        return self._n_chunks
+
+    def add(self, chunks: Iterable[Tuple[str, str, Dict]]):
+        """
+        Index (chunk_id, text, metadata) tuples in one transaction; existing IDs are replaced
+
+        metadata must carry doc_id; page_start/page_end are stored for range filters.
+        """
+        rows, postings = [], []
+        for chunk_id, text, metadata in chunks:
+            terms = Counter(tokenize(text))
+            rows.append((
+                chunk_id,
+                metadata["doc_id"],
+                sum(terms.values()),
+                metadata.get("page_start"),
+                metadata.get("page_end")
+            ))
+            postings.extend((term, chunk_id, tf) for term, tf in terms.items())
+        if not rows:
+            return
+
+        with self._lock:
+            self._remove_locked([row[0] for row in rows])
+            self._conn.executemany(
+                "INSERT INTO chunks (chunk_id, doc_id, length, page_start, page_end) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.executemany("INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)", postings)
+            self._conn.commit()
+            self._n_chunks += len(rows)
+            self._total_length += sum(row[2] for row in rows)
+
+    def remove(self, chunk_ids: List[str]):
+        with self._lock:
+            self._remove_locked(chunk_ids)
+            self._conn.commit()
+
+    def remove_doc(self, doc_id: str):
+        """Drop every chunk of a document, including ones no registry tracks"""
+        with self._lock:
+            count, length = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            if not count:
+                return
+            self._conn.execute(
+                "DELETE FROM postings WHERE chunk_id IN (SELECT chunk_id FROM chunks WHERE doc_id = ?)", (doc_id,)
+            )
+            self._conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+            self._n_chunks -= count
+            self._total_length -= length
+
+    def _remove_locked(self, chunk_ids: List[str]):
+        for start in range(0, len(chunk_ids), 500):
+            batch = chunk_ids[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            count, length = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks WHERE chunk_id IN ({marks})", batch
+            ).fetchone()
+            if not count:
+                continue
+            self._conn.execute(f"DELETE FROM postings WHERE chunk_id IN ({marks})", batch)
+            self._conn.execute(f"DELETE FROM chunks WHERE chunk_id IN ({marks})", batch)
+            self._n_chunks -= count
+            self._total_length -= length
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.commit()
+            self._n_chunks = 0
+            self._total_length = 0
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        doc_id: Optional[str] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """Top-k (chunk_id, score), with the same doc/page-range semantics as the vector filter"""
+        terms = sorted(set(tokenize(query)))
+        if not terms or not self._n_chunks:
+            return []
+
+        conditions, params = [], []
+        if doc_id:
+            conditions.append("c.doc_id = ?")
+            params.append(doc_id)
+        if page_from is not None:
+            conditions.append("c.page_end >= ?")
+            params.append(int(page_from))
+        if page_to is not None:
+            conditions.append("c.page_start <= ?")
+            params.append(int(page_to))
+        where = (" AND " + " AND ".join(conditions)) if conditions else ""
+
+        marks = ",".join("?" * len(terms))
+        with self._lock:
+            n, avg_length = self._n_chunks, (self._total_length / self._n_chunks) or 1.0
+            df = dict(self._conn.execute(
+                f"SELECT term, COUNT(*) FROM postings WHERE term IN ({marks}) GROUP BY term", terms
+            ).fetchall())
+            rows = self._conn.execute(
+                f"SELECT p.term, p.chunk_id, p.tf, c.length FROM postings p "
+                f"JOIN chunks c ON c.chunk_id = p.chunk_id WHERE p.term IN ({marks}){where}",
+                [*terms, *params]
+            ).fetchall()
+
+        idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+        scores: Dict[str, float] = {}
+        for term, chunk_id, tf, length in rows:
+            norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + idf[term] * tf * (self.k1 + 1) / norm
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists: score(id) = sum over lists of 1 / (k + rank)
+
+    Only ranks are used, so BM25 and cosine scores never need to be made comparable.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,222 @@
+"""
+Bounded LRU cache with TTL and an optional SQLite tier that survives restarts
+Values must be JSON-serializable when the SQLite tier is enabled
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class SQLiteCacheTier:
+    """Key/value table with expiry, shared by every cache that points at the same file"""
+
+    def __init__(self, path: str, table: str, max_entries: int = 100000):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table}(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Any:
+        """(value, expires_at) for a live row, else _MISSING"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return _MISSING
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return json.loads(value), expires_at
+
+    def set(self, key: str, value: Any, expires_at: Optional[float]):
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, time.time())
+            )
+            self._writes += 1
+            if self._writes % 256 == 0:
+                self._prune()
+            self._conn.commit()
+
+    def _prune(self):
+        """Drop expired rows and the least recently used rows beyond max_entries"""
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TTLCache:
+    """Thread-safe LRU cache bounded by entry count and approximate memory, with per-entry TTL"""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        persist_path: Optional[str] = None,
+        max_disk_entries: int = 100000
+    ):
+        """
+        Args:
+            name: Cache name (also the SQLite table name)
+            max_entries: Maximum number of entries kept in memory
+            max_bytes: Approximate memory cap for keys + serialized values
+            ttl_seconds: Entry lifetime (None = no expiry)
+            persist_path: SQLite file for the on-disk tier (None = memory only)
+            max_disk_entries: Row cap for the on-disk tier
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.disk = None
+        if persist_path:
+            try:
+                self.disk = SQLiteCacheTier(persist_path, f"cache_{name}", max_disk_entries)
+            except Exception as e:
+                logger.error(f"❌ Could not open cache tier {persist_path}: {str(e)}")
+
+        # Metrics
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _size_of(key: str, value: Any) -> int:
+        try:
+            return len(key) + len(json.dumps(value))
+        except (TypeError, ValueError):
+            return len(key) + 64
+
+    def _store(self, key: str, value: Any, expires_at: Optional[float]):
+        size = self._size_of(key, value)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, size = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+
+        if self.disk is not None:
+            try:
+                row = self.disk.get(key)
+            except Exception as e:
+                logger.warning(f"Cache '{self.name}' disk read failed: {str(e)}")
+                row = _MISSING
+            if row is not _MISSING:
+                value, expires_at = row
+                with self._lock:
+                    # Promoted with the row's own expiry, so a disk hit does not extend its lifetime
+                    self._store(key, value, expires_at)
+                    self.disk_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any):
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value, expires_at)
+            except Exception as e:
+                logger.warning(f"Cache '{self.name}' disk write failed: {str(e)}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> Dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "disk_entries": len(self.disk) if self.disk is not None else None
+        }
@@ -0,0 +1,155 @@
+"""
+Precomputed lookups over the support-resource catalog
+An Aho-Corasick matcher resolves area aliases inside a location string and classifies service
+descriptions by type keyword in one pass over the text; an inverted index maps (area, type) to resources
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Resource type -> keywords that mark a service description as that type (case-insensitive);
+# the types are the resource finder's categories
+TYPE_KEYWORDS = {
+    "healthcare": ["specialist", "psychiatrist", "psychologist", "pediatrician", "assessment", "diagnosis", "evaluation"],
+    "education": ["tutor", "education", "learning", "academic", "reading", "remediation"],
+    "community": ["support group", "community", "parent", "resource sharing"],
+    "therapy": ["therapy", "intervention", "coaching", "ABA", "sensory", "speech", "occupational"]
+}
+
+
+class AhoCorasick(Generic[T]):
+    """Multi-pattern substring matcher: every pattern occurrence in O(len(text) + matches)"""
+
+    def __init__(self, patterns: Iterable[Tuple[str, T]] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, T]]] = [[]]  # (pattern length, value)
+        self._built = False
+        for pattern, value in patterns:
+            self.add(pattern, value)
+        self.build()
+
+    def add(self, pattern: str, value: T):
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((len(pattern), value))
+        self._built = False
+
+    def build(self):
+        """Compute failure links breadth-first; outputs of suffix states are merged in"""
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, T]]:
+        """Yield (start, end, value) for every pattern occurrence"""
+        if not self._built:
+            self.build()
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length, value in self._output[node]:
+                yield index + 1 - length, index + 1, value
+
+    def values(self, text: str) -> Set[T]:
+        return {value for _, _, value in self.iter_matches(text)}
+
+
+class ServiceTypeClassifier:
+    """Resource types whose keywords appear in a resource's services, in one pass per service"""
+
+    def __init__(self, type_keywords: Dict[str, List[str]] = TYPE_KEYWORDS):
+        self.matcher: AhoCorasick[str] = AhoCorasick(
+            (keyword.lower(), resource_type)
+            for resource_type, keywords in type_keywords.items()
+            for keyword in keywords
+        )
+
+    def __call__(self, resource: Dict) -> Set[str]:
+        types: Set[str] = set()
+        for service in resource.get("services", []):
+            types |= self.matcher.values(service.lower())
+        return types
+
+
+class CatalogIndex:
+    """Area and resource-type lookups for the per-area resource catalog, built once at startup"""
+
+    def __init__(
+        self,
+        resources_by_area: Dict[str, List[Dict]],
+        area_aliases: Dict[str, List[str]],
+        type_keywords: Dict[str, List[str]],
+        default_area: str = "default"
+    ):
+        """
+        Args:
+            resources_by_area: Area name -> resources (each with a "services" list)
+            area_aliases: Area name -> substrings that select it, in priority order across areas;
+                every area also matches its own name, after all explicit aliases
+            type_keywords: Resource type -> keywords found in service descriptions (case-insensitive)
+            default_area: Area returned when nothing in the location matches
+        """
+        self.resources_by_area = resources_by_area
+        self.default_area = default_area
+
+        # Alias priority follows the order aliases are given, then area names
+        aliases: List[Tuple[str, Tuple[int, str]]] = []
+        for area, area_alias_list in area_aliases.items():
+            for alias in area_alias_list:
+                aliases.append((alias.lower(), (len(aliases), area)))
+        for area in resources_by_area:
+            if area != default_area:
+                aliases.append((area.lower(), (len(aliases), area)))
+        self.area_matcher: AhoCorasick[Tuple[int, str]] = AhoCorasick(aliases)
+
+        self.resource_types = ServiceTypeClassifier(type_keywords)
+
+        # Inverted index (area, type) -> resources, in catalog order
+        self.by_type: Dict[Tuple[str, str], List[Dict]] = defaultdict(list)
+        for area, resources in resources_by_area.items():
+            for resource in resources:
+                for resource_type in self.resource_types(resource):
+                    self.by_type[(area, resource_type)].append(resource)
+
+    def resolve_area(self, location: str) -> str:
+        """Area for a free-text location: exact name, else the highest-priority alias it contains"""
+        location = location.lower()
+        if location in self.resources_by_area:
+            return location
+        best: Optional[Tuple[int, str]] = None
+        for _, _, match in self.area_matcher.iter_matches(location):
+            if best is None or match < best:
+                best = match
+        return best[1] if best is not None else self.default_area
+
+    def search(self, location: str, resource_type: str = "all") -> List[Dict]:
+        area = self.resolve_area(location)
+        if resource_type == "all":
+            return self.resources_by_area[area]
+        return self.by_type.get((area, resource_type), [])
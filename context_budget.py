@@ -0,0 +1,224 @@
+"""
+Context assembly for RAG prompts under a token budget
+Drops near-duplicate chunks, merges neighbouring chunks of the same document (removing their
+splitter overlap) and fills the budget in relevance order, so prompt size and prefill time stay bounded
+"""
+
+import logging
+import math
+import re
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from langchain_core.documents import Document
+except ImportError:
+    from langchain.schema.document import Document
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Llama-family tokenizers split English prose into ~1.3 pieces per word/punctuation mark
+TOKENS_PER_PIECE = 1.3
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count without loading the model's tokenizer"""
+    return math.ceil(len(_TOKEN_PATTERN.findall(text)) * TOKENS_PER_PIECE)
+
+
+def _shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def strip_overlap(left: str, right: str, min_overlap: int = 20, max_overlap: int = 400) -> str:
+    """Return right without the prefix it repeats from the end of left (the splitter's chunk_overlap)"""
+    for size in range(min(len(left), len(right), max_overlap), min_overlap - 1, -1):
+        if right.startswith(left[-size:]):
+            return right[size:].lstrip()
+    return right
+
+
+class ContextAssembler:
+    """Turns ranked retrieved chunks into the context block of a prompt"""
+
+    def __init__(
+        self,
+        max_tokens: int = 1500,
+        duplicate_threshold: float = 0.8,
+        merge_adjacent: bool = True,
+        token_counter: Optional[Callable[[str], int]] = None
+    ):
+        """
+        Args:
+            max_tokens: Token budget for the retrieved context (headers included)
+            duplicate_threshold: Share of a chunk's word 3-grams already present in a better-ranked
+                chunk at which it is dropped as a near duplicate
+            merge_adjacent: Join consecutive chunks of the same document into one passage
+            token_counter: Exact token counter (defaults to estimate_tokens)
+        """
+        self.max_tokens = max_tokens
+        self.duplicate_threshold = duplicate_threshold
+        self.merge_adjacent = merge_adjacent
+        self.count_tokens = token_counter or estimate_tokens
+
+    def _drop_duplicates(self, docs: List[Document]) -> List[Document]:
+        kept: List[Document] = []
+        kept_shingles: List[Set[Tuple[str, ...]]] = []
+        for doc in docs:
+            shingles = _shingles(doc.page_content)
+            duplicate = False
+            for other in kept_shingles:
+                smaller = min(len(shingles), len(other))
+                if smaller and len(shingles & other) / smaller >= self.duplicate_threshold:
+                    duplicate = True
+                    break
+            if not duplicate:
+                kept.append(doc)
+                kept_shingles.append(shingles)
+        return kept
+
+    @staticmethod
+    def _document_key(metadata: Dict) -> str:
+        return metadata.get("doc_id") or metadata.get("source", "unknown")
+
+    def _merge(self, docs: List[Document]) -> List[List[Tuple[int, Document]]]:
+        """
+        Group chunks that are consecutive in the same document
+
+        Returns:
+            Groups of (rank, chunk) in document order, ordered by their best rank
+        """
+        ranked = list(enumerate(docs))
+        if not self.merge_adjacent:
+            return [[item] for item in ranked]
+
+        positioned = sorted(
+            (item for item in ranked if item[1].metadata.get("chunk_id") is not None),
+            key=lambda item: (self._document_key(item[1].metadata), item[1].metadata["chunk_id"])
+        )
+        groups: List[List[Tuple[int, Document]]] = []
+        for rank, doc in positioned:
+            if groups:
+                last = groups[-1][-1][1].metadata
+                if (
+                    self._document_key(last) == self._document_key(doc.metadata)
+                    and doc.metadata["chunk_id"] == last["chunk_id"] + 1
+                ):
+                    groups[-1].append((rank, doc))
+                    continue
+            groups.append([(rank, doc)])
+
+        groups.extend([item] for item in ranked if item[1].metadata.get("chunk_id") is None)
+        return sorted(groups, key=lambda group: min(rank for rank, _ in group))
+
+    @staticmethod
+    def _join(group: List[Document]) -> Document:
+        if len(group) == 1:
+            return group[0]
+
+        text = group[0].page_content
+        for doc in group[1:]:
+            text = f"{text} {strip_overlap(text, doc.page_content)}"
+
+        metadata = dict(group[0].metadata)
+        for start, end in (("page_start", "page_end"), ("start_time", "end_time")):
+            if metadata.get(start) is not None:
+                metadata[start] = min(doc.metadata[start] for doc in group)
+                metadata[end] = max(doc.metadata[end] for doc in group)
+        metadata["merged_chunks"] = len(group)
+        return Document(page_content=text, metadata=metadata)
+
+    def _truncate(self, doc: Document, header_tokens: int) -> Optional[Document]:
+        """Cut a passage to what is left of the budget, at a word boundary"""
+        available = self.max_tokens - header_tokens
+        if available <= 0:
+            return None
+        words = doc.page_content.split()
+        low, high = 0, len(words)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count_tokens(" ".join(words[:middle])) <= available:
+                low = middle
+            else:
+                high = middle - 1
+        if not low:
+            return None
+        return Document(page_content=" ".join(words[:low]), metadata={**doc.metadata, "truncated": True})
+
+    def assemble(
+        self,
+        docs: List[Document],
+        format_header: Callable[[Dict], str]
+    ) -> Tuple[str, List[Document], Dict]:
+        """
+        Build the context block from chunks in relevance order
+
+        Args:
+            docs: Retrieved chunks, most relevant first
+            format_header: Renders the source line printed above each passage
+
+        Returns:
+            (context text, passages used, stats with token and chunk counts)
+        """
+        unique = self._drop_duplicates(docs)
+        groups = self._merge(unique)
+
+        used: List[Document] = []
+        blocks: List[str] = []
+        tokens = 0
+        for group in groups:
+            # A merged passage that does not fit falls back to its best-ranked chunk alone
+            candidates = [self._join([doc for _, doc in group])]
+            if len(group) > 1:
+                candidates.append(min(group, key=lambda item: item[0])[1])
+
+            for candidate in candidates:
+                header = format_header(candidate.metadata)
+                block_tokens = self.count_tokens(header) + self.count_tokens(candidate.page_content)
+                if tokens + block_tokens <= self.max_tokens:
+                    used.append(candidate)
+                    blocks.append(f"{header}\n{candidate.page_content}")
+                    tokens += block_tokens
+                    break
+            else:
+                if not used:
+                    # Never send an empty context: the most relevant passage is cut to fit
+                    best = candidates[-1]
+                    truncated = self._truncate(best, self.count_tokens(format_header(best.metadata)))
+                    if truncated is not None:
+                        header = format_header(truncated.metadata)
+                        used.append(truncated)
+                        blocks.append(f"{header}\n{truncated.page_content}")
+                        tokens += self.count_tokens(header) + self.count_tokens(truncated.page_content)
+
+        stats = {
+            "context_tokens": tokens,
+            "budget_tokens": self.max_tokens,
+            "retrieved_chunks": len(docs),
+            "duplicates_dropped": len(docs) - len(unique),
+            "passages": len(used),
+            "chunks_used": sum(doc.metadata.get("merged_chunks", 1) for doc in used)
+        }
+        return "\n\n".join(blocks), used, stats
+
+
+def fit_history(
+    messages: List[Dict],
+    max_tokens: int,
+    token_counter: Callable[[str], int] = estimate_tokens
+) -> List[Dict]:
+    """Keep the most recent conversation messages that fit in max_tokens, in their original order"""
+    kept: List[Dict] = []
+    tokens = 0
+    for message in reversed(messages):
+        message_tokens = token_counter(message.get("content", "")) + 2
+        if tokens + message_tokens > max_tokens:
+            break
+        kept.append(message)
+        tokens += message_tokens
+    return list(reversed(kept))
@@ -0,0 +1,168 @@
+"""
+Persistent document registry for the RAG processor
+Stores per-document metadata in SQLite next to the Chroma store so listings survive restarts
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_FILENAME = "documents.sqlite3"
+
+# Columns returned by listings (the full transcript is only returned by get())
+_LIST_COLUMNS = (
+    "doc_id", "filename", "type", "content_hash", "chunks", "pages",
+    "text_length", "created_at", "updated_at"
+)
+
+
+class DocumentRegistry:
+    """SQLite-backed, indexed table of processed documents"""
+
+    def __init__(self, persist_directory: str):
+        """
+        Args:
+            persist_directory: Directory shared with the Chroma store
+        """
+        os.makedirs(persist_directory, exist_ok=True)
+        self.path = os.path.join(persist_directory, REGISTRY_FILENAME)
+        self._lock = threading.Lock()
+
+        # Opening the database is O(1): rows are read on demand, never loaded up front
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                type TEXT NOT NULL,
+                content_hash TEXT,
+                chunks INTEGER NOT NULL DEFAULT 0,
+                pages INTEGER,
+                text_length INTEGER NOT NULL DEFAULT 0,
+                transcript TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_documents_created ON documents(created_at, doc_id);
+            CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents(content_hash);
+            CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(type, created_at);
+            CREATE TABLE IF NOT EXISTS chunks (
+                doc_id TEXT NOT NULL,
+                chunk_id TEXT NOT NULL,
+                PRIMARY KEY (doc_id, chunk_id)
+            );
+        """)
+        self._conn.commit()
+        logger.info(f"Document registry opened: {self.path}")
+
+    def upsert(
+        self,
+        doc_id: str,
+        filename: str,
+        doc_type: str,
+        chunks: int,
+        text_length: int,
+        content_hash: Optional[str] = None,
+        pages: Optional[int] = None,
+        transcript: Optional[str] = None
+    ):
+        """Insert or update a document, preserving its original created_at"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO documents
+                    (doc_id, filename, type, content_hash, chunks, pages, text_length, transcript, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(doc_id) DO UPDATE SET
+                    filename = excluded.filename,
+                    type = excluded.type,
+                    content_hash = excluded.content_hash,
+                    chunks = excluded.chunks,
+                    pages = excluded.pages,
+                    text_length = excluded.text_length,
+                    transcript = excluded.transcript,
+                    updated_at = excluded.updated_at
+                """,
+                (doc_id, filename, doc_type, content_hash, chunks, pages, text_length, transcript, now, now)
+            )
+            self._conn.commit()
+
+    def get(self, doc_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def find_by_hash(self, content_hash: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM documents WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list(self, offset: int = 0, limit: int = 100, doc_type: Optional[str] = None) -> List[Dict]:
+        """Newest first; served from the (created_at, doc_id) index"""
+        columns = ", ".join(_LIST_COLUMNS)
+        query = f"SELECT {columns} FROM documents"
+        params: list = []
+        if doc_type:
+            query += " WHERE type = ?"
+            params.append(doc_type)
+        query += " ORDER BY created_at DESC, doc_id DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def count(self, doc_type: Optional[str] = None) -> int:
+        with self._lock:
+            if doc_type:
+                return self._conn.execute("SELECT COUNT(*) FROM documents WHERE type = ?", (doc_type,)).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def totals(self) -> Dict:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(chunks), 0), COALESCE(SUM(text_length), 0) FROM documents"
+            ).fetchone()
+        return {"documents": row[0], "chunks": row[1], "text_length": row[2]}
+
+    def get_chunk_ids(self, doc_id: str) -> List[str]:
+        """Vector-store IDs currently indexed for a document"""
+        with self._lock:
+            rows = self._conn.execute("SELECT chunk_id FROM chunks WHERE doc_id = ?", (doc_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def set_chunk_ids(self, doc_id: str, chunk_ids: List[str]):
+        """Replace the recorded chunk IDs of a document"""
+        with self._lock:
+            self._conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO chunks (doc_id, chunk_id) VALUES (?, ?)",
+                [(doc_id, chunk_id) for chunk_id in chunk_ids]
+            )
+            self._conn.commit()
+
+    def delete(self, doc_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM documents WHERE doc_id = ?", (doc_id,))
+            self._conn.execute("DELETE FROM chunks WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM documents")
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.commit()
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        return {key: row[key] for key in row.keys()}
@@ -0,0 +1,166 @@
+"""
+Inference backends for the Wav2Vec2 emotion model
+PyTorch fp32, PyTorch dynamic int8 quantization and ONNX Runtime, selected by configuration at startup
+"""
+
+import logging
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+import torch
+from transformers import Wav2Vec2ForSequenceClassification, Wav2Vec2FeatureExtractor
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "torch_int8", "onnx")
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class TorchBackend:
+    """Plain PyTorch forward pass (fp32)"""
+
+    name = "torch"
+
+    def __init__(self, model: Wav2Vec2ForSequenceClassification, device: torch.device):
+        self.model = model
+        self.device = device
+        self.model.to(device)
+        self.model.eval()
+
+    def predict(self, input_values: np.ndarray, attention_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return softmax probabilities of shape (batch, num_labels)"""
+        inputs = {"input_values": torch.from_numpy(input_values).to(self.device)}
+        if attention_mask is not None:
+            inputs["attention_mask"] = torch.from_numpy(attention_mask).to(self.device)
+
+        with torch.no_grad():
+            logits = self.model(**inputs).logits
+            probabilities = torch.nn.functional.softmax(logits, dim=-1)
+        return probabilities.cpu().numpy()
+
+
+class TorchInt8Backend(TorchBackend):
+    """PyTorch with dynamically quantized int8 Linear layers (CPU only)"""
+
+    name = "torch_int8"
+
+    def __init__(self, model: Wav2Vec2ForSequenceClassification, device: torch.device):
+        if device.type != "cpu":
+            logger.warning("Dynamic int8 quantization runs on CPU only; ignoring device")
+        model.eval()
+        quantized = torch.quantization.quantize_dynamic(
+            model.to("cpu"), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        super().__init__(quantized, torch.device("cpu"))
+
+
+class OnnxBackend:
+    """ONNX Runtime session over an exported copy of the model"""
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model: Wav2Vec2ForSequenceClassification,
+        onnx_path: str,
+        intra_op_threads: Optional[int] = None
+    ):
+        if not ONNXRUNTIME_AVAILABLE:
+            raise RuntimeError("onnxruntime is not installed")
+
+        if not os.path.exists(onnx_path):
+            export_onnx(model, onnx_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # One session serves batched requests; parallelism comes from intra-op threads
+        options.intra_op_num_threads = intra_op_threads or (os.cpu_count() or 1)
+        options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        logger.info(f"ONNX Runtime session ready ({onnx_path}, intra_op_threads={options.intra_op_num_threads})")
+
+    def predict(self, input_values: np.ndarray, attention_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return softmax probabilities of shape (batch, num_labels)"""
+        feeds = {"input_values": input_values.astype(np.float32, copy=False)}
+        if "attention_mask" in self._input_names:
+            if attention_mask is None:
+                attention_mask = np.ones(input_values.shape, dtype=np.int64)
+            feeds["attention_mask"] = attention_mask.astype(np.int64, copy=False)
+
+        logits = self.session.run(["logits"], feeds)[0]
+        return _softmax(logits)
+
+
+def export_onnx(model: Wav2Vec2ForSequenceClassification, onnx_path: str, opset: int = 17):
+    """Export the classifier with dynamic batch and length axes"""
+    logger.info(f"Exporting emotion model to ONNX: {onnx_path}")
+    os.makedirs(os.path.dirname(os.path.abspath(onnx_path)), exist_ok=True)
+
+    model = model.to("cpu").eval()
+    dummy_values = torch.zeros(1, 16000, dtype=torch.float32)
+    dummy_mask = torch.ones(1, 16000, dtype=torch.int64)
+
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy_values, dummy_mask),
+            onnx_path,
+            input_names=["input_values", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_values": {0: "batch", 1: "samples"},
+                "attention_mask": {0: "batch", 1: "samples"},
+                "logits": {0: "batch"}
+            },
+            opset_version=opset
+        )
+
+
+def load_emotion_backend(
+    backend: str,
+    model_name: str,
+    device: torch.device,
+    onnx_path: Optional[str] = None,
+    intra_op_threads: Optional[int] = None
+) -> Tuple[Wav2Vec2FeatureExtractor, object]:
+    """
+    Load the feature extractor and the requested inference backend
+
+    Args:
+        backend: One of "torch", "torch_int8", "onnx"
+        model_name: HuggingFace model id
+        device: Torch device for the torch backend
+        onnx_path: Where the exported ONNX model lives (exported on first use)
+        intra_op_threads: ONNX Runtime intra-op thread count (defaults to all cores)
+
+    Returns:
+        (feature_extractor, backend instance with predict(input_values, attention_mask))
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown emotion backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+    feature_extractor = Wav2Vec2FeatureExtractor.from_pretrained(model_name)
+    model = Wav2Vec2ForSequenceClassification.from_pretrained(model_name)
+
+    if backend == "torch_int8":
+        return feature_extractor, TorchInt8Backend(model, device)
+    if backend == "onnx":
+        if onnx_path is None:
+            onnx_path = os.path.join("models", model_name.replace("/", "__") + ".onnx")
+        return feature_extractor, OnnxBackend(model, onnx_path, intra_op_threads)
+    return feature_extractor, TorchBackend(model, device)
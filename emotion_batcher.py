@@ -0,0 +1,197 @@
+"""
+Micro-batching inference queue for the Wav2Vec2 emotion model
+Collects preprocessed waveforms from concurrent requests and runs equal-length clips as one batched forward pass
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingClip:
+    """A waveform waiting in the queue together with the future of its request"""
+
+    __slots__ = ("waveform", "future", "enqueued_at")
+
+    def __init__(self, waveform: np.ndarray, future: asyncio.Future):
+        self.waveform = waveform
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+def group_by_length(batch: List[_PendingClip]) -> List[List[_PendingClip]]:
+    """
+    Split a batch into runs of equal-length clips, in order of first arrival
+
+    Wav2Vec2's feature normalisation and group-norm feature encoder see the padded
+    samples, so padding a short clip up to a longer one changes its prediction.
+    """
+    groups: Dict[int, List[_PendingClip]] = {}
+    for item in batch:
+        groups.setdefault(len(item.waveform), []).append(item)
+    return list(groups.values())
+
+
+class EmotionBatcher:
+    """Background worker that batches emotion inference requests"""
+
+    def __init__(
+        self,
+        predict_fn: Callable[[List[np.ndarray]], List[np.ndarray]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 20.0,
+        max_queue_size: int = 1024,
+        run_blocking: Optional[Callable[..., Awaitable]] = None
+    ):
+        """
+        Args:
+            predict_fn: Blocking function mapping a list of waveforms to a list of probability vectors
+            max_batch_size: Maximum number of clips per forward pass
+            max_wait_ms: Maximum time the first clip of a batch waits for company
+            max_queue_size: Maximum number of clips waiting before submit() blocks
+            run_blocking: Coroutine function used to run predict_fn off the event loop
+                (defaults to the loop's default executor)
+        """
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_queue_size = max_queue_size
+        self.run_blocking = run_blocking
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # Metrics
+        self._batch_sizes = Counter()
+        self._total_batches = 0
+        self._total_clips = 0
+        self._total_queue_wait = 0.0
+        self._total_inference_time = 0.0
+        self._max_queue_depth = 0
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        """Start the background worker on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Emotion batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:.0f})"
+        )
+
+    async def stop(self):
+        """Stop the worker and fail any clips still waiting in the queue"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if not item.future.done():
+                    item.future.set_exception(RuntimeError("Emotion batcher stopped"))
+
+    async def submit(self, waveform: np.ndarray) -> np.ndarray:
+        """Queue a preprocessed waveform and wait for its probability vector"""
+        if not self.running:
+            raise RuntimeError("Emotion batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingClip(waveform, future))
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def _collect_batch(self) -> List[_PendingClip]:
+        """Wait for one clip, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        """Worker loop: collect a batch, run it off the event loop, fan results out"""
+        loop = asyncio.get_running_loop()
+        run_blocking = self.run_blocking or (lambda fn, *args: loop.run_in_executor(None, fn, *args))
+
+        while True:
+            batch = await self._collect_batch()
+
+            # Requests whose client went away do not need a forward pass
+            batch = [item for item in batch if not item.future.done()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            for item in batch:
+                self._total_queue_wait += started - item.enqueued_at
+
+            for group in group_by_length(batch):
+                await self._predict(run_blocking, group)
+
+    async def _predict(self, run_blocking, batch: List[_PendingClip]):
+        """One forward pass over equal-length clips; failures go to every clip in the pass"""
+        started = time.perf_counter()
+        try:
+            results = await run_blocking(self.predict_fn, [item.waveform for item in batch])
+        except Exception as e:
+            logger.error(f"❌ Batched emotion inference failed: {str(e)}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        self._total_inference_time += time.perf_counter() - started
+        self._batch_sizes[len(batch)] += 1
+        self._total_batches += 1
+        self._total_clips += len(batch)
+
+        for item, probs in zip(batch, results):
+            if not item.future.done():
+                item.future.set_result(probs)
+
+    def get_metrics(self) -> Dict:
+        """Batch-size and queue-depth metrics"""
+        batches = self._total_batches or 1
+        clips = self._total_clips or 1
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self._max_queue_depth,
+            "total_batches": self._total_batches,
+            "total_clips": self._total_clips,
+            "avg_batch_size": round(self._total_clips / batches, 2),
+            "batch_size_histogram": {str(size): count for size, count in sorted(self._batch_sizes.items())},
+            "avg_queue_wait_ms": round(self._total_queue_wait / clips * 1000, 2),
+            "avg_batch_inference_ms": round(self._total_inference_time / batches * 1000, 2)
+        }
@@ -0,0 +1,224 @@
+"""
+Streaming emotion detection helpers
+Decodes incrementally arriving PCM/WAV bytes and cuts them into overlapping analysis windows
+with bounded memory, independent of the recording length
+"""
+
+import logging
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import librosa
+
+try:
+    import soxr
+    SOXR_AVAILABLE = True
+except ImportError:
+    SOXR_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_ENCODINGS = ("pcm_s16le", "pcm_f32le", "wav")
+
+
+class PcmStreamDecoder:
+    """Turns a byte stream of raw PCM (or a streamed WAV file) into float32 mono samples"""
+
+    def __init__(
+        self,
+        encoding: str = "pcm_s16le",
+        sample_rate: int = 16000,
+        channels: int = 1,
+        target_sr: int = 16000
+    ):
+        """
+        Args:
+            encoding: "pcm_s16le", "pcm_f32le" or "wav" (format read from the RIFF header)
+            sample_rate: Input sample rate for raw PCM
+            channels: Interleaved channel count for raw PCM
+            target_sr: Output sample rate; other rates go through a stateful streaming resampler,
+                so chunk boundaries do not add filter-edge artifacts
+        """
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported encoding '{encoding}', expected one of {', '.join(SUPPORTED_ENCODINGS)}")
+
+        self.encoding = encoding
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.target_sr = target_sr
+
+        self._dtype = np.float32 if encoding == "pcm_f32le" else np.int16
+        self._header_done = encoding != "wav"
+        self._pending = b""
+        self._resampler = None
+
+    def _parse_wav_header(self) -> bool:
+        """Consume the RIFF header once the 'data' chunk starts; False if more bytes are needed"""
+        buf = self._pending
+        if len(buf) < 12:
+            return False
+        if buf[:4] != b"RIFF" or buf[8:12] != b"WAVE":
+            raise ValueError("Stream is not a RIFF/WAVE file")
+
+        offset = 12
+        while offset + 8 <= len(buf):
+            chunk_id = buf[offset:offset + 4]
+            chunk_size = struct.unpack("<I", buf[offset + 4:offset + 8])[0]
+
+            if chunk_id == b"data":
+                # Streaming writers often leave the data size unset, so read until the stream ends
+                self._pending = buf[offset + 8:]
+                self._header_done = True
+                return True
+
+            if offset + 8 + chunk_size > len(buf):
+                return False
+
+            if chunk_id == b"fmt ":
+                audio_format, channels, sample_rate = struct.unpack("<HHI", buf[offset + 8:offset + 16])
+                bits = struct.unpack("<H", buf[offset + 22:offset + 24])[0]
+                if audio_format == 1 and bits == 16:
+                    self._dtype = np.int16
+                elif audio_format == 3 and bits == 32:
+                    self._dtype = np.float32
+                else:
+                    raise ValueError(f"Unsupported WAV sample format (format={audio_format}, bits={bits})")
+                self.channels = channels
+                self.sample_rate = sample_rate
+
+            offset += 8 + chunk_size + (chunk_size & 1)
+
+        return False
+
+    def feed(self, data: bytes) -> np.ndarray:
+        """Decode as many whole frames as are available and return them at target_sr"""
+        self._pending += data
+
+        if not self._header_done and not self._parse_wav_header():
+            return np.zeros(0, dtype=np.float32)
+
+        frame_bytes = np.dtype(self._dtype).itemsize * self.channels
+        usable = len(self._pending) - len(self._pending) % frame_bytes
+        if usable == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        raw = np.frombuffer(self._pending[:usable], dtype=self._dtype)
+        self._pending = self._pending[usable:]
+
+        audio = raw.astype(np.float32)
+        if self._dtype == np.int16:
+            audio /= 32768.0
+        if self.channels > 1:
+            audio = audio.reshape(-1, self.channels).mean(axis=1)
+
+        return self._resample(audio)
+
+    def _resample(self, audio: np.ndarray, last: bool = False) -> np.ndarray:
+        if self.sample_rate == self.target_sr:
+            return audio
+        if not SOXR_AVAILABLE:
+            # Per-chunk fallback; soxr ships with librosa >= 0.10
+            return librosa.resample(audio, orig_sr=self.sample_rate, target_sr=self.target_sr) if len(audio) else audio
+        if self._resampler is None:
+            # Created lazily: a WAV header can change sample_rate after construction
+            self._resampler = soxr.ResampleStream(self.sample_rate, self.target_sr, 1, dtype="float32")
+        return self._resampler.resample_chunk(audio, last=last)
+
+    def flush(self) -> np.ndarray:
+        """Samples still held by the resampler once the stream has ended"""
+        if not self._header_done:
+            return np.zeros(0, dtype=np.float32)
+        return self._resample(np.zeros(0, dtype=np.float32), last=True)
+
+
+class SlidingWindower:
+    """Cuts a growing sample stream into overlapping fixed-length windows"""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        window_seconds: float = 4.0,
+        hop_seconds: float = 2.0,
+        min_tail_seconds: float = 1.0
+    ):
+        """
+        Args:
+            sample_rate: Sample rate of the pushed audio
+            window_seconds: Length of each analysis window
+            hop_seconds: Step between window starts (window - hop = overlap)
+            min_tail_seconds: Shortest trailing window emitted by flush()
+        """
+        if hop_seconds <= 0 or hop_seconds > window_seconds:
+            raise ValueError("hop_seconds must be in (0, window_seconds]")
+
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.hop = int(hop_seconds * sample_rate)
+        self.min_tail = int(min_tail_seconds * sample_rate)
+
+        # Only the samples from the next window start onwards are retained
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0  # absolute sample index of _buffer[0]
+        self._total = 0
+
+    @property
+    def buffered_samples(self) -> int:
+        return len(self._buffer)
+
+    def push(self, samples: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+        """Append samples and return every window that is now complete as (start_sample, window)"""
+        if len(samples):
+            self._buffer = np.concatenate([self._buffer, samples.astype(np.float32, copy=False)])
+            self._total += len(samples)
+
+        windows = []
+        while len(self._buffer) >= self.window:
+            windows.append((self._buffer_start, self._buffer[:self.window].copy()))
+            self._buffer = self._buffer[self.hop:]
+            self._buffer_start += self.hop
+        return windows
+
+    def flush(self) -> List[Tuple[int, np.ndarray]]:
+        """Emit the trailing partial window once the stream has ended"""
+        windows = []
+        # Skip the tail if it is fully covered by the last emitted window
+        covered = self._buffer_start > 0 and len(self._buffer) <= self.window - self.hop
+        if len(self._buffer) >= self.min_tail and not covered:
+            windows.append((self._buffer_start, self._buffer.copy()))
+        elif self._buffer_start == 0 and 0 < len(self._buffer):
+            # Recording shorter than min_tail: analyse what there is rather than nothing
+            windows.append((0, self._buffer.copy()))
+        self._buffer = np.zeros(0, dtype=np.float32)
+        return windows
+
+
+class EmotionTimeline:
+    """Running per-stream summary that does not keep per-window history"""
+
+    def __init__(self, labels: Dict[int, str]):
+        self.labels = labels
+        self.windows = 0
+        self.end_seconds = 0.0
+        self._prob_sum: Optional[np.ndarray] = None
+
+    def add(self, probabilities: np.ndarray, end_seconds: float):
+        self.windows += 1
+        self.end_seconds = max(self.end_seconds, end_seconds)
+        if self._prob_sum is None:
+            self._prob_sum = np.zeros_like(probabilities, dtype=np.float64)
+        self._prob_sum += probabilities
+
+    def summary(self) -> Dict:
+        if self._prob_sum is None:
+            return {"windows": 0, "duration": 0.0, "dominant_emotion": None, "mean_probabilities": {}}
+
+        mean = self._prob_sum / self.windows
+        return {
+            "windows": self.windows,
+            "duration": round(self.end_seconds, 2),
+            "dominant_emotion": self.labels.get(int(np.argmax(mean)), "neutral"),
+            "mean_probabilities": {
+                self.labels.get(idx, f"emotion_{idx}"): float(p) for idx, p in enumerate(mean)
+            }
+        }
@@ -0,0 +1,262 @@
+"""
+Bounded execution pools for blocking work called from async endpoints
+Separates model inference, heavy parsing/transcription and outbound HTTP so they cannot starve each other
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, InvalidStateError, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    """Run fn and report the wall-clock time it started (works across processes)"""
+    started_at = time.time()
+    return started_at, fn(*args, **kwargs)
+
+
+class BoundedPool(Executor):
+    """
+    An executor with a concurrency limit and queue-time metrics
+
+    Async code awaits run(); synchronous code running in another pool (e.g. an ingestion
+    pipeline fanning out page or segment tasks) uses submit(), which blocks its thread, never
+    the event loop, until one of max_concurrency task slots is free.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_concurrency: Optional[int] = None
+    ):
+        """
+        Args:
+            name: Pool name used in logs and metrics
+            kind: "thread" or "process"
+            max_workers: Number of worker threads/processes
+            max_concurrency: Maximum number of calls submitted at once (defaults to max_workers);
+                further callers wait on the event loop instead of piling up in the executor
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown pool kind: {kind}")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, int(max_workers))
+        self.max_concurrency = max(1, int(max_concurrency or self.max_workers))
+
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._task_slots = threading.BoundedSemaphore(self.max_concurrency)
+
+        # Metrics
+        self._stats_lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_queue_time = 0.0
+        self._max_queue_time = 0.0
+        self._total_run_time = 0.0
+
+    def _get_executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = self._create_executor()
+            return self._executor
+
+    def _create_executor(self) -> Executor:
+        logger.info(f"Starting {self.kind} pool '{self.name}' with {self.max_workers} workers")
+        if self.kind == "process":
+            # spawn: forking a process that already holds torch/tokenizer threads is unsafe
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"{self.name}-pool"
+        )
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking callable in the pool and await its result"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.time()
+        with self._stats_lock:
+            self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            with self._stats_lock:
+                self._waiting -= 1
+
+        with self._stats_lock:
+            self._in_flight += 1
+        try:
+            started_at, result = await loop.run_in_executor(
+                self._get_executor(),
+                functools.partial(_timed_call, fn, args, kwargs)
+            )
+        except Exception:
+            self._record_failure()
+            raise
+        except BaseException:
+            self._record_failure(failed=False)
+            raise
+        finally:
+            self._semaphore.release()
+
+        self._record_success(submitted_at, started_at)
+        return result
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        """
+        Submit a callable from synchronous code, waiting for a free task slot first
+
+        Returns a Future for fn's result; cancelling it cancels the pool task if it has not started.
+        """
+        submitted_at = time.time()
+        with self._stats_lock:
+            self._waiting += 1
+        try:
+            self._task_slots.acquire()
+        finally:
+            with self._stats_lock:
+                self._waiting -= 1
+        with self._stats_lock:
+            self._in_flight += 1
+
+        outer: Future = Future()
+        try:
+            inner = self._get_executor().submit(_timed_call, fn, args, kwargs)
+        except BaseException:
+            self._task_slots.release()
+            self._record_failure()
+            raise
+
+        def on_inner_done(future: Future):
+            self._task_slots.release()
+            try:
+                if future.cancelled():
+                    self._record_failure(failed=False)
+                    outer.cancel()
+                    return
+                error = future.exception()
+                if error is not None:
+                    self._record_failure()
+                    outer.set_exception(error)
+                    return
+                started_at, result = future.result()
+                self._record_success(submitted_at, started_at)
+                outer.set_result(result)
+            except InvalidStateError:
+                pass  # the caller cancelled outer first
+
+        outer.add_done_callback(lambda future: future.cancelled() and inner.cancel())
+        inner.add_done_callback(on_inner_done)
+        return outer
+
+    def _record_success(self, submitted_at: float, started_at: float):
+        queue_time = max(0.0, started_at - submitted_at)
+        with self._stats_lock:
+            self._in_flight -= 1
+            self._completed += 1
+            self._total_queue_time += queue_time
+            self._max_queue_time = max(self._max_queue_time, queue_time)
+            self._total_run_time += time.time() - started_at
+
+    def _record_failure(self, failed: bool = True):
+        """End an in-flight call that produced no result (failed=False for cancellations)"""
+        with self._stats_lock:
+            self._in_flight -= 1
+            if failed:
+                self._failed += 1
+
+    def call(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a callable in the pool from synchronous code, bypassing the async limit (warm-up use)"""
+        return self._get_executor().submit(fn, *args, **kwargs).result()
+
+    def get_metrics(self) -> Dict:
+        """Concurrency and queue-time metrics for this pool"""
+        completed = self._completed or 1
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "waiting": self._waiting,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "avg_queue_ms": round(self._total_queue_time / completed * 1000, 2),
+            "max_queue_ms": round(self._max_queue_time * 1000, 2),
+            "avg_run_ms": round(self._total_run_time / completed * 1000, 2)
+        }
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = True):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+_cpu_count = os.cpu_count() or 2
+
+# Model inference (torch/embeddings release the GIL, so threads overlap well)
+cpu_pool = BoundedPool(
+    "cpu",
+    kind="thread",
+    max_workers=_env_int("CPU_POOL_WORKERS", min(4, _cpu_count)),
+    max_concurrency=_env_int("CPU_POOL_CONCURRENCY", min(4, _cpu_count))
+)
+
+# PDF parsing and Whisper transcription (pure-Python / long-running, isolated in processes)
+process_pool = BoundedPool(
+    "process",
+    kind="process",
+    max_workers=_env_int("PROCESS_POOL_WORKERS", max(1, min(2, _cpu_count // 2))),
+    max_concurrency=_env_int("PROCESS_POOL_CONCURRENCY", max(1, min(2, _cpu_count // 2)))
+)
+
+# Ingestion pipelines: each job drives its own extraction/transcription tasks on process_pool
+# and embeds as results arrive, so long jobs do not hold cpu_pool threads
+ingest_pool = BoundedPool(
+    "ingest",
+    kind="thread",
+    max_workers=_env_int("INGESTION_WORKERS", 2)
+)
+
+# Outbound HTTP (Ollama, TomTom)
+io_pool = BoundedPool(
+    "io",
+    kind="thread",
+    max_workers=_env_int("IO_POOL_WORKERS", 16),
+    max_concurrency=_env_int("IO_POOL_CONCURRENCY", 16)
+)
+
+POOLS = {pool.name: pool for pool in (cpu_pool, process_pool, ingest_pool, io_pool)}
+
+
+def get_pool_metrics() -> Dict:
+    return {name: pool.get_metrics() for name, pool in POOLS.items()}
+
+
+def shutdown_pools(wait: bool = False):
+    for pool in POOLS.values():
+        pool.shutdown(wait=wait)
@@ -0,0 +1,114 @@
+"""
+Batched, parallel embedding stage for document ingestion
+Embeds chunks in fixed-size batches on a worker pool and writes each batch to Chroma as it completes
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from langchain_core.documents import Document
+except ImportError:
+    from langchain.schema.document import Document
+
+logger = logging.getLogger(__name__)
+
+# progress(stage, done, total) -- total may be None when the input is a stream
+ProgressCallback = Callable[[str, int, Optional[int]], None]
+
+
+def _batched(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class EmbeddingPipeline:
+    """Embeds (id, Document) pairs in batches and upserts them into a Chroma collection"""
+
+    def __init__(self, embeddings, batch_size: int = 64, workers: Optional[int] = None):
+        """
+        Args:
+            embeddings: LangChain embeddings object (embed_documents is called per batch)
+            batch_size: Chunks per embedding call and per Chroma write
+            workers: Embedding threads (defaults to half the cores; the model itself is multi-threaded)
+        """
+        self.embeddings = embeddings
+        self.batch_size = max(1, int(batch_size))
+        self.workers = max(1, int(workers or max(1, (os.cpu_count() or 2) // 2)))
+        # At most this many batches are embedded or waiting to be written at once,
+        # which bounds memory independently of document size
+        self.max_in_flight = self.workers * 2
+
+    def _embed(self, batch: List[Tuple[str, Document]]) -> List[List[float]]:
+        return self.embeddings.embed_documents([doc.page_content for _, doc in batch])
+
+    def run(
+        self,
+        collection,
+        items: Iterable[Tuple[str, Document]],
+        total: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """
+        Embed and write all items
+
+        Args:
+            collection: Chroma collection (vectorstore._collection)
+            items: Iterable of (chunk_id, Document); consumed lazily
+            total: Number of items, if known, for progress reporting
+            progress: Optional progress callback
+
+        Returns:
+            Dict with chunk count, batch count, elapsed seconds and chunks/sec
+        """
+        started = time.perf_counter()
+        done = 0
+        batches = 0
+
+        def write(batch: List[Tuple[str, Document]], vectors: List[List[float]]):
+            nonlocal done, batches
+            # Writes stay on the calling thread: Chroma's SQLite store prefers a single writer
+            collection.upsert(
+                ids=[chunk_id for chunk_id, _ in batch],
+                embeddings=vectors,
+                metadatas=[doc.metadata for _, doc in batch],
+                documents=[doc.page_content for _, doc in batch]
+            )
+            done += len(batch)
+            batches += 1
+            if progress is not None:
+                progress("embedding", done, total)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="embed") as pool:
+            in_flight = {}
+            for batch in _batched(items, self.batch_size):
+                if len(in_flight) >= self.max_in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        write(in_flight.pop(future), future.result())
+                in_flight[pool.submit(self._embed, batch)] = batch
+
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write(in_flight.pop(future), future.result())
+
+        elapsed = time.perf_counter() - started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        if done:
+            logger.info(f"Embedded {done} chunks in {batches} batches ({elapsed:.2f}s, {rate:.1f} chunks/s)")
+
+        return {
+            "chunks": done,
+            "batches": batches,
+            "seconds": round(elapsed, 3),
+            "chunks_per_second": round(rate, 1)
+        }
@@ -0,0 +1,350 @@
+"""
+Background ingestion jobs backed by a SQLite queue
+Uploads are stored on disk and processed by a bounded set of async workers; jobs that were
+queued or running when the server stopped are resumed on the next start
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from model_registry import FAILED as MODEL_FAILED, ModelNotReady
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TERMINAL_STATES = (SUCCEEDED, FAILED)
+
+# progress(stage, done, total) -- same signature as ingestion.ProgressCallback
+JobProgress = Callable[[str, int, Optional[int]], None]
+# handler(job, file_path, progress) -> processing result dict with "success"
+JobHandler = Callable[[Dict, str, JobProgress], Awaitable[Dict]]
+
+# Share of the progress bar each stage covers (stages without a known total do not move it)
+STAGE_RANGES = {
+    "extracting": (0, 95),
+    "transcribing": (0, 60),
+    "embedding": (60, 95)
+}
+
+
+class JobStore:
+    """SQLite table of ingestion jobs (status, progress and result)"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                content_hash TEXT,
+                status TEXT NOT NULL,
+                stage TEXT,
+                progress REAL NOT NULL DEFAULT 0,
+                done INTEGER,
+                total INTEGER,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+        """)
+        self._conn.commit()
+
+    def create(self, job_id: str, kind: str, filename: str, content_hash: Optional[str]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, filename, content_hash, status, stage, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, filename, content_hash, QUEUED, QUEUED, now, now)
+            )
+            self._conn.commit()
+
+    def update(self, job_id: str, **fields):
+        if "result" in fields and fields["result"] is not None:
+            fields["result"] = json.dumps(fields["result"])
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", [*fields.values(), job_id])
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def unfinished(self) -> List[Dict]:
+        """Queued and interrupted jobs, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Delete finished jobs older than max_age_seconds"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, time.time() - max_age_seconds)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        job = {key: row[key] for key in row.keys()}
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+class _ProgressReporter:
+    """
+    Thread-safe progress callback for one job that only writes when something visible changes
+
+    Called from worker threads it writes inline; called on the event loop it hands the write to
+    run_blocking. Every write stores the latest state, so writes finishing out of order are harmless.
+    """
+
+    def __init__(self, store: JobStore, job_id: str, run_blocking: Optional[Callable[..., Awaitable]] = None):
+        self.store = store
+        self.job_id = job_id
+        self.run_blocking = run_blocking
+        self._lock = threading.Lock()
+        self._state = {"stage": None, "percent": 0.0, "done": 0, "total": None, "written_at": 0.0}
+        self._pending: List[asyncio.Future] = []
+
+    def __call__(self, stage: str, done: int, total: Optional[int] = None):
+        with self._lock:
+            last = self._state
+            percent = last["percent"]
+            low, high = STAGE_RANGES.get(stage, (percent, percent))
+            if total:
+                percent = max(percent, low + (high - low) * min(done, total) / total)
+            else:
+                percent = max(percent, low)
+
+            now = time.time()
+            if stage == last["stage"] and percent - last["percent"] < 1 and now - last["written_at"] < 1:
+                return
+            last.update(stage=stage, percent=percent, done=done, total=total, written_at=now)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._write()
+            return
+        if self.run_blocking is None:
+            self._write()
+        else:
+            self._pending = [future for future in self._pending if not future.done()]
+            self._pending.append(asyncio.ensure_future(self.run_blocking(self._write)))
+
+    def _write(self):
+        with self._lock:
+            state = dict(self._state)
+            self.store.update(
+                self.job_id, stage=state["stage"], progress=round(state["percent"], 1),
+                done=state["done"], total=state["total"]
+            )
+
+    async def drain(self):
+        """Wait for writes handed off from the event loop so they cannot land after the final status"""
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        self._pending = []
+
+
+class IngestionJobQueue:
+    """Runs upload processing in the background with a fixed number of concurrent jobs"""
+
+    def __init__(
+        self,
+        directory: str,
+        handlers: Dict[str, JobHandler],
+        workers: int = 2,
+        max_attempts: int = 3,
+        retention_seconds: float = 7 * 24 * 3600,
+        run_blocking: Optional[Callable[..., Awaitable]] = None
+    ):
+        """
+        Args:
+            directory: Holds jobs.sqlite3 and the uploaded files of unfinished jobs
+            handlers: Processing coroutine per job kind ("pdf", "audio")
+            workers: Jobs processed at once
+            max_attempts: Interrupted jobs are retried on restart at most this many times
+            retention_seconds: Finished jobs are kept this long for status queries
+            run_blocking: Coroutine runner for the blocking file/database work of the workers
+                and submit (e.g. a BoundedPool's run); it runs inline when None
+        """
+        self.directory = directory
+        self.upload_dir = os.path.join(directory, "uploads")
+        os.makedirs(self.upload_dir, exist_ok=True)
+
+        self.store = JobStore(os.path.join(directory, "jobs.sqlite3"))
+        self.handlers = handlers
+        self.workers = max(1, int(workers))
+        self.max_attempts = max(1, int(max_attempts))
+        self.retention_seconds = retention_seconds
+        self._run_blocking = run_blocking
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _upload_path(self, job_id: str) -> str:
+        return os.path.join(self.upload_dir, job_id)
+
+    async def _blocking(self, fn: Callable, *args, **kwargs):
+        """Run SQLite writes and file operations off the event loop"""
+        if self._run_blocking is not None:
+            return await self._run_blocking(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+
+    def _recover(self) -> List[str]:
+        """Prune old finished jobs and return the IDs of interrupted jobs that can be resumed"""
+        pruned = self.store.prune(self.retention_seconds)
+        if pruned:
+            logger.info(f"Pruned {pruned} finished ingestion jobs")
+
+        resumable = []
+        for job in self.store.unfinished():
+            if not os.path.exists(self._upload_path(job["job_id"])):
+                self.store.update(job["job_id"], status=FAILED, stage=FAILED, error="Uploaded file was lost")
+                continue
+            self.store.update(job["job_id"], status=QUEUED, stage=QUEUED)
+            resumable.append(job["job_id"])
+        return resumable
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+
+        # Re-enqueue work interrupted by a restart; indexing is idempotent (content-addressed chunk IDs)
+        for job_id in await self._blocking(self._recover):
+            self._queue.put_nowait(job_id)
+        if self._queue.qsize():
+            logger.info(f"Resuming {self._queue.qsize()} ingestion jobs")
+
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Ingestion job queue started with {self.workers} workers")
+
+    async def stop(self):
+        # Running jobs stay "running" in the store and are resumed on the next start
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _persist(self, job_id: str, kind: str, filename: str, data: bytes, content_hash: Optional[str]) -> Dict:
+        with open(self._upload_path(job_id), "wb") as f:
+            f.write(data)
+        self.store.create(job_id, kind, filename, content_hash)
+        return self.store.get(job_id)
+
+    async def submit(self, kind: str, filename: str, data: bytes, content_hash: Optional[str] = None) -> Dict:
+        """Persist an upload and queue it; returns the new job"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job_id = uuid.uuid4().hex
+        job = await self._blocking(self._persist, job_id, kind, filename, data, content_hash)
+        self._queue.put_nowait(job_id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def _progress_callback(self, job_id: str) -> _ProgressReporter:
+        return _ProgressReporter(self.store, job_id, self._run_blocking)
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion job {job_id} crashed: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = await self._blocking(self.store.get, job_id)
+        if job is None or job["status"] in TERMINAL_STATES:
+            return
+
+        if job["attempts"] >= self.max_attempts:
+            error = f"Gave up after {job['attempts']} interrupted attempts"
+            await self._blocking(self._finish, job_id, FAILED, error=error)
+            return
+
+        await self._blocking(self.store.update, job_id, status=RUNNING, stage="starting", attempts=job["attempts"] + 1)
+        logger.info(f"Running ingestion job {job_id} ({job['kind']}: {job['filename']})")
+
+        progress = self._progress_callback(job_id)
+        try:
+            result = await self.handlers[job["kind"]](job, self._upload_path(job_id), progress)
+        except ModelNotReady as e:
+            await progress.drain()
+            if e.state == MODEL_FAILED:
+                await self._blocking(self._finish, job_id, FAILED, error=str(e))
+                return
+            # Model still loading (e.g. right after a restart): requeue without using up an attempt
+            await self._blocking(
+                self.store.update, job_id, status=QUEUED, stage=f"waiting for {e.name} model", attempts=job["attempts"]
+            )
+            asyncio.get_running_loop().call_later(e.retry_after, self._queue.put_nowait, job_id)
+            return
+        except Exception as e:
+            await progress.drain()
+            logger.error(f"Ingestion job {job_id} failed: {str(e)}")
+            await self._blocking(self._finish, job_id, FAILED, error=str(e))
+            return
+
+        await progress.drain()
+        if result.get("success"):
+            await self._blocking(self._finish, job_id, SUCCEEDED, result=result)
+        else:
+            error = result.get("error", "Processing failed")
+            await self._blocking(self._finish, job_id, FAILED, result=result, error=error)
+
+    def _finish(self, job_id: str, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        fields = {"status": status, "stage": status, "result": result, "error": error}
+        if status == SUCCEEDED:
+            fields["progress"] = 100.0
+        self.store.update(job_id, **fields)
+
+        path = self._upload_path(job_id)
+        if os.path.exists(path):
+            os.remove(path)
+        logger.info(f"Ingestion job {job_id} {status}" + (f": {error}" if error else ""))
+
+    def get_metrics(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": self.store.counts()
+        }
@@ -0,0 +1,164 @@
+"""
+Background and lazy model loading with per-model readiness
+Lets the API start serving immediately while heavy models load in parallel threads
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelNotReady(Exception):
+    """Raised when an endpoint needs a model that is still loading or failed to load"""
+
+    def __init__(self, name: str, state: str, retry_after: int, error: Optional[str] = None):
+        self.name = name
+        self.state = state
+        self.retry_after = retry_after
+        self.error = error
+        super().__init__(f"Model '{name}' is {state}" + (f": {error}" if error else ""))
+
+
+class ModelSlot:
+    """One model (or model group) with its loader and load state"""
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        expected_load_seconds: float = 10.0,
+        retry_cooldown_seconds: float = 60.0
+    ):
+        self.name = name
+        self.loader = loader
+        self.expected_load_seconds = expected_load_seconds
+        self.retry_cooldown_seconds = retry_cooldown_seconds
+
+        self.state = NOT_LOADED
+        self.value = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def load_seconds(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return round(end - self.started_at, 2)
+
+    def _load(self):
+        logger.info(f"Loading model '{self.name}'...")
+        try:
+            value = self.loader()
+        except Exception as e:
+            with self._lock:
+                self.state = FAILED
+                self.error = str(e)
+                self.finished_at = time.time()
+            logger.error(f"❌ Model '{self.name}' failed to load after {self.load_seconds}s: {str(e)}")
+            return
+
+        with self._lock:
+            self.value = value
+            self.state = READY
+            self.error = None
+            self.finished_at = time.time()
+        logger.info(f"✅ Model '{self.name}' ready in {self.load_seconds}s")
+
+    def start(self, executor: ThreadPoolExecutor) -> bool:
+        """Begin loading in the background; returns False if already loading/loaded or cooling down"""
+        with self._lock:
+            if self.state in (LOADING, READY):
+                return False
+            if self.state == FAILED and time.time() - self.finished_at < self.retry_cooldown_seconds:
+                return False
+            self.state = LOADING
+            self.started_at = time.time()
+            self.finished_at = None
+        executor.submit(self._load)
+        return True
+
+    def retry_after(self) -> int:
+        """Seconds a client should wait before retrying"""
+        if self.state == LOADING:
+            return max(1, int(self.expected_load_seconds - (time.time() - self.started_at)) + 1)
+        if self.state == FAILED:
+            return max(1, int(self.retry_cooldown_seconds - (time.time() - self.finished_at)) + 1)
+        return 1
+
+    def status(self) -> Dict:
+        return {
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "error": self.error
+        }
+
+
+class ModelRegistry:
+    """Loads registered models concurrently at startup or lazily on first use"""
+
+    def __init__(self, lazy: bool = False, max_workers: int = 4):
+        """
+        Args:
+            lazy: Load each model on first require() instead of at startup
+            max_workers: Loader threads (models load in parallel up to this many)
+        """
+        self.lazy = lazy
+        self._slots: Dict[str, ModelSlot] = {}
+        self._lazy: Dict[str, bool] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-loader")
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        expected_load_seconds: float = 10.0,
+        lazy: Optional[bool] = None
+    ):
+        """
+        Args:
+            lazy: Override the registry-wide loading mode for this model
+        """
+        self._slots[name] = ModelSlot(name, loader, expected_load_seconds)
+        self._lazy[name] = self.lazy if lazy is None else lazy
+
+    def start(self):
+        """Kick off background loading of every eagerly loaded model"""
+        lazy = [name for name in self._slots if self._lazy[name]]
+        if lazy:
+            logger.info(f"Lazy model loading: {', '.join(lazy)} will load on first use")
+        for name, slot in self._slots.items():
+            if not self._lazy[name]:
+                slot.start(self._executor)
+
+    def state(self, name: str) -> str:
+        return self._slots[name].state
+
+    def is_ready(self, name: str) -> bool:
+        return self._slots[name].state == READY
+
+    def require(self, name: str) -> Any:
+        """Return the loaded model or raise ModelNotReady (starting a lazy/failed load if needed)"""
+        slot = self._slots[name]
+        if slot.state == READY:
+            return slot.value
+
+        slot.start(self._executor)
+        raise ModelNotReady(name, slot.state, slot.retry_after(), slot.error)
+
+    def status(self) -> Dict:
+        return {name: slot.status() for name, slot in self._slots.items()}
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,168 @@
+"""
+Streaming PDF extraction and incremental chunking
+Yields pages in order as they are extracted (in parallel for large PDFs) and feeds
+the text splitter incrementally, so chunking/embedding start before extraction finishes
+"""
+
+import logging
+import re
+from collections import deque
+from concurrent.futures import Executor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+try:
+    from langchain_core.documents import Document
+except ImportError:
+    from langchain.schema.document import Document
+
+logger = logging.getLogger(__name__)
+
+# Below this many pages, a worker process costs more than it saves
+PARALLEL_MIN_PAGES = 32
+PAGES_PER_TASK = 16
+
+# Chunking modes: "page" splits each page window on its own, "merged" splits the
+# concatenated text (chunks may span pages)
+CHUNKING_MODES = ("page", "merged")
+
+_PAGE_MARKER = re.compile(r"\[Page (\d+)\]")
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    return len(PdfReader(pdf_path).pages)
+
+
+def extract_page_range(pdf_path: str, start: int, end: int) -> List[Tuple[int, str]]:
+    """
+    Extract pages [start, end) as (page_number, text), skipping blank pages
+
+    Module-level so it can run in a process pool.
+    """
+    reader = PdfReader(pdf_path)
+    pages = []
+    for i in range(start, min(end, len(reader.pages))):
+        text = reader.pages[i].extract_text()
+        if text and text.strip():
+            pages.append((i + 1, text))
+    return pages
+
+
+def iter_pdf_pages(
+    pdf_path: str,
+    executor: Optional[Executor] = None,
+    max_in_flight: int = 4,
+    pages_per_task: int = PAGES_PER_TASK
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield (page_number, text) in page order
+
+    With an executor (a process pool) and a large enough PDF, page ranges are extracted
+    in parallel; at most max_in_flight ranges are outstanding, which bounds memory.
+    """
+    reader = PdfReader(pdf_path)
+    total_pages = len(reader.pages)
+
+    if executor is None or total_pages < PARALLEL_MIN_PAGES:
+        for i, page in enumerate(reader.pages):
+            text = page.extract_text()
+            if text and text.strip():
+                yield i + 1, text
+        return
+
+    del reader
+    ranges = deque((start, start + pages_per_task) for start in range(0, total_pages, pages_per_task))
+    pending = deque()
+
+    try:
+        while ranges or pending:
+            while ranges and len(pending) < max_in_flight:
+                start, end = ranges.popleft()
+                pending.append(executor.submit(extract_page_range, pdf_path, start, end))
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def iter_page_chunks(
+    pages: Iterable[Tuple[int, str]],
+    text_splitter,
+    metadata: Dict,
+    pages_per_chunk: int = 1
+) -> Iterator[Document]:
+    """
+    Split each window of pages_per_chunk pages independently
+
+    Chunks never cross a window boundary, so every chunk records the exact
+    page_start/page_end it came from.
+    """
+    pages_per_chunk = max(1, int(pages_per_chunk))
+    window: List[Tuple[int, str]] = []
+
+    def flush():
+        text = "\n\n".join(text for _, text in window)
+        for piece in text_splitter.split_text(text):
+            yield Document(
+                page_content=piece,
+                metadata={**metadata, "page_start": window[0][0], "page_end": window[-1][0]}
+            )
+
+    for page_number, text in pages:
+        # A window holds consecutive pages; blank pages skipped by extraction close it early
+        if window and (len(window) >= pages_per_chunk or page_number != window[-1][0] + 1):
+            yield from flush()
+            window = []
+        window.append((page_number, text))
+
+    if window:
+        yield from flush()
+
+
+def iter_text_chunks(
+    pages: Iterable[Tuple[int, str]],
+    text_splitter,
+    metadata: Dict,
+    flush_chars: Optional[int] = None
+) -> Iterator[Document]:
+    """
+    Split a page stream into chunks without holding the whole document text
+
+    Pages are joined with the same "[Page N]" markers as before; whenever the buffer
+    exceeds flush_chars it is split and every chunk but the last is emitted, the last
+    one staying in the buffer so chunk boundaries can still extend across pages.
+    page_start/page_end are recovered from the markers each chunk contains.
+    """
+    flush_chars = flush_chars or text_splitter._chunk_size * 8
+    buffer = ""
+    # Page of the text at the start of the buffer (text before its first marker)
+    current_page = None
+
+    def emit(piece: str) -> Document:
+        nonlocal current_page
+        # Best effort: chunk overlap can repeat a few lines of the previous page
+        markers = [int(m) for m in _PAGE_MARKER.findall(piece)]
+        starts_with_marker = piece.lstrip().startswith("[Page ")
+        page_start = markers[0] if markers and (starts_with_marker or current_page is None) else current_page
+        page_end = markers[-1] if markers else current_page
+        if markers:
+            current_page = markers[-1]
+        return Document(
+            page_content=piece,
+            metadata={**metadata, "page_start": page_start, "page_end": page_end}
+        )
+
+    for page_number, text in pages:
+        buffer += ("\n\n" if buffer else "") + f"[Page {page_number}]\n{text}"
+        if len(buffer) < flush_chars:
+            continue
+
+        pieces = text_splitter.split_text(buffer)
+        for piece in pieces[:-1]:
+            yield emit(piece)
+        buffer = pieces[-1] if pieces else ""
+
+    if buffer.strip():
+        for piece in text_splitter.split_text(buffer):
+            yield emit(piece)
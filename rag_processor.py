@@ -6,9 +6,21 @@ Handles PDF processing, audio transcription, vector storage, and question answer
 import os
 import tempfile
 import logging
-from typing import List, Dict, Optional, Tuple
+import threading
+import time
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 import hashlib
+import json
+
+from bm25_index import BM25Index, reciprocal_rank_fusion
+from cache import TTLCache
+from context_budget import ContextAssembler, fit_history
+from document_registry import DocumentRegistry
+from ingestion import EmbeddingPipeline, ProgressCallback
+from pdf_stream import CHUNKING_MODES, count_pdf_pages, iter_page_chunks, iter_pdf_pages, iter_text_chunks
+from semantic_cache import SemanticAnswerCache
 
 # LangChain imports
 try:
@@ -37,21 +49,128 @@ except ImportError:
     from langchain_community.llms import Ollama as OllamaLLM
 
 # PDF processing
-from pypdf import PdfReader
 from PIL import Image
 import io
 
 # Audio processing
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-    logging.warning("Whisper not available. Audio processing will be disabled.")
+from audio_io import decode_audio_bytes
+from transcription import (
+    WHISPER_AVAILABLE,
+    preload_whisper,
+    transcribe_segmented
+)
 
 logger = logging.getLogger(__name__)
 
 
+def iter_segment_chunks(
+    segments: List[Dict],
+    text_splitter,
+    metadata: Dict
+) -> Iterable[Document]:
+    """
+    Group timestamped transcript segments into chunks of about chunk_size characters
+
+    Each chunk records the start_time/end_time (seconds) of the speech it covers; the
+    last segment of a chunk is repeated at the start of the next one when it fits in
+    the splitter's overlap. A single segment longer than a chunk is split by the splitter.
+    """
+    chunk_size = text_splitter._chunk_size
+    overlap = text_splitter._chunk_overlap
+    group: List[Dict] = []
+    
+    def emit(group_segments: List[Dict]):
+        text = " ".join(segment["text"] for segment in group_segments)
+        for piece in text_splitter.split_text(text):
+            yield Document(
+                page_content=piece,
+                metadata={
+                    **metadata,
+                    "start_time": group_segments[0]["start"],
+                    "end_time": group_segments[-1]["end"]
+                }
+            )
+    
+    for segment in segments:
+        length = sum(len(s["text"]) + 1 for s in group)
+        if group and length + len(segment["text"]) > chunk_size:
+            yield from emit(group)
+            carry = group[-1]
+            group = [carry] if len(carry["text"]) <= overlap else []
+        group.append(segment)
+    
+    if group:
+        yield from emit(group)
+
+
+class GenerationStats:
+    """Time-to-first-token and decode-rate statistics for streamed answers"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.last_ttft_ms: Optional[float] = None
+        self.last_tokens_per_second: Optional[float] = None
+        self._total_ttft = 0.0
+        self._total_tokens = 0
+        self._total_tokens_per_second = 0.0
+    
+    def record(self, ttft_seconds: float, tokens: int, tokens_per_second: float):
+        with self._lock:
+            self.completed += 1
+            self._total_ttft += ttft_seconds
+            self._total_tokens += tokens
+            self._total_tokens_per_second += tokens_per_second
+            self.last_ttft_ms = round(ttft_seconds * 1000, 1)
+            self.last_tokens_per_second = round(tokens_per_second, 2)
+    
+    def record_cancelled(self):
+        with self._lock:
+            self.cancelled += 1
+    
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+    
+    def get_metrics(self) -> Dict:
+        completed = self.completed or 1
+        return {
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "avg_ttft_ms": round(self._total_ttft / completed * 1000, 1),
+            "avg_tokens": round(self._total_tokens / completed, 1),
+            "avg_tokens_per_second": round(self._total_tokens_per_second / completed, 2),
+            "last_ttft_ms": self.last_ttft_ms,
+            "last_tokens_per_second": self.last_tokens_per_second
+        }
+
+
+class LatencyStats:
+    """Per-stage latency averages and maxima (milliseconds)"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}  # stage -> [count, total_ms, max_ms]
+    
+    def record(self, timings: Dict[str, float]):
+        with self._lock:
+            for stage, ms in timings.items():
+                entry = self._stages.setdefault(stage, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += ms
+                entry[2] = max(entry[2], ms)
+    
+    def get_metrics(self) -> Dict:
+        with self._lock:
+            return {
+                stage: {"count": int(count), "avg_ms": round(total / count, 2), "max_ms": round(peak, 2)}
+                for stage, (count, total, peak) in self._stages.items()
+            }
+
+
 class RAGProcessor:
     """Handles document and audio processing with RAG capabilities"""
     
@@ -60,13 +179,52 @@ class RAGProcessor:
         model_name: str = "llava:7b",
         embeddings_model: str = "BAAI/bge-small-en-v1.5",
         persist_directory: str = "./chroma_db",
-        device: str = "cpu"
+        device: str = "cpu",
+        whisper_model_size: str = "base",
+        whisper_backend: str = "auto",
+        embed_batch_size: int = 64,
+        embed_workers: Optional[int] = None,
+        pdf_chunking: str = "page",
+        pages_per_chunk: int = 1,
+        answer_cache_size: int = 256,
+        answer_cache_threshold: float = 0.92,
+        answer_cache_ttl: Optional[float] = None,
+        retrieval_mode: str = "hybrid",
+        query_embedding_cache_size: int = 4096,
+        context_token_budget: int = 1500,
+        history_token_budget: int = 400
     ):
-        """Initialize RAG processor with models"""
+        """
+        Initialize RAG processor with models
+        
+        Args:
+            whisper_model_size: "tiny", "base" or "small"
+            whisper_backend: "auto", "openai" or "faster" (int8 faster-whisper); the model
+                is loaded on the first audio upload, not here
+            embed_batch_size: Chunks per embedding batch / Chroma write during ingestion
+            embed_workers: Embedding threads during ingestion (defaults to half the cores)
+            pdf_chunking: "page" to split each window of pages_per_chunk pages on its own
+                (exact page_start/page_end per chunk), "merged" to split the concatenated text
+            pages_per_chunk: Page window size for "page" chunking
+            answer_cache_size: Answers kept by the semantic answer cache (0 disables it)
+            answer_cache_threshold: Cosine similarity at which a previous question counts as the same
+            answer_cache_ttl: Seconds a cached answer stays valid (None = until the corpus changes)
+            retrieval_mode: "hybrid" (BM25 + vector, fused with reciprocal rank fusion) or "vector"
+            query_embedding_cache_size: Question embeddings kept, keyed on normalized text (0 disables it)
+            context_token_budget: Prompt tokens for retrieved context; near-duplicate chunks are
+                dropped and neighbouring chunks merged before the budget is filled by relevance
+            history_token_budget: Prompt tokens for the recent conversation
+        """
+        if retrieval_mode not in ("hybrid", "vector"):
+            raise ValueError(f"Unknown retrieval mode: {retrieval_mode}")
+        if pdf_chunking not in CHUNKING_MODES:
+            raise ValueError(f"Unknown PDF chunking mode: {pdf_chunking}")
         
         self.model_name = model_name
         self.device = device
         self.persist_directory = persist_directory
+        self.pdf_chunking = pdf_chunking
+        self.pages_per_chunk = max(1, int(pages_per_chunk))
         
         # Initialize LLM
         logger.info(f"Initializing Ollama with model: {model_name}")
@@ -84,9 +242,46 @@ class RAGProcessor:
             encode_kwargs={"normalize_embeddings": True}
         )
         
+        # Batched, parallel embedding for ingestion
+        self.embedding_pipeline = EmbeddingPipeline(
+            self.embeddings,
+            batch_size=embed_batch_size,
+            workers=embed_workers
+        )
+        
+        # Question embeddings do not depend on the corpus, so they are never invalidated
+        self.query_embedding_cache = None
+        if query_embedding_cache_size > 0:
+            self.query_embedding_cache = TTLCache("query_embeddings", max_entries=query_embedding_cache_size)
+        
         # Initialize vector store
         self.vectorstore = None
-        self.doc_store = {}  # Store document metadata
+        
+        # Answers to near-identical questions, valid until the document set changes
+        self.answer_cache = None
+        if answer_cache_size > 0:
+            self.answer_cache = SemanticAnswerCache(
+                max_entries=answer_cache_size,
+                threshold=answer_cache_threshold,
+                ttl_seconds=answer_cache_ttl
+            )
+        self._corpus_version = 0
+        
+        # Streaming latency (time-to-first-token, tokens/sec)
+        self.generation_stats = GenerationStats()
+        
+        # Keyword index kept in step with Chroma during ingestion; BM25 runs next to the vector search
+        self.retrieval_mode = retrieval_mode
+        self.bm25 = BM25Index(persist_directory)
+        self._retrieval_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="retrieval")
+        self.retrieval_stats = LatencyStats()
+        
+        # Prompt size control: prefill time on CPU grows with every context token
+        self.context_assembler = ContextAssembler(max_tokens=context_token_budget)
+        self.history_token_budget = history_token_budget
+        
+        # Persistent document metadata (SQLite next to the Chroma store)
+        self.registry = DocumentRegistry(persist_directory)
         
         # Initialize text splitter
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -95,11 +290,15 @@ class RAGProcessor:
             length_function=len,
         )
         
-        # Load Whisper if available
-        self.whisper_model = None
-        if WHISPER_AVAILABLE:
-            logger.info("Loading Whisper model for audio transcription...")
-            self.whisper_model = whisper.load_model("base")
+        # Transcription backend (loaded lazily by process_audio or by pool workers)
+        self.whisper_model_size = whisper_model_size
+        self.whisper_backend = whisper_backend
+        
+        # Vectors persist in Chroma, so reopen the store if documents were indexed before a restart
+        if self.registry.count() > 0:
+            self._initialize_vectorstore()
+            if len(self.bm25) == 0:
+                self._backfill_bm25()
         
         logger.info("RAG Processor initialized successfully")
     
@@ -112,13 +311,192 @@ class RAGProcessor:
             )
             logger.info("Vector store initialized")
     
-    def process_pdf(self, pdf_path: str, filename: str) -> Dict:
+    def _backfill_bm25(self, page_size: int = 1000):
+        """Build the keyword index from chunks that were embedded before it existed"""
+        collection = self.vectorstore._collection
+        offset = 0
+        while True:
+            page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+            if not page["ids"]:
+                break
+            self.bm25.add(
+                (chunk_id, text, metadata)
+                for chunk_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"])
+                if metadata and metadata.get("doc_id")
+            )
+            offset += len(page["ids"])
+        logger.info(f"Keyword index built from {len(self.bm25)} existing chunks")
+    
+    def _corpus_changed(self):
+        """Start a new corpus version; cached answers from the previous one are dropped"""
+        self._corpus_version += 1
+        if self.answer_cache is not None:
+            self.answer_cache.invalidate()
+    
+    def _answer_scope(
+        self,
+        k: int,
+        doc_id: Optional[str],
+        page_from: Optional[int],
+        page_to: Optional[int],
+        recent_history: List[Dict]
+    ) -> str:
+        """Everything besides the question that determines an answer"""
+        history_hash = hashlib.sha256(json.dumps(recent_history, sort_keys=True).encode()).hexdigest()[:16]
+        return f"{self._corpus_version}|{k}|{doc_id}|{page_from}|{page_to}|{history_hash}"
+    
+    def find_unchanged(self, filename: str, content_hash: str) -> Optional[Dict]:
+        """
+        Return the registry entry if this exact content is already indexed
+        
+        Matches the same file re-uploaded under its own name, or identical content
+        uploaded under a different name.
+        """
+        existing = self.registry.get(self._doc_id(filename))
+        if existing is not None and existing["content_hash"] == content_hash:
+            return existing
+        return self.registry.find_by_hash(content_hash)
+    
+    @staticmethod
+    def _doc_id(filename: str) -> str:
+        return hashlib.md5(filename.encode()).hexdigest()
+    
+    @staticmethod
+    def unchanged_result(existing: Dict, filename: str) -> Dict:
+        """Processing result for a document that was skipped because its content is already indexed"""
+        return {
+            "success": True,
+            "status": "unchanged" if existing["filename"] == filename else "duplicate",
+            "filename": existing["filename"],
+            "pages": existing["pages"],
+            "chunks": existing["chunks"],
+            "text_length": existing["text_length"],
+            "transcript": existing.get("transcript"),
+            "doc_id": existing["doc_id"],
+            "added_chunks": 0,
+            "skipped_chunks": existing["chunks"],
+            "removed_chunks": 0
+        }
+    
+    def _upsert_chunks(
+        self,
+        doc_id: str,
+        filename: str,
+        chunks: Iterable[Document],
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """
+        Embed only new chunks, keep unchanged ones and delete stale ones
+        
+        Chunk IDs are derived from the chunk text (and page range), so an unchanged chunk
+        keeps its ID (and its embedding) across re-uploads of a modified document. Chunks are consumed
+        lazily, so embedding starts while the source is still being extracted.
+        
+        Returns:
+            Dict with added/skipped/removed chunk counts and embedding throughput
+        """
+        self._initialize_vectorstore()
+        collection = self.vectorstore._collection
+        
+        existing_ids = set(self.registry.get_chunk_ids(doc_id))
+        if not existing_ids:
+            # Vectors indexed before chunk IDs were tracked, or left by a failed ingest, carry
+            # no tracked ID; drop them by source/document
+            collection.delete(where={"source": filename})
+            self.bm25.remove_doc(doc_id)
+        
+        ids: List[str] = []
+        metadatas: List[Dict] = []
+        new_ids: List[str] = []
+        kept = 0
+        
+        def new_chunks():
+            nonlocal kept
+            seen = set()
+            for chunk in chunks:
+                key = chunk.page_content
+                if chunk.metadata.get("page_start") is not None:
+                    # Identical text on different pages (headers, boilerplate) stays separately filterable
+                    key = f"{chunk.metadata['page_start']}-{chunk.metadata['page_end']}:{key}"
+                elif chunk.metadata.get("start_time") is not None:
+                    key = f"{chunk.metadata['start_time']}-{chunk.metadata['end_time']}:{key}"
+                chunk_hash = hashlib.sha256(key.encode()).hexdigest()
+                chunk_id = f"{doc_id}-{chunk_hash[:32]}"
+                if chunk_id in seen:
+                    continue
+                seen.add(chunk_id)
+                chunk.metadata["doc_id"] = doc_id
+                chunk.metadata["chunk_id"] = len(ids)
+                ids.append(chunk_id)
+                metadatas.append(chunk.metadata)
+                if chunk_id in existing_ids:
+                    kept += 1
+                else:
+                    new_ids.append(chunk_id)
+                    keyword_batch.append((chunk_id, chunk.page_content, chunk.metadata))
+                    if len(keyword_batch) >= 512:
+                        self.bm25.add(keyword_batch)
+                        keyword_batch.clear()
+                    yield chunk_id, chunk
+        
+        # New chunks go to the keyword index at ingestion time, in batches, alongside their embeddings
+        keyword_batch: List[Tuple[str, str, Dict]] = []
+        try:
+            embedding_stats = self.embedding_pipeline.run(collection, new_chunks(), progress=progress)
+            self.bm25.add(keyword_batch)
+            
+            # total_chunks is only known now; positions of unchanged chunks may also have shifted.
+            # Refresh metadata for every chunk without re-embedding.
+            for metadata in metadatas:
+                metadata["total_chunks"] = len(ids)
+            for start in range(0, len(ids), 1000):
+                collection.update(ids=ids[start:start + 1000], metadatas=metadatas[start:start + 1000])
+            
+            stale_ids = list(existing_ids - set(ids))
+            if stale_ids:
+                self.vectorstore.delete(ids=stale_ids)
+                self.bm25.remove(stale_ids)
+            
+            self.registry.set_chunk_ids(doc_id, ids)
+        except Exception:
+            # The registry never learns about chunks from a failed run, so remove them here
+            # rather than leave them orphaned in either store
+            self._discard_chunks(new_ids)
+            raise
+        
+        added = len(ids) - kept
+        if added or stale_ids:
+            self._corpus_changed()
+        logger.info(f"Indexed {filename}: {added} added, {kept} unchanged, {len(stale_ids)} removed")
+        
+        return {
+            "chunks": len(ids),
+            "added_chunks": added,
+            "skipped_chunks": kept,
+            "removed_chunks": len(stale_ids),
+            "embedding": embedding_stats
+        }
+    
+    def _discard_chunks(self, chunk_ids: List[str]):
+        """Best-effort removal of partially ingested chunks from the vector and keyword stores"""
+        if not chunk_ids:
+            return
+        try:
+            for start in range(0, len(chunk_ids), 1000):
+                self.vectorstore.delete(ids=chunk_ids[start:start + 1000])
+            self.bm25.remove(chunk_ids)
+            logger.info(f"Discarded {len(chunk_ids)} chunks of a failed ingest")
+        except Exception as e:
+            logger.error(f"Error discarding chunks of a failed ingest: {str(e)}")
+    
+    def process_pdf(self, pdf_path: str, filename: str, executor: Optional[Executor] = None) -> Dict:
         """
         Process PDF: extract text, create embeddings, store in vector DB
         
         Args:
             pdf_path: Path to PDF file
             filename: Original filename
+            executor: Process pool for parallel page extraction of large PDFs
             
         Returns:
             Dict with processing results
@@ -126,69 +504,133 @@ class RAGProcessor:
         try:
             logger.info(f"Processing PDF: {filename}")
             
-            # Read PDF
-            reader = PdfReader(pdf_path)
-            total_pages = len(reader.pages)
+            with open(pdf_path, "rb") as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()
             
-            # Extract text from all pages
-            all_text = []
-            for i, page in enumerate(reader.pages):
-                text = page.extract_text()
-                if text.strip():
-                    all_text.append(f"[Page {i+1}]\n{text}")
+            existing = self.find_unchanged(filename, content_hash)
+            if existing is not None:
+                logger.info(f"Skipping {filename}: content already indexed as {existing['filename']}")
+                return self.unchanged_result(existing, filename)
+        except Exception as e:
+            logger.error(f"Error processing PDF: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        return self.index_pdf_file(pdf_path, filename, content_hash, executor=executor)
+    
+    def index_pdf_file(
+        self,
+        pdf_path: str,
+        filename: str,
+        content_hash: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        executor: Optional[Executor] = None
+    ) -> Dict:
+        """
+        Stream a PDF through extraction, chunking and embedding
+        
+        Args:
+            pdf_path: Path to PDF file
+            filename: Original filename
+            content_hash: SHA-256 of the uploaded file
+            progress: Optional callback(stage, done, total) for embedding progress
+            executor: Process pool for parallel page extraction of large PDFs
             
-            full_text = "\n\n".join(all_text)
+        Returns:
+            Dict with processing results
+        """
+        try:
+            total_pages = count_pdf_pages(pdf_path)
+        except Exception as e:
+            logger.error(f"Error processing PDF: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        pages = iter_pdf_pages(pdf_path, executor=executor)
+        return self.index_pdf_pages(pages, total_pages, filename, content_hash, progress)
+    
+    def index_pdf_pages(
+        self,
+        pages: Iterable[Tuple[int, str]],
+        total_pages: int,
+        filename: str,
+        content_hash: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict:
+        """
+        Chunk and embed PDF pages as they arrive
+        
+        Args:
+            pages: Iterable of (page_number, text), e.g. from iter_pdf_pages
+            total_pages: Total page count of the PDF
+            filename: Original filename
+            content_hash: SHA-256 of the uploaded file (defaults to a hash of the extracted text)
+            progress: Optional callback(stage, done, total) for extraction/embedding progress
             
-            if not full_text.strip():
-                return {
-                    "success": False,
-                    "error": "No text could be extracted from PDF"
-                }
+        Returns:
+            Dict with processing results
+        """
+        try:
+            text_length = 0
+            text_hash = hashlib.sha256()
             
-            # Create document chunks
-            documents = [Document(
-                page_content=full_text,
-                metadata={
-                    "source": filename,
-                    "type": "pdf",
-                    "pages": total_pages
-                }
-            )]
+            def counted(page_stream):
+                nonlocal text_length
+                for page_number, text in page_stream:
+                    text_length += len(text)
+                    text_hash.update(text.encode())
+                    if progress is not None:
+                        progress("extracting", page_number, total_pages)
+                    yield page_number, text
             
-            # Split into chunks
-            chunks = self.text_splitter.split_documents(documents)
-            logger.info(f"Created {len(chunks)} chunks from {total_pages} pages")
+            metadata = {
+                "source": filename,
+                "type": "pdf",
+                "pages": total_pages
+            }
+            if self.pdf_chunking == "page":
+                chunks = iter_page_chunks(counted(pages), self.text_splitter, metadata, self.pages_per_chunk)
+            else:
+                chunks = iter_text_chunks(counted(pages), self.text_splitter, metadata)
             
-            # Add chunk numbers to metadata
-            for i, chunk in enumerate(chunks):
-                chunk.metadata["chunk_id"] = i
-                chunk.metadata["total_chunks"] = len(chunks)
+            # Embed new chunks, keep unchanged ones, delete stale ones
+            doc_id = self._doc_id(filename)
+            counts = self._upsert_chunks(doc_id, filename, chunks, progress)
             
-            # Initialize vector store if needed
-            self._initialize_vectorstore()
+            if counts["chunks"] == 0:
+                self.registry.delete(doc_id)
+                return {
+                    "success": False,
+                    "error": "No text could be extracted from PDF"
+                }
             
-            # Add to vector store
-            self.vectorstore.add_documents(chunks)
+            logger.info(f"Created {counts['chunks']} chunks from {total_pages} pages")
             
             # Store document metadata
-            doc_id = hashlib.md5(filename.encode()).hexdigest()
-            self.doc_store[doc_id] = {
-                "filename": filename,
-                "type": "pdf",
-                "pages": total_pages,
-                "chunks": len(chunks),
-                "text_length": len(full_text)
-            }
+            self.registry.upsert(
+                doc_id,
+                filename=filename,
+                doc_type="pdf",
+                chunks=counts["chunks"],
+                text_length=text_length,
+                content_hash=content_hash or text_hash.hexdigest(),
+                pages=total_pages
+            )
             
             logger.info(f"PDF processed successfully: {filename}")
             
             return {
                 "success": True,
+                "status": "indexed",
                 "filename": filename,
                 "pages": total_pages,
-                "chunks": len(chunks),
-                "text_length": len(full_text),
-                "doc_id": doc_id
+                "text_length": text_length,
+                "doc_id": doc_id,
+                **counts
             }
             
         except Exception as e:
@@ -198,30 +640,76 @@ class RAGProcessor:
                 "error": str(e)
             }
     
-    def process_audio(self, audio_path: str, filename: str) -> Dict:
+    def process_audio(self, audio_path: str, filename: str, executor: Optional[Executor] = None) -> Dict:
         """
         Process audio: transcribe with Whisper, chunk, store in vector DB
         
         Args:
             audio_path: Path to audio file
             filename: Original filename
+            executor: Process pool to transcribe speech segments in parallel
+                (defaults to an in-process backend, loaded on first use, one segment at a time)
             
         Returns:
             Dict with processing results
         """
         try:
-            if not WHISPER_AVAILABLE or self.whisper_model is None:
+            if not WHISPER_AVAILABLE:
                 return {
                     "success": False,
                     "error": "Whisper model not available"
                 }
             
+            with open(audio_path, "rb") as f:
+                data = f.read()
+            content_hash = hashlib.sha256(data).hexdigest()
+            
+            existing = self.find_unchanged(filename, content_hash)
+            if existing is not None:
+                logger.info(f"Skipping {filename}: content already indexed as {existing['filename']}")
+                return self.unchanged_result(existing, filename)
+            
             logger.info(f"Transcribing audio: {filename}")
             
-            # Transcribe audio
-            result = self.whisper_model.transcribe(audio_path)
-            transcript = result["text"]
+            # Silence is dropped and speech segments are transcribed independently
+            result = transcribe_segmented(
+                decode_audio_bytes(data, filename),
+                executor=executor,
+                model_size=self.whisper_model_size,
+                backend=self.whisper_backend
+            )
+        except Exception as e:
+            logger.error(f"Error processing audio: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
+        return self.index_transcript(result["text"], filename, content_hash, segments=result["segments"])
+    
+    def index_transcript(
+        self,
+        transcript: str,
+        filename: str,
+        content_hash: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        segments: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Chunk and embed an audio transcript
+        
+        Args:
+            transcript: Whisper transcript text
+            filename: Original filename
+            content_hash: SHA-256 of the uploaded file (defaults to a hash of the transcript)
+            progress: Optional callback(stage, done, total) for embedding progress
+            segments: Timestamped transcript segments ({start, end, text}); chunks then
+                carry start_time/end_time so answers can point to a time offset
             
+        Returns:
+            Dict with processing results
+        """
+        try:
             if not transcript.strip():
                 return {
                     "success": False,
@@ -230,50 +718,44 @@ class RAGProcessor:
             
             logger.info(f"Transcription complete: {len(transcript)} characters")
             
-            # Create document
-            documents = [Document(
-                page_content=transcript,
-                metadata={
-                    "source": filename,
-                    "type": "audio",
-                    "length": len(transcript)
-                }
-            )]
+            metadata = {
+                "source": filename,
+                "type": "audio",
+                "length": len(transcript)
+            }
             
             # Split into chunks
-            chunks = self.text_splitter.split_documents(documents)
+            if segments:
+                chunks = list(iter_segment_chunks(segments, self.text_splitter, metadata))
+            else:
+                chunks = self.text_splitter.split_documents([Document(page_content=transcript, metadata=metadata)])
             logger.info(f"Created {len(chunks)} chunks from transcript")
             
-            # Add chunk numbers to metadata
-            for i, chunk in enumerate(chunks):
-                chunk.metadata["chunk_id"] = i
-                chunk.metadata["total_chunks"] = len(chunks)
-            
-            # Initialize vector store if needed
-            self._initialize_vectorstore()
-            
-            # Add to vector store
-            self.vectorstore.add_documents(chunks)
+            # Embed new chunks, keep unchanged ones, delete stale ones
+            doc_id = self._doc_id(filename)
+            counts = self._upsert_chunks(doc_id, filename, chunks, progress)
             
             # Store document metadata
-            doc_id = hashlib.md5(filename.encode()).hexdigest()
-            self.doc_store[doc_id] = {
-                "filename": filename,
-                "type": "audio",
-                "transcript": transcript,
-                "chunks": len(chunks),
-                "text_length": len(transcript)
-            }
+            self.registry.upsert(
+                doc_id,
+                filename=filename,
+                doc_type="audio",
+                chunks=counts["chunks"],
+                text_length=len(transcript),
+                content_hash=content_hash or hashlib.sha256(transcript.encode()).hexdigest(),
+                transcript=transcript
+            )
             
             logger.info(f"Audio processed successfully: {filename}")
             
             return {
                 "success": True,
+                "status": "indexed",
                 "filename": filename,
                 "transcript": transcript,
-                "chunks": len(chunks),
                 "text_length": len(transcript),
-                "doc_id": doc_id
+                "doc_id": doc_id,
+                **counts
             }
             
         except Exception as e:
@@ -283,61 +765,82 @@ class RAGProcessor:
                 "error": str(e)
             }
     
-    def query_documents(
+    def _prepare_query(
         self,
         question: str,
-        conversation_history: Optional[List[Dict]] = None,
-        k: int = 4
+        conversation_history: Optional[List[Dict]],
+        k: int,
+        doc_id: Optional[str],
+        page_from: Optional[int],
+        page_to: Optional[int]
     ) -> Dict:
         """
-        Query documents using RAG
+        Everything up to generation: answer-cache lookup, retrieval, prompt and sources
         
-        Args:
-            question: User's question
-            conversation_history: Previous conversation for context
-            k: Number of relevant chunks to retrieve
-            
         Returns:
-            Dict with answer and sources
+            {"error": ...}, {"cached": result, "similarity": ...}, or a dict with the
+            prompt, sources, chunk count and the cache key for the answer
         """
-        try:
-            if self.vectorstore is None:
-                return {
-                    "success": False,
-                    "error": "No documents have been uploaded yet. Please upload a document first."
-                }
-            
-            logger.info(f"Processing query: {question}")
-            
-            # Retrieve relevant documents
-            docs = self.vectorstore.similarity_search(question, k=k)
-            
-            if not docs:
-                return {
-                    "success": False,
-                    "error": "No relevant information found in the documents."
-                }
-            
-            # Build context from retrieved documents
-            context = "\n\n".join([
-                f"[Source: {doc.metadata.get('source', 'unknown')} - "
-                f"Chunk {doc.metadata.get('chunk_id', 0)+1}/{doc.metadata.get('total_chunks', 1)}]\n"
-                f"{doc.page_content}"
-                for doc in docs
+        if self.vectorstore is None:
+            return {"error": "No documents have been uploaded yet. Please upload a document first."}
+        
+        logger.info(f"Processing query: {question}")
+        timings: Dict[str, float] = {}
+        fetch_k = max(k * 3, 10)
+        
+        # Keyword search needs no embedding, so it starts first and overlaps embedding + vector search
+        keyword_future = None
+        if self.retrieval_mode == "hybrid":
+            keyword_future = self._retrieval_pool.submit(
+                self._timed, self.bm25.search, question, fetch_k, doc_id, page_from, page_to
+            )
+        
+        # Embed the question once, for the answer cache and for retrieval
+        question_vector, timings["embed_ms"] = self._timed(self.embed_question, question)
+        recent_history = (conversation_history or [])[-4:]  # Last 2 exchanges
+        scope = self._answer_scope(k, doc_id, page_from, page_to, recent_history)
+        
+        if self.answer_cache is not None:
+            cached, similarity = self.answer_cache.lookup(question_vector, scope)
+            if cached is not None:
+                logger.info(f"Answer cache hit (similarity {similarity:.3f})")
+                if keyword_future is not None:
+                    keyword_future.cancel()
+                return {"cached": cached, "similarity": similarity}
+        
+        # Retrieve relevant documents; filters are evaluated inside Chroma and the keyword index
+        where = self.build_filter(doc_id, page_from, page_to)
+        vector_hits, timings["vector_ms"] = self._timed(
+            self._vector_search, question_vector, fetch_k if keyword_future is not None else k, where
+        )
+        if keyword_future is None:
+            docs = [doc for _, doc in vector_hits]
+        else:
+            keyword_hits, timings["bm25_ms"] = keyword_future.result()
+            docs, timings["fusion_ms"] = self._timed(self._fuse, vector_hits, keyword_hits, k)
+        self.retrieval_stats.record(timings)
+        
+        if not docs:
+            return {"error": "No relevant information found in the documents."}
+        
+        # Build context from retrieved documents, within the token budget
+        context, passages, context_stats = self.context_assembler.assemble(
+            docs,
+            lambda metadata: f"[Source: {metadata.get('source', 'unknown')} - {self._chunk_location(metadata)}]"
+        )
+        
+        # Build conversation context
+        conv_context = ""
+        history = fit_history(recent_history, self.history_token_budget, self.context_assembler.count_tokens)
+        if history:
+            conv_context = "\n".join([
+                f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
+                for msg in history
             ])
-            
-            # Build conversation context
-            conv_context = ""
-            if conversation_history:
-                recent_history = conversation_history[-4:]  # Last 2 exchanges
-                conv_context = "\n".join([
-                    f"{'User' if msg['role'] == 'user' else 'Assistant'}: {msg['content']}"
-                    for msg in recent_history
-                ])
-                conv_context = f"\n\nPrevious conversation:\n{conv_context}\n"
-            
-            # Create prompt
-            prompt = f"""Based on the following context from the documents, answer the user's question accurately and concisely.
+            conv_context = f"\n\nPrevious conversation:\n{conv_context}\n"
+        
+        # Create prompt
+        prompt = f"""Based on the following context from the documents, answer the user's question accurately and concisely.
 
 Context from documents:
 {context}
@@ -352,29 +855,260 @@ Instructions:
 - Keep the tone helpful and supportive
 
 Answer:"""
+        
+        # Extract sources
+        sources = []
+        for doc in passages:
+            source_info = self._source_info(doc.metadata)
+            if source_info not in sources:
+                sources.append(source_info)
+        
+        return {
+            "prompt": prompt,
+            "sources": sources,
+            "retrieved_chunks": len(docs),
+            "timings": timings,
+            "context": {**context_stats, "history_messages": len(history)},
+            "question_vector": question_vector,
+            "scope": scope
+        }
+    
+    @staticmethod
+    def _source_info(metadata: Dict) -> Dict:
+        """Source entry for a retrieved chunk: file, type, chunk number and page or time range"""
+        source_info = {
+            "filename": metadata.get("source", "unknown"),
+            "type": metadata.get("type", "document"),
+            "chunk": f"{metadata.get('chunk_id', 0)+1}/{metadata.get('total_chunks', 1)}"
+        }
+        if metadata.get("page_start") is not None:
+            source_info["page_start"] = metadata["page_start"]
+            source_info["page_end"] = metadata["page_end"]
+        if metadata.get("start_time") is not None:
+            source_info["start_time"] = metadata["start_time"]
+            source_info["end_time"] = metadata["end_time"]
+        return source_info
+    
+    @staticmethod
+    def _normalize_question(question: str) -> str:
+        """Embedding-cache key: case and whitespace are folded (the BGE tokenizer is uncased)"""
+        return " ".join(question.lower().split())
+    
+    def embed_questions(self, questions: List[str]) -> List[List[float]]:
+        """
+        Embed questions through the query-embedding cache
+        
+        Misses are de-duplicated and embedded together in one model forward; the normalized
+        text is what gets embedded, so a cached vector is identical to a fresh one.
+        """
+        keys = [self._normalize_question(question) for question in questions]
+        vectors: Dict[str, List[float]] = {}
+        if self.query_embedding_cache is not None:
+            for key in set(keys):
+                cached = self.query_embedding_cache.get(key)
+                if cached is not None:
+                    vectors[key] = cached
+        
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing:
+            for key, vector in zip(missing, self.embeddings.embed_documents(missing)):
+                vectors[key] = [float(x) for x in vector]
+                if self.query_embedding_cache is not None:
+                    self.query_embedding_cache.set(key, vectors[key])
+        
+        return [vectors[key] for key in keys]
+    
+    def embed_question(self, question: str) -> List[float]:
+        return self.embed_questions([question])[0]
+    
+    @staticmethod
+    def _timed(fn, *args):
+        """Call fn and return (result, elapsed milliseconds)"""
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, round((time.perf_counter() - started) * 1000, 2)
+    
+    def _vector_search(self, vector: List[float], k: int, where: Optional[Dict]) -> List[Tuple[str, Document]]:
+        """Nearest chunks as (chunk_id, Document), queried on the Chroma collection directly to keep IDs"""
+        return self._vector_search_batch([vector], k, where)[0]
+    
+    def _vector_search_batch(
+        self,
+        vectors: List[List[float]],
+        k: int,
+        where: Optional[Dict]
+    ) -> List[List[Tuple[str, Document]]]:
+        """Nearest chunks for several query vectors in one Chroma call"""
+        result = self.vectorstore._collection.query(
+            query_embeddings=vectors,
+            n_results=k,
+            where=where,
+            include=["documents", "metadatas"]
+        )
+        return [
+            [
+                (chunk_id, Document(page_content=text, metadata=metadata or {}))
+                for chunk_id, text, metadata in zip(ids, documents, metadatas)
+            ]
+            for ids, documents, metadatas in zip(result["ids"], result["documents"], result["metadatas"])
+        ]
+    
+    def _load_chunks(self, chunk_ids: Iterable[str], docs_by_id: Dict[str, Document]):
+        """Fetch chunks missing from docs_by_id (keyword-only hits) from Chroma in one call"""
+        missing = [chunk_id for chunk_id in dict.fromkeys(chunk_ids) if chunk_id not in docs_by_id]
+        if not missing:
+            return
+        page = self.vectorstore._collection.get(ids=missing, include=["documents", "metadatas"])
+        for chunk_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+            docs_by_id[chunk_id] = Document(page_content=text, metadata=metadata or {})
+    
+    @staticmethod
+    def _fused_ids(vector_hits: List[Tuple[str, Document]], keyword_hits: List[Tuple[str, float]]) -> List[str]:
+        """Every hit of either list in fused order; callers cut to k after dropping chunks that are gone"""
+        fused = reciprocal_rank_fusion([
+            [chunk_id for chunk_id, _ in vector_hits],
+            [chunk_id for chunk_id, _ in keyword_hits]
+        ])
+        return [chunk_id for chunk_id, _ in fused]
+    
+    def _fuse(
+        self,
+        vector_hits: List[Tuple[str, Document]],
+        keyword_hits: List[Tuple[str, float]],
+        k: int
+    ) -> List[Document]:
+        """Reciprocal rank fusion of both result lists; keyword-only hits are fetched from Chroma"""
+        fused = self._fused_ids(vector_hits, keyword_hits)
+        docs_by_id = dict(vector_hits)
+        self._load_chunks(fused, docs_by_id)
+        
+        # A keyword hit whose vector is gone (e.g. removed mid-query) is skipped and the next one fills in
+        return [docs_by_id[chunk_id] for chunk_id in fused if chunk_id in docs_by_id][:k]
+    
+    def retrieve_batch(
+        self,
+        questions: List[str],
+        k: int = 3,
+        doc_id: Optional[str] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None
+    ) -> Dict:
+        """
+        Retrieve chunks for several questions at once, without generating answers
+        
+        The questions are embedded in one forward pass (through the embedding cache),
+        Chroma answers every nearest-neighbour search in a single query call, and the
+        keyword searches run concurrently on the retrieval pool.
+        
+        Returns:
+            Dict with one {"question", "chunks"} entry per question, in input order, and stage timings
+        """
+        if self.vectorstore is None:
+            return {"success": False, "error": "No documents have been uploaded yet. Please upload a document first."}
+        
+        timings: Dict[str, float] = {}
+        hybrid = self.retrieval_mode == "hybrid"
+        fetch_k = max(k * 3, 10) if hybrid else k
+        
+        keyword_futures = []
+        if hybrid:
+            keyword_futures = [
+                self._retrieval_pool.submit(self.bm25.search, question, fetch_k, doc_id, page_from, page_to)
+                for question in questions
+            ]
+        
+        vectors, timings["embed_ms"] = self._timed(self.embed_questions, questions)
+        where = self.build_filter(doc_id, page_from, page_to)
+        vector_hits, timings["vector_ms"] = self._timed(self._vector_search_batch, vectors, fetch_k, where)
+        
+        docs_by_id = {chunk_id: doc for hits in vector_hits for chunk_id, doc in hits}
+        if hybrid:
+            started = time.perf_counter()
+            keyword_hits = [future.result() for future in keyword_futures]
+            ranked = [self._fused_ids(v, kw) for v, kw in zip(vector_hits, keyword_hits)]
+            self._load_chunks((chunk_id for ids in ranked for chunk_id in ids), docs_by_id)
+            timings["fusion_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        else:
+            ranked = [[chunk_id for chunk_id, _ in hits] for hits in vector_hits]
+        self.retrieval_stats.record({f"batch_{stage}": ms for stage, ms in timings.items()})
+        
+        results = []
+        for question, ids in zip(questions, ranked):
+            chunks = [
+                {
+                    "chunk_id": chunk_id,
+                    "text": docs_by_id[chunk_id].page_content,
+                    "rank": rank,
+                    **self._source_info(docs_by_id[chunk_id].metadata)
+                }
+                for rank, chunk_id in enumerate([c for c in ids if c in docs_by_id][:k], start=1)
+            ]
+            results.append({"question": question, "chunks": chunks})
+        
+        return {"success": True, "results": results, "timings": timings}
+    
+    def _cache_answer(self, prepared: Dict, result: Dict):
+        if self.answer_cache is not None:
+            self.answer_cache.store(prepared["question_vector"], prepared["scope"], result)
+    
+    def query_documents(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict]] = None,
+        k: int = 4,
+        doc_id: Optional[str] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None
+    ) -> Dict:
+        """
+        Query documents using RAG
+        
+        Args:
+            question: User's question
+            conversation_history: Previous conversation for context
+            k: Number of relevant chunks to retrieve
+            doc_id: Only search this document
+            page_from: Only search chunks ending on or after this page
+            page_to: Only search chunks starting on or before this page
+            
+        Returns:
+            Dict with answer and sources
+        """
+        try:
+            prepared = self._prepare_query(question, conversation_history, k, doc_id, page_from, page_to)
+            if "error" in prepared:
+                return {"success": False, "error": prepared["error"]}
+            if "cached" in prepared:
+                return {**prepared["cached"], "cached": True, "cache_similarity": round(prepared["similarity"], 4)}
             
             # Generate response
             logger.info("Generating response with Ollama...")
-            response = self.llm.invoke(prompt)
-            
-            # Extract sources
-            sources = []
-            for doc in docs:
-                source_info = {
-                    "filename": doc.metadata.get("source", "unknown"),
-                    "type": doc.metadata.get("type", "document"),
-                    "chunk": f"{doc.metadata.get('chunk_id', 0)+1}/{doc.metadata.get('total_chunks', 1)}"
-                }
-                if source_info not in sources:
-                    sources.append(source_info)
+            generation, generation_ms = self._timed(self.llm.generate, [prepared["prompt"]])
+            response = generation.generations[0][0].text
+            
+            # Ollama reports prompt evaluation (prefill) separately from decoding, in nanoseconds
+            info = generation.generations[0][0].generation_info or {}
+            generation_timings = {"generation_ms": generation_ms}
+            if info.get("prompt_eval_duration") is not None:
+                generation_timings["prefill_ms"] = round(info["prompt_eval_duration"] / 1e6, 2)
+            context = {**prepared["context"], "prompt_tokens": info.get("prompt_eval_count")}
+            self.retrieval_stats.record(generation_timings)
             
             logger.info("Query processed successfully")
             
-            return {
+            result = {
                 "success": True,
                 "answer": response.strip(),
-                "sources": sources,
-                "retrieved_chunks": len(docs)
+                "sources": prepared["sources"],
+                "retrieved_chunks": prepared["retrieved_chunks"]
+            }
+            self._cache_answer(prepared, result)
+            
+            return {
+                **result,
+                "cached": False,
+                "timings": {**prepared["timings"], **generation_timings},
+                "context": context
             }
             
         except Exception as e:
@@ -384,25 +1118,168 @@ Answer:"""
                 "error": f"Error generating response: {str(e)}"
             }
     
-    def list_documents(self) -> List[Dict]:
-        """List all processed documents"""
-        return [
-            {"doc_id": doc_id, **info}
-            for doc_id, info in self.doc_store.items()
-        ]
+    def stream_query(
+        self,
+        question: str,
+        conversation_history: Optional[List[Dict]] = None,
+        k: int = 4,
+        doc_id: Optional[str] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Query documents, yielding the sources first and then LLM tokens as they are generated
+        
+        Events: {"type": "sources"}, {"type": "token", "text"}, then {"type": "done"} with the
+        full answer and timings, or {"type": "error"}. Closing the generator closes the
+        Ollama stream, which stops generation.
+        """
+        started = time.perf_counter()
+        try:
+            prepared = self._prepare_query(question, conversation_history, k, doc_id, page_from, page_to)
+        except Exception as e:
+            logger.error(f"Error querying documents: {str(e)}")
+            yield {"type": "error", "error": f"Error generating response: {str(e)}"}
+            return
+        
+        if "error" in prepared:
+            yield {"type": "error", "error": prepared["error"]}
+            return
+        
+        if "cached" in prepared:
+            cached = prepared["cached"]
+            yield {"type": "sources", "sources": cached["sources"], "cached": True}
+            yield {"type": "token", "text": cached["answer"]}
+            yield {
+                "type": "done",
+                "answer": cached["answer"],
+                "cached": True,
+                "ttft_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+            return
+        
+        yield {
+            "type": "sources",
+            "sources": prepared["sources"],
+            "cached": False,
+            "timings": prepared["timings"],
+            "context": prepared["context"]
+        }
+        
+        logger.info("Streaming response from Ollama...")
+        pieces: List[str] = []
+        first_token_at = None
+        completed = False
+        failed = False
+        stream = self.llm.stream(prepared["prompt"])
+        try:
+            for piece in stream:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                pieces.append(piece)
+                yield {"type": "token", "text": piece}
+            completed = True
+        except Exception as e:
+            failed = True
+            logger.error(f"Error streaming response: {str(e)}")
+            yield {"type": "error", "error": f"Error generating response: {str(e)}"}
+            return
+        finally:
+            # Runs on normal completion, on LLM errors and when the consumer closes us (client disconnected)
+            stream.close()
+            if failed:
+                self.generation_stats.record_error()
+            elif not completed:
+                self.generation_stats.record_cancelled()
+                logger.info(f"Answer stream stopped after {len(pieces)} tokens")
+        
+        finished = time.perf_counter()
+        ttft = (first_token_at or finished) - started
+        generation = finished - (first_token_at or finished)
+        # Ollama streams roughly one token per chunk
+        tokens_per_second = (len(pieces) - 1) / generation if generation > 0 and len(pieces) > 1 else 0.0
+        self.generation_stats.record(ttft, len(pieces), tokens_per_second)
+        
+        answer = "".join(pieces).strip()
+        self._cache_answer(prepared, {
+            "success": True,
+            "answer": answer,
+            "sources": prepared["sources"],
+            "retrieved_chunks": prepared["retrieved_chunks"]
+        })
+        
+        yield {
+            "type": "done",
+            "answer": answer,
+            "cached": False,
+            "ttft_ms": round(ttft * 1000, 1),
+            "tokens": len(pieces),
+            "tokens_per_second": round(tokens_per_second, 2)
+        }
+    
+    @staticmethod
+    def build_filter(
+        doc_id: Optional[str] = None,
+        page_from: Optional[int] = None,
+        page_to: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Chroma metadata filter for a document and/or page range
+        
+        A chunk matches a page range when the pages it spans overlap it.
+        """
+        conditions = []
+        if doc_id:
+            conditions.append({"doc_id": doc_id})
+        if page_from is not None:
+            conditions.append({"page_end": {"$gte": int(page_from)}})
+        if page_to is not None:
+            conditions.append({"page_start": {"$lte": int(page_to)}})
+        
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
+    
+    @staticmethod
+    def _format_timestamp(seconds: float) -> str:
+        minutes, secs = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+    
+    @classmethod
+    def _chunk_location(cls, metadata: Dict) -> str:
+        page_start = metadata.get("page_start")
+        if page_start is not None:
+            page_end = metadata.get("page_end", page_start)
+            return f"Page {page_start}" if page_start == page_end else f"Pages {page_start}-{page_end}"
+        if metadata.get("start_time") is not None:
+            return (
+                f"{cls._format_timestamp(metadata['start_time'])}-"
+                f"{cls._format_timestamp(metadata.get('end_time', metadata['start_time']))}"
+            )
+        return f"Chunk {metadata.get('chunk_id', 0)+1}/{metadata.get('total_chunks', 1)}"
+    
+    def list_documents(self, offset: int = 0, limit: int = 100, doc_type: Optional[str] = None) -> List[Dict]:
+        """List processed documents, newest first, one page at a time"""
+        return self.registry.list(offset=offset, limit=limit, doc_type=doc_type)
     
     def clear_all_data(self):
         """Clear all vector data and document store"""
         try:
             if self.vectorstore is not None:
-                # Clear the collection
+                # Drop the collection so the vectors are actually deleted
+                self.vectorstore.delete_collection()
                 self.vectorstore = None
             
             # Reinitialize empty vectorstore
             self._initialize_vectorstore()
             
-            # Clear document store
-            self.doc_store = {}
+            # Clear document registry and keyword index
+            self.registry.clear()
+            self.bm25.clear()
+            self._corpus_changed()
             
             logger.info("All data cleared successfully")
             return {"success": True, "message": "All data cleared"}
@@ -411,10 +1288,12 @@ Answer:"""
             logger.error(f"Error clearing data: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def get_stats(self) -> Dict:
+    def get_stats(self, limit: int = 100) -> Dict:
         """Get statistics about stored documents"""
+        totals = self.registry.totals()
         return {
-            "total_documents": len(self.doc_store),
-            "documents": self.list_documents(),
+            "total_documents": totals["documents"],
+            "total_chunks": totals["chunks"],
+            "documents": self.list_documents(limit=limit),
             "vectorstore_initialized": self.vectorstore is not None
-        }
\ No newline at end of file
+        }
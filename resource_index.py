@@ -0,0 +1,288 @@
+"""
+Local spatial index of support resources
+Resources from a JSON/CSV catalog and from earlier TomTom responses, bucketed on a uniform
+lat/lon grid so nearest-neighbour and radius queries only look at a few cells
+"""
+
+import csv
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from geo import haversine_km_array, resource_key
+
+logger = logging.getLogger(__name__)
+
+KM_PER_DEGREE = 111.32
+
+# List-valued catalog columns; CSV cells separate items with ";"
+_LIST_FIELDS = ("services", "categories")
+
+
+def load_catalog(path: str, classify: Optional[Callable[[Dict], Iterable[str]]] = None) -> List[Dict]:
+    """
+    Read resources from a JSON file (a list, or {"resources": [...]}) or a CSV file with a header
+
+    Every resource needs name, lat and lon; category/categories, address, phone, services
+    and any other fields are kept as they are. Rows without a category get their categories
+    from classify(resource) (e.g. catalog_index.ServiceTypeClassifier over their services).
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            resources = []
+            for row in csv.DictReader(f):
+                resource = {key: value for key, value in row.items() if value not in (None, "")}
+                for field in _LIST_FIELDS:
+                    if field in resource:
+                        resource[field] = [item.strip() for item in resource[field].split(";") if item.strip()]
+                resources.append(resource)
+    else:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        resources = data.get("resources", []) if isinstance(data, dict) else data
+
+    valid = []
+    uncategorised = 0
+    for resource in resources:
+        try:
+            resource["lat"], resource["lon"] = float(resource["lat"]), float(resource["lon"])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Skipping catalog entry without coordinates: {resource.get('name', resource)}")
+            continue
+        if not resource.get("category") and not resource.get("categories"):
+            resource["categories"] = sorted(classify(resource)) if classify is not None else []
+            if not resource["categories"]:
+                uncategorised += 1
+        valid.append(resource)
+    if uncategorised:
+        logger.warning(
+            f"{uncategorised} catalog entries in {path} have no category and no recognised services; "
+            f"category searches will not return them"
+        )
+    return valid
+
+
+class ResourceIndex:
+    """Thread-safe grid index over resource coordinates with k-nearest and radius queries"""
+
+    def __init__(self, cell_km: float = 5.0, max_age_seconds: Optional[float] = None):
+        """
+        Args:
+            cell_km: Grid cell edge (north-south); a radius query visits the cells its bounding box overlaps
+            max_age_seconds: Resources with a "fetched_at" (unix time) older than this are left out
+                of queries and saves until they are added again; catalog entries without one never expire
+        """
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._resources: List[Dict] = []
+        self._ids: Dict[Tuple[str, str], int] = {}
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._lats = np.empty(0)
+        self._lons = np.empty(0)
+        self._fetched_at = np.empty(0)
+        self._arrays_stale = False
+        self.unsaved = 0
+
+        # Metrics
+        self.queries = 0
+        self.added = 0
+        self.updated = 0
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg))
+
+    def add_many(self, resources: Iterable[Dict], categories_field: str = "category") -> int:
+        """
+        Insert or refresh resources; a (name, address) already indexed is updated in place
+
+        Returns:
+            Number of resources that were new
+        """
+        new = updated = 0
+        with self._lock:
+            for resource in resources:
+                if resource.get("lat") is None or resource.get("lon") is None:
+                    continue
+                resource = dict(resource)
+                resource.pop("distance", None)
+                categories = set(resource.get("categories") or [])
+                if resource.get(categories_field):
+                    categories.add(resource[categories_field])
+
+                key = resource_key(resource)
+                index = self._ids.get(key)
+                if index is None:
+                    index = len(self._resources)
+                    self._ids[key] = index
+                    self._resources.append(resource)
+                    self._cells[self._cell(resource["lat"], resource["lon"])].append(index)
+                    new += 1
+                else:
+                    existing = self._resources[index]
+                    categories |= set(existing.get("categories") or [])
+                    resource["categories"] = sorted(categories)
+                    if resource == existing:
+                        continue  # seen again unchanged (e.g. a cached TomTom answer)
+                    old_cell = self._cell(existing["lat"], existing["lon"])
+                    new_cell = self._cell(resource["lat"], resource["lon"])
+                    if old_cell != new_cell:
+                        self._cells[old_cell].remove(index)
+                        self._cells[new_cell].append(index)
+                    self._resources[index] = resource
+                    updated += 1
+                resource["categories"] = sorted(categories)
+
+            if new or updated:
+                self._arrays_stale = True
+            self.added += new
+            self.updated += updated
+            self.unsaved += new
+        return new
+
+    def _arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._arrays_stale:
+            count = len(self._resources)
+            self._lats = np.fromiter((r["lat"] for r in self._resources), dtype=np.float64, count=count)
+            self._lons = np.fromiter((r["lon"] for r in self._resources), dtype=np.float64, count=count)
+            self._fetched_at = np.fromiter(
+                (r.get("fetched_at", np.inf) for r in self._resources), dtype=np.float64, count=count
+            )
+            self._arrays_stale = False
+        return self._lats, self._lons
+
+    def _fresh(self, indices: np.ndarray) -> np.ndarray:
+        if self.max_age_seconds is None or not len(indices):
+            return indices
+        return indices[self._fetched_at[indices] >= time.time() - self.max_age_seconds]
+
+    def _expired(self, resource: Dict, cutoff: float) -> bool:
+        return resource.get("fetched_at", math.inf) < cutoff
+
+    def _candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Indices in every cell overlapped by the radius's bounding box"""
+        d_lat = radius_km / KM_PER_DEGREE
+        d_lon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        (row_min, col_min), (row_max, col_max) = self._cell(lat - d_lat, lon - d_lon), self._cell(lat + d_lat, lon + d_lon)
+
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._cells):
+            # The box covers more cells than exist: scanning the occupied ones is cheaper
+            cells = [
+                indices for (row, col), indices in self._cells.items()
+                if row_min <= row <= row_max and col_min <= col <= col_max
+            ]
+        else:
+            cells = [
+                self._cells[(row, col)]
+                for row in range(row_min, row_max + 1)
+                for col in range(col_min, col_max + 1)
+                if (row, col) in self._cells
+            ]
+        if not cells:
+            return np.empty(0, dtype=np.int64)
+        return np.fromiter((i for indices in cells for i in indices), dtype=np.int64)
+
+    def _filter(self, indices: np.ndarray, category: Optional[str]) -> np.ndarray:
+        if category is None or category == "all" or not len(indices):
+            return indices
+        keep = np.fromiter((category in self._resources[i]["categories"] for i in indices), dtype=bool, count=len(indices))
+        return indices[keep]
+
+    def _results(self, indices: np.ndarray, distances: np.ndarray) -> List[Dict]:
+        return [
+            {**self._resources[index], "distance": round(float(distance), 2)}
+            for index, distance in zip(indices, distances)
+        ]
+
+    def _query(self, lat: float, lon: float, radius_km: float, category: Optional[str], limit: Optional[int]) -> List[Dict]:
+        lats, lons = self._arrays()
+        indices = self._fresh(self._filter(self._candidates(lat, lon, radius_km), category))
+        if not len(indices):
+            return []
+        distances = haversine_km_array(lat, lon, lats[indices], lons[indices])
+        inside = distances <= radius_km
+        indices, distances = indices[inside], distances[inside]
+
+        order = np.argsort(distances, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        return self._results(indices[order], distances[order])
+
+    def within_radius(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        category: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Resources within radius_km, nearest first, as copies with "distance" (km) set"""
+        with self._lock:
+            self.queries += 1
+            return self._query(lat, lon, radius_km, category, limit)
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 20,
+        category: Optional[str] = None,
+        max_radius_km: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        k nearest resources (optionally only within max_radius_km), nearest first
+
+        The searched radius starts at one cell and doubles until k matches are inside it,
+        so a query touches only the neighbourhood that can contain the answer.
+        """
+        radius = self.cell_deg * KM_PER_DEGREE
+        with self._lock:
+            self.queries += 1
+            if not self._resources:
+                return []
+            while True:
+                limit_reached = max_radius_km is not None and radius >= max_radius_km
+                if limit_reached:
+                    radius = max_radius_km
+                results = self._query(lat, lon, radius, category, k)
+                if len(results) >= k or limit_reached or radius > 20037.5:  # half the equator
+                    return results
+                radius *= 2
+
+    def save(self, path: str):
+        """Write all unexpired resources as a JSON catalog (readable by load_catalog)"""
+        with self._lock:
+            resources = list(self._resources)
+            self.unsaved = 0
+        if self.max_age_seconds is not None:
+            cutoff = time.time() - self.max_age_seconds
+            resources = [r for r in resources if not self._expired(r, cutoff)]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"resources": resources}, f)
+        os.replace(tmp_path, path)
+
+    def get_metrics(self) -> Dict:
+        return {
+            "resources": len(self._resources),
+            "cells": len(self._cells),
+            "queries": self.queries,
+            "added": self.added,
+            "updated": self.updated,
+            "expired": (
+                sum(self._expired(r, time.time() - self.max_age_seconds) for r in self._resources)
+                if self.max_age_seconds is not None else 0
+            ),
+            "unsaved": self.unsaved
+        }
@@ -0,0 +1,112 @@
+"""
+Semantic answer cache for document queries
+Reuses a previous answer when a new question's embedding is close enough to one already answered
+against the same corpus version and retrieval scope
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticAnswerCache:
+    """Small in-memory vector index of answered questions with LRU eviction"""
+
+    def __init__(self, max_entries: int = 256, threshold: float = 0.92, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            max_entries: Answers kept (least recently used are evicted first)
+            threshold: Minimum cosine similarity between questions for a hit
+            ttl_seconds: Entry lifetime (None = until evicted or invalidated)
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+
+        # entry id -> (scope, unit vector, value, expires_at)
+        self._entries: "OrderedDict[int, Tuple[str, np.ndarray, Any, Optional[float]]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._hit_similarity = 0.0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, vector: Sequence[float], scope: str) -> Tuple[Optional[Any], float]:
+        """
+        Return (value, similarity) of the closest cached question in scope, or (None, best similarity)
+
+        Scope identifies the corpus version plus everything else that shapes the answer
+        (filters, k, conversation context); entries from other scopes never match.
+        """
+        query = self._normalize(vector)
+        now = time.time()
+
+        with self._lock:
+            ids, vectors = [], []
+            for entry_id, (entry_scope, entry_vector, _, expires_at) in self._entries.items():
+                if entry_scope == scope and (expires_at is None or expires_at > now):
+                    ids.append(entry_id)
+                    vectors.append(entry_vector)
+
+            if not ids:
+                self.misses += 1
+                return None, 0.0
+
+            similarities = np.stack(vectors) @ query
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None, similarity
+
+            entry_id = ids[best]
+            self._entries.move_to_end(entry_id)
+            self.hits += 1
+            self._hit_similarity += similarity
+            return self._entries[entry_id][2], similarity
+
+    def store(self, vector: Sequence[float], scope: str, value: Any):
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[self._next_id] = (scope, self._normalize(vector), value, expires_at)
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every entry (the document set changed)"""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "avg_hit_similarity": round(self._hit_similarity / self.hits, 4) if self.hits else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
@@ -4,6 +4,9 @@ import os
 from math import radians, sin, cos, sqrt, atan2
 from dotenv import load_dotenv
 
+from catalog_index import TYPE_KEYWORDS, CatalogIndex
+from resource_index import ResourceIndex, load_catalog
+
 load_dotenv()
 
 app = Flask(__name__)
@@ -248,6 +251,40 @@ MOCK_RESOURCES_BY_AREA = {
     ]
 }
 
+# Substrings of a location that select an area, in priority order; every area also
+# matches its own name
+AREA_ALIASES = {
+    'malakpet': ['malakpet'],
+    'hitech city': ['hitech', 'hi-tech', 'hi tech'],
+    'madhapur': ['madhapur'],
+    'jubilee hills': ['jubilee'],
+    'banjara hills': ['banjara']
+}
+
+# Area matcher and (area, type) -> resources index, built once instead of per request
+catalog = CatalogIndex(MOCK_RESOURCES_BY_AREA, AREA_ALIASES, TYPE_KEYWORDS)
+
+# Resources with coordinates (RESOURCE_CATALOG, JSON or CSV) are searched by distance first;
+# the per-area mock data below only answers when the index has nothing near the user
+RESOURCE_CATALOG = os.getenv('RESOURCE_CATALOG')
+SEARCH_RADIUS_KM = float(os.getenv('RESOURCE_SEARCH_RADIUS_KM', '10'))
+
+resource_index = ResourceIndex()
+if RESOURCE_CATALOG and os.path.exists(RESOURCE_CATALOG):
+    # Types are classified once here, so nearby searches filter on them directly
+    resource_index.add_many(
+        {**resource, 'categories': sorted(set(resource.get('categories', [])) | catalog.resource_types(resource))}
+        for resource in load_catalog(RESOURCE_CATALOG)
+    )
+
+
+def search_nearby(lat, lon, resource_type, limit=20):
+    """Nearest catalog resources within SEARCH_RADIUS_KM, with distance formatted like the mock data"""
+    nearby = resource_index.nearest(lat, lon, k=limit, category=resource_type, max_radius_km=SEARCH_RADIUS_KM)
+    for resource in nearby:
+        resource['distance'] = f"{resource['distance']:.1f} km"
+    return nearby
+
 @app.route('/api/search-resources', methods=['OPTIONS', 'POST'])
 def search_resources():
     # Explicitly handle OPTIONS requests
@@ -259,54 +296,20 @@ def search_resources():
         data = request.get_json()
         location = data.get('location', '').lower()
         resource_type = data.get('resourceType', 'all')
+        user_lat, user_lon = data.get('userLat'), data.get('userLon')
         
-        # Select appropriate mock data based on location
-        if location in MOCK_RESOURCES_BY_AREA:
-            resources = MOCK_RESOURCES_BY_AREA[location]
-        elif 'malakpet' in location:
-            resources = MOCK_RESOURCES_BY_AREA['malakpet']
-        elif 'hitech' in location or 'hi-tech' in location or 'hi tech' in location:
-            resources = MOCK_RESOURCES_BY_AREA['hitech city']
-        elif 'madhapur' in location:
-            resources = MOCK_RESOURCES_BY_AREA['madhapur']
-        elif 'jubilee' in location:
-            resources = MOCK_RESOURCES_BY_AREA['jubilee hills']
-        elif 'banjara' in location:
-            resources = MOCK_RESOURCES_BY_AREA['banjara hills']
-        else:
-            resources = MOCK_RESOURCES_BY_AREA['default']
-        
-        # Filter by resource type if needed
-        if resource_type != 'all':
-            filtered_resources = filter_by_type(resources, resource_type)
-            return jsonify({'results': filtered_resources})
+        if user_lat is not None and user_lon is not None and len(resource_index):
+            nearby = search_nearby(float(user_lat), float(user_lon), resource_type)
+            if nearby:
+                return jsonify({'results': nearby})
         
-        return jsonify({'results': resources})
+        # Select appropriate mock data based on location, filtered by resource type if needed
+        return jsonify({'results': catalog.search(location, resource_type)})
         
     except Exception as e:
         app.logger.error(f"Error in search_resources: {str(e)}")
         return jsonify({'error': str(e), 'results': MOCK_RESOURCES_BY_AREA['default']}), 200
 
-def filter_by_type(resources, resource_type):
-    # Map resource types to keywords to check in services
-    type_keywords = {
-        'healthcare': ['specialist', 'psychiatrist', 'psychologist', 'pediatrician', 'assessment', 'diagnosis', 'evaluation'],
-        'education': ['tutor', 'education', 'learning', 'academic', 'reading', 'remediation'],
-        'community': ['support group', 'community', 'parent', 'resource sharing'],
-        'therapy': ['therapy', 'intervention', 'coaching', 'ABA', 'sensory', 'speech', 'occupational']
-    }
-    
-    keywords = type_keywords.get(resource_type, [])
-    filtered_results = []
-    
-    for resource in resources:
-        for service in resource['services']:
-            if any(keyword.lower() in service.lower() for keyword in keywords):
-                filtered_results.append(resource)
-                break
-    
-    return filtered_results
-
 if __name__ == '__main__':
     # Make sure we specify host='0.0.0.0' to allow external connections
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
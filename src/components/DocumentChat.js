@@ -1,8 +1,28 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { Upload, Send, File, X, Loader, MessageCircle, Trash2 } from 'lucide-react';
-import { uploadDocument, queryDocument, listDocuments, clearAllData } from '../services/RAGService';
+import { uploadDocument, queryDocumentStream, listDocuments, clearAllData } from '../services/RAGService';
 import './DocumentChat.css';
 
+const formatTimestamp = (seconds) => {
+    const total = Math.floor(seconds);
+    const hours = Math.floor(total / 3600);
+    const minutes = Math.floor((total % 3600) / 60);
+    const secs = String(total % 60).padStart(2, '0');
+    return hours ? `${hours}:${String(minutes).padStart(2, '0')}:${secs}` : `${minutes}:${secs}`;
+};
+
+const formatSourceLocation = (source) => {
+    if (source.page_start != null) {
+        return source.page_start === source.page_end
+            ? `Page ${source.page_start}`
+            : `Pages ${source.page_start}-${source.page_end}`;
+    }
+    if (source.start_time != null) {
+        return `${formatTimestamp(source.start_time)}-${formatTimestamp(source.end_time)}`;
+    }
+    return `Chunk ${source.chunk}`;
+};
+
 const DocumentChat = () => {
     const [documents, setDocuments] = useState([]);
     const [uploading, setUploading] = useState(false);
@@ -86,17 +106,22 @@ const DocumentChat = () => {
 
         setIsQuerying(true);
 
-        // Query the document
-        const result = await queryDocument(userMessage, conversationHistory);
+        // Stream the answer into a bot message that grows as tokens arrive
+        const botId = Date.now();
+        setMessages(prev => [...prev, { id: botId, type: 'bot', content: '', sources: [] }]);
+        const updateBotMessage = (update) => {
+            setMessages(prev => prev.map(message => (
+                message.id === botId ? { ...message, ...update(message) } : message
+            )));
+        };
+
+        const result = await queryDocumentStream(userMessage, conversationHistory, {
+            onSources: (sources) => updateBotMessage(() => ({ sources })),
+            onToken: (text) => updateBotMessage((message) => ({ content: message.content + text }))
+        });
 
         if (result.success) {
-            const botMessage = {
-                type: 'bot',
-                content: result.data.answer,
-                sources: result.data.sources
-            };
-            
-            setMessages(prev => [...prev, botMessage]);
+            updateBotMessage(() => ({ content: result.data.answer, sources: result.data.sources }));
             
             // Update conversation history
             setConversationHistory(prev => [
@@ -105,10 +130,11 @@ const DocumentChat = () => {
                 { role: 'assistant', content: result.data.answer }
             ]);
         } else {
-            setMessages(prev => [...prev, {
+            updateBotMessage(() => ({
                 type: 'system',
-                content: `❌ Error: ${result.error}`
-            }]);
+                content: `❌ Error: ${result.error}`,
+                sources: []
+            }));
         }
 
         setIsQuerying(false);
@@ -225,7 +251,7 @@ const DocumentChat = () => {
                                         <strong>📚 Sources:</strong>
                                         {message.sources.map((source, idx) => (
                                             <div key={idx} className="source-item">
-                                                {source.filename} (Chunk {source.chunk})
+                                                {source.filename} ({formatSourceLocation(source)})
                                             </div>
                                         ))}
                                     </div>
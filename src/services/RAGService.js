@@ -2,12 +2,47 @@ import axios from 'axios';
 
 const RAG_API_URL = 'http://localhost:8000/api';
 
+const JOB_POLL_INTERVAL_MS = 1000;
+
+/**
+ * Get the status of a background ingestion job
+ * @param {string} jobId - Job ID returned by an upload
+ * @returns {Promise} Job with status, stage, progress (0-100) and result
+ */
+export const getJob = async (jobId) => {
+    const response = await axios.get(`${RAG_API_URL}/jobs/${jobId}`, { timeout: 10000 });
+    return response.data;
+};
+
+/**
+ * Poll an ingestion job until it finishes
+ * @param {string} jobId - Job ID returned by an upload
+ * @param {Function} onProgress - Called with (percent, stage) while the job runs (optional)
+ * @returns {Promise} The job's processing result
+ */
+export const waitForJob = async (jobId, onProgress = null) => {
+    for (;;) {
+        const job = await getJob(jobId);
+        if (onProgress) {
+            onProgress(Math.round(job.progress), job.stage);
+        }
+        if (job.status === 'succeeded') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Processing failed');
+        }
+        await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+};
+
 /**
  * Upload a PDF document for processing
  * @param {File} file - PDF file to upload
+ * @param {Function} onProgress - Processing progress callback (optional)
  * @returns {Promise} Response with processing results
  */
-export const uploadDocument = async (file) => {
+export const uploadDocument = async (file, onProgress = null) => {
     try {
         const formData = new FormData();
         formData.append('file', file);
@@ -19,13 +54,18 @@ export const uploadDocument = async (file) => {
                 headers: {
                     'Content-Type': 'multipart/form-data'
                 },
-                timeout: 60000 // 60 seconds for large PDFs
+                timeout: 60000 // upload only; processing runs as a background job
             }
         );
         
+        // Already-indexed content is answered directly; everything else is a job to follow
+        const data = response.data.job_id
+            ? await waitForJob(response.data.job_id, onProgress)
+            : response.data;
+        
         return {
             success: true,
-            data: response.data
+            data
         };
         
     } catch (error) {
@@ -55,7 +95,7 @@ export const uploadAudio = async (file, onProgress = null) => {
                 headers: {
                     'Content-Type': 'multipart/form-data'
                 },
-                timeout: 300000, // 5 minutes for audio transcription
+                timeout: 60000, // upload only; transcription runs as a background job
                 onUploadProgress: (progressEvent) => {
                     if (onProgress) {
                         const percentCompleted = Math.round(
@@ -67,9 +107,13 @@ export const uploadAudio = async (file, onProgress = null) => {
             }
         );
         
+        const data = response.data.job_id
+            ? await waitForJob(response.data.job_id)
+            : response.data;
+        
         return {
             success: true,
-            data: response.data
+            data
         };
         
     } catch (error) {
@@ -85,15 +129,19 @@ export const uploadAudio = async (file, onProgress = null) => {
  * Query documents with a question
  * @param {string} question - User's question
  * @param {Array} conversationHistory - Previous conversation for context
+ * @param {Object} filters - Optional { docId, pageFrom, pageTo } retrieval filters
  * @returns {Promise} Response with answer and sources
  */
-export const queryDocument = async (question, conversationHistory = []) => {
+export const queryDocument = async (question, conversationHistory = [], filters = {}) => {
     try {
         const response = await axios.post(
             `${RAG_API_URL}/query-document`,
             {
                 question: question,
-                conversation_history: conversationHistory
+                conversation_history: conversationHistory,
+                doc_id: filters.docId,
+                page_from: filters.pageFrom,
+                page_to: filters.pageTo
             },
             {
                 timeout: 60000 // 60 seconds for LLM response
@@ -114,6 +162,122 @@ export const queryDocument = async (question, conversationHistory = []) => {
     }
 };
 
+/**
+ * Retrieve the top chunks for several questions in one request (no answers generated),
+ * e.g. to prefetch context for likely follow-up questions
+ * @param {Array<string>} questions - Questions to retrieve for
+ * @param {number} k - Chunks per question
+ * @param {Object} filters - Optional { docId, pageFrom, pageTo } retrieval filters
+ * @returns {Promise} Response with one { question, chunks } entry per question
+ */
+export const retrieveBatch = async (questions, k = 3, filters = {}) => {
+    try {
+        const response = await axios.post(
+            `${RAG_API_URL}/retrieve/batch`,
+            {
+                questions: questions,
+                k: k,
+                doc_id: filters.docId,
+                page_from: filters.pageFrom,
+                page_to: filters.pageTo
+            },
+            {
+                timeout: 30000
+            }
+        );
+        
+        return {
+            success: true,
+            data: response.data
+        };
+        
+    } catch (error) {
+        console.error('Error retrieving batch:', error);
+        return {
+            success: false,
+            error: error.response?.data?.detail || error.message || 'Retrieval failed'
+        };
+    }
+};
+
+/**
+ * Query documents and stream the answer as it is generated (server-sent events)
+ * @param {string} question - User's question
+ * @param {Array} conversationHistory - Previous conversation for context
+ * @param {Object} handlers - { onSources(sources), onToken(text), signal } (all optional);
+ *     aborting the signal stops generation on the server
+ * @param {Object} filters - Optional { docId, pageFrom, pageTo } retrieval filters
+ * @returns {Promise} Response with the full answer, sources and timing
+ */
+export const queryDocumentStream = async (question, conversationHistory = [], handlers = {}, filters = {}) => {
+    try {
+        const response = await fetch(`${RAG_API_URL}/query-document/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                question: question,
+                conversation_history: conversationHistory,
+                doc_id: filters.docId,
+                page_from: filters.pageFrom,
+                page_to: filters.pageTo
+            }),
+            signal: handlers.signal
+        });
+        
+        if (!response.ok) {
+            const body = await response.json().catch(() => ({}));
+            throw new Error(body.detail || `Query failed (${response.status})`);
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let sources = [];
+        
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            // SSE events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const raw = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                const dataLine = raw.split('\n').find((line) => line.startsWith('data: '));
+                if (!dataLine) continue;
+                
+                const event = JSON.parse(dataLine.slice(6));
+                if (event.type === 'sources') {
+                    sources = event.sources;
+                    if (handlers.onSources) handlers.onSources(sources);
+                } else if (event.type === 'token') {
+                    if (handlers.onToken) handlers.onToken(event.text);
+                } else if (event.type === 'done') {
+                    return {
+                        success: true,
+                        data: { ...event, sources }
+                    };
+                } else if (event.type === 'error') {
+                    throw new Error(event.error);
+                }
+            }
+        }
+        
+        throw new Error('Stream ended before the answer was complete');
+        
+    } catch (error) {
+        if (error.name === 'AbortError') {
+            return { success: false, cancelled: true, error: 'Cancelled' };
+        }
+        console.error('Error streaming query:', error);
+        return {
+            success: false,
+            error: error.message || 'Query failed'
+        };
+    }
+};
+
 /**
  * List all uploaded documents
  * @returns {Promise} List of documents
@@ -205,8 +369,12 @@ export const checkRAGService = async () => {
 
 export default {
     uploadDocument,
+    getJob,
+    waitForJob,
     uploadAudio,
     queryDocument,
+    queryDocumentStream,
+    retrieveBatch,
     listDocuments,
     clearAllData,
     getRAGStats,
@@ -27,7 +27,7 @@ source venv/bin/activate
 
 # Install required Python packages in the virtual environment
 echo "Installing required Python packages..."
-pip install flask flask-cors requests python-dotenv
+pip install flask flask-cors requests python-dotenv numpy
 
 # Start the server
 echo "Starting server on http://localhost:5001..."
@@ -0,0 +1,63 @@
+"""
+EmotionBatcher grouping against a fake model that normalises over the padded batch
+A clip must get the same prediction alone as when it shares a batch with a longer clip
+
+Usage (from the repository root):
+    python -m pytest tests/test_emotion_batcher.py
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from emotion_batcher import EmotionBatcher  # noqa: E402
+
+SR = 16000
+
+
+def padded_group_norm_predict(waveforms):
+    """Pads to the longest clip and normalises each row over its full padded length, like Wav2Vec2"""
+    longest = max(len(waveform) for waveform in waveforms)
+    batch = np.stack([np.pad(waveform, (0, longest - len(waveform))) for waveform in waveforms])
+    normalised = (batch - batch.mean(axis=1, keepdims=True)) / (batch.std(axis=1, keepdims=True) + 1e-5)
+    features = np.stack([np.abs(normalised).mean(axis=1), normalised.max(axis=1)], axis=1)
+    exp = np.exp(features - features.max(axis=1, keepdims=True))
+    return list(exp / exp.sum(axis=1, keepdims=True))
+
+
+def test_clip_prediction_does_not_depend_on_batch_neighbours():
+    rng = np.random.default_rng(3)
+    short_clip = rng.normal(0.5, 0.2, SR).astype(np.float32)
+    long_clip = rng.normal(0.0, 0.3, SR * 3).astype(np.float32)
+    batch_sizes = []
+
+    def predict(waveforms):
+        batch_sizes.append(len(waveforms))
+        assert len({len(waveform) for waveform in waveforms}) == 1
+        return padded_group_norm_predict(waveforms)
+
+    async def main():
+        batcher = EmotionBatcher(predict, max_batch_size=8, max_wait_ms=50)
+        await batcher.start()
+        try:
+            alone = await batcher.submit(short_clip)
+            together = await asyncio.gather(
+                batcher.submit(short_clip), batcher.submit(long_clip), batcher.submit(short_clip)
+            )
+        finally:
+            await batcher.stop()
+        return alone, together, batcher.get_metrics()
+
+    alone, together, metrics = asyncio.run(main())
+
+    np.testing.assert_allclose(together[0], alone, rtol=1e-6)
+    np.testing.assert_allclose(together[2], alone, rtol=1e-6)
+    # The padded model would have shifted the short clip's prediction
+    assert not np.allclose(padded_group_norm_predict([short_clip, long_clip])[0], alone)
+    assert batch_sizes == [1, 2, 1]
+    assert metrics["total_clips"] == 4 and metrics["batch_size_histogram"] == {"1": 2, "2": 1}
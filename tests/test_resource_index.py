@@ -0,0 +1,75 @@
+"""
+Resource catalog loading, the local spatial index and distance ranking
+Catalog rows only need name, lat and lon; everything else is optional
+
+Usage (from the repository root):
+    python -m pytest tests/test_resource_index.py
+"""
+
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from catalog_index import ServiceTypeClassifier  # noqa: E402
+from geo import nearest_resources  # noqa: E402
+from resource_index import ResourceIndex, load_catalog  # noqa: E402
+
+CENTER = (17.385, 78.4867)
+
+
+def test_catalog_entry_without_address_is_indexed_and_ranked(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps([
+        {"name": "Speech Clinic", "lat": CENTER[0] + 0.01, "lon": CENTER[1], "category": "therapy"},
+        {"name": "Reading Centre", "address": "12 Road", "lat": CENTER[0], "lon": CENTER[1] + 0.02,
+         "category": "therapy"}
+    ]))
+
+    catalog = load_catalog(str(path))
+    index = ResourceIndex()
+    assert index.add_many(catalog) == 2
+
+    local = index.within_radius(*CENTER, 10, category="therapy")
+    assert [resource["name"] for resource in local] == ["Speech Clinic", "Reading Centre"]
+
+    top, unique = nearest_resources(local + [dict(local[0])], *CENTER, k=20)
+    assert unique == 2
+    assert top[0]["name"] == "Speech Clinic" and "address" not in top[0]
+
+
+def test_csv_catalog_without_address_column(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text(
+        "name,lat,lon,category\n"
+        f"Speech Clinic,{CENTER[0]},{CENTER[1]},therapy\n"
+        "No Coordinates,,,therapy\n"
+    )
+
+    catalog = load_catalog(str(path))
+    assert [resource["name"] for resource in catalog] == ["Speech Clinic"]
+
+    top, unique = nearest_resources(catalog, *CENTER, k=5)
+    assert unique == 1 and top[0]["distance"] == 0.0
+
+
+def test_uncategorised_rows_get_categories_from_services(tmp_path, caplog):
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps([
+        {"name": "Speech Clinic", "lat": CENTER[0], "lon": CENTER[1], "services": ["Speech therapy", "Parent coaching"]},
+        {"name": "Curated", "lat": CENTER[0], "lon": CENTER[1], "category": "healthcare", "services": ["Speech therapy"]},
+        {"name": "Unknown", "lat": CENTER[0], "lon": CENTER[1], "services": ["Weekend sessions"]}
+    ]))
+
+    catalog = {resource["name"]: resource for resource in load_catalog(str(path), ServiceTypeClassifier())}
+    assert catalog["Speech Clinic"]["categories"] == ["community", "therapy"]
+    assert "categories" not in catalog["Curated"]
+    assert catalog["Unknown"]["categories"] == []
+    assert "1 catalog entries" in caplog.text
+
+    index = ResourceIndex()
+    index.add_many(catalog.values())
+    assert [resource["name"] for resource in index.within_radius(*CENTER, 1, category="therapy")] == ["Speech Clinic"]
+    assert [resource["name"] for resource in index.within_radius(*CENTER, 1, category="healthcare")] == ["Curated"]
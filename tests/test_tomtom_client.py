@@ -0,0 +1,138 @@
+"""
+TomTomClient against the local TomTom stub server
+Retries on 503 and 429, Retry-After handling, timeouts and the token-bucket rate limit
+
+Usage (from the repository root):
+    python -m pytest tests/test_tomtom_client.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from tomtom_client import TomTomClient  # noqa: E402
+from tomtom_stub import start_stub  # noqa: E402
+
+CENTER = (17.385, 78.4867)
+
+
+def stub_client(stub_kwargs: dict, **client_kwargs):
+    server, state = start_stub(**{"latency_ms": 0, "jitter_ms": 0, **stub_kwargs})
+    client = TomTomClient(
+        "test-key",
+        base_url=f"http://127.0.0.1:{server.server_port}",
+        **{"rate_per_second": 1000, "backoff_seconds": 0.01, **client_kwargs}
+    )
+    return server, state, client
+
+
+def run(client: TomTomClient, coroutine):
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await client.aclose()
+    return asyncio.run(main())
+
+
+def test_poi_search_succeeds_without_retries():
+    server, state, client = stub_client({"results": 5})
+    try:
+        results = run(client, client.poi_search("speech therapy", *CENTER, radius=5000))
+    finally:
+        server.shutdown()
+
+    assert len(results) == 5
+    assert client.requests == 1 and client.retries == 0 and client.failures == 0
+
+
+def test_persistent_503_is_retried_then_raised():
+    server, state, client = stub_client({"error_rate": 1.0}, max_retries=2)
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            run(client, client.poi_search("speech therapy", *CENTER))
+    finally:
+        server.shutdown()
+
+    assert state.requests == 3
+    assert client.requests == 3 and client.retries == 2 and client.failures == 1
+
+
+def test_429_is_retried_after_retry_after():
+    # Six concurrent searches against a 3 QPS limit: the rejected ones wait out Retry-After: 1
+    server, state, client = stub_client({"qps": 3}, max_retries=2)
+
+    async def searches():
+        return await asyncio.gather(*(client.poi_search(f"term {i}", *CENTER) for i in range(6)))
+
+    try:
+        started = time.monotonic()
+        results = run(client, searches())
+        elapsed = time.monotonic() - started
+    finally:
+        server.shutdown()
+
+    assert all(results)
+    assert state.rejected == 3
+    assert client.retries == 3 and client.failures == 0
+    assert elapsed >= 1.0
+
+
+def test_retry_after_above_max_backoff_fails_fast():
+    server, state, client = stub_client({"qps": 1, "retry_after": 3600}, max_retries=2, max_backoff_seconds=2)
+
+    async def searches():
+        return await asyncio.gather(
+            *(client.poi_search(f"term {i}", *CENTER) for i in range(2)),
+            return_exceptions=True
+        )
+
+    try:
+        started = time.monotonic()
+        results = run(client, searches())
+        elapsed = time.monotonic() - started
+    finally:
+        server.shutdown()
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    assert len(errors) == 1 and errors[0].response.status_code == 429
+    assert client.retries == 0 and client.failures == 1
+    assert elapsed < 1.0
+
+
+def test_timeouts_are_retried_then_raised():
+    server, state, client = stub_client({"latency_ms": 500}, timeout_seconds=0.1, max_retries=1)
+    try:
+        with pytest.raises(httpx.TimeoutException):
+            run(client, client.geocode("banjara hills"))
+    finally:
+        server.shutdown()
+
+    assert client.requests == 2 and client.retries == 1 and client.failures == 1
+
+
+def test_token_bucket_spaces_requests():
+    # 5 requests per second with no burst: six requests need at least one second
+    server, state, client = stub_client({}, rate_per_second=5, burst=1)
+
+    async def searches():
+        return await asyncio.gather(*(client.poi_search(f"term {i}", *CENTER) for i in range(6)))
+
+    try:
+        started = time.monotonic()
+        run(client, searches())
+        elapsed = time.monotonic() - started
+    finally:
+        server.shutdown()
+
+    assert elapsed >= 0.95
+    assert client.bucket.throttled >= 5
+    assert client.retries == 0 and state.rejected == 0
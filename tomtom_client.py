@@ -0,0 +1,189 @@
+"""
+Async TomTom Search API client for the resource finder
+One pooled HTTP/1.1 client shared by all requests, a token-bucket rate limiter instead of fixed
+sleeps, and per-request timeouts with retries on timeouts, connection errors, 429 and 5xx
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+TOMTOM_BASE_URL = "https://api.tomtom.com"
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Async token bucket: rate requests per second on average, bursts of up to capacity"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None  # created on first use, inside the event loop
+
+        # Metrics
+        self.acquired = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+    async def acquire(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Waiters queue on the lock, so tokens are handed out first come, first served
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.acquired += 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+                self.throttled += 1
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+
+
+class TomTomClient:
+    """Geocoding and POI search against the TomTom Search API (or a stub with the same paths)"""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = TOMTOM_BASE_URL,
+        rate_per_second: float = 5.0,
+        burst: Optional[float] = None,
+        timeout_seconds: float = 5.0,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.25,
+        max_backoff_seconds: float = 5.0,
+        max_connections: int = 20
+    ):
+        """
+        Args:
+            api_key: TomTom API key
+            base_url: API root; point it at a local stub server for tests and benchmarks
+            rate_per_second: Sustained request rate allowed by the API key (QPS limit)
+            burst: Requests allowed back to back before throttling (defaults to rate_per_second)
+            timeout_seconds: Per-attempt timeout (connect + read)
+            max_retries: Extra attempts after a timeout, connection error, 429 or 5xx
+            backoff_seconds: Base of the exponential backoff between attempts (with jitter)
+            max_backoff_seconds: Longest wait before a retry; a Retry-After asking for more
+                fails the request instead of holding the caller
+            max_connections: Size of the keep-alive connection pool
+        """
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_connections = max_connections
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Metrics
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+        self._total_latency = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout_seconds),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None if the server asks for longer than we wait"""
+        if response is not None and response.headers.get("Retry-After"):
+            try:
+                retry_after = float(response.headers["Retry-After"])
+            except ValueError:
+                pass
+            else:
+                return max(0.0, retry_after) if retry_after <= self.max_backoff_seconds else None
+        return min(self.max_backoff_seconds, self.backoff_seconds * (2 ** attempt) * (0.5 + random.random()))
+
+    async def get_json(self, path: str, params: Dict) -> Dict:
+        """GET a Search API path with rate limiting, timeout and retries"""
+        params = {"key": self.api_key, **params}
+        attempt = 0
+        while True:
+            await self.bucket.acquire()
+            self.requests += 1
+            self.in_flight += 1
+            started = time.perf_counter()
+            response = None
+            try:
+                response = await self.client.get(path, params=params)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response.json()
+                error: Exception = httpx.HTTPStatusError(
+                    f"HTTP {response.status_code}", request=response.request, response=response
+                )
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                error = e
+            finally:
+                self.in_flight -= 1
+                self._total_latency += time.perf_counter() - started
+
+            delay = self._backoff(attempt, response) if attempt < self.max_retries else None
+            if delay is None:
+                self.failures += 1
+                raise error
+            attempt += 1
+            self.retries += 1
+            logger.debug(f"TomTom {path} failed ({error!r}), retry {attempt} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def geocode(self, location: str) -> Tuple[Optional[float], Optional[float]]:
+        data = await self.get_json(f"/search/2/geocode/{quote(location, safe='')}.json", {"limit": 1})
+        if data.get("results"):
+            position = data["results"][0]["position"]
+            return position["lat"], position["lon"]
+        return None, None
+
+    async def poi_search(self, term: str, lat: float, lon: float, radius: int = 10000, limit: int = 10) -> List[Dict]:
+        """Raw POI results for one search term around a point"""
+        data = await self.get_json(
+            f"/search/2/poiSearch/{quote(term, safe='')}.json",
+            {"lat": lat, "lon": lon, "radius": radius, "limit": limit, "view": "Unified"}
+        )
+        return data.get("results") or []
+
+    def get_metrics(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "avg_latency_ms": round(self._total_latency / self.requests * 1000, 2) if self.requests else None,
+            "rate_per_second": self.bucket.rate,
+            "throttled": self.bucket.throttled,
+            "throttle_wait_seconds": round(self.bucket.waited_seconds, 3)
+        }
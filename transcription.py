@@ -0,0 +1,211 @@
+"""
+Segmented Whisper transcription
+Drops silence with an energy-based voice activity detector, cuts speech into bounded segments,
+transcribes them in parallel worker processes and stitches the text back with timestamps
+"""
+
+import logging
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_io import TARGET_SAMPLE_RATE
+from whisper_backends import WHISPER_AVAILABLE, load_whisper_backend, resolve_backend
+
+if not WHISPER_AVAILABLE:
+    logging.warning("Whisper not available. Audio processing will be disabled.")
+
+logger = logging.getLogger(__name__)
+
+# Transcription backends loaded inside worker processes, keyed by (backend, model size)
+_worker_whisper_models = {}
+
+# Whisper decodes 30 s windows; longer segments are cut at the quietest nearby frame
+MAX_SEGMENT_SECONDS = 30.0
+
+
+def get_whisper_backend(model_size: str = "base", backend: str = "auto"):
+    """Return the backend cached in the current process, loading it on first use"""
+    if not WHISPER_AVAILABLE:
+        raise RuntimeError("Whisper model not available")
+    key = (resolve_backend(backend), model_size)
+    if key not in _worker_whisper_models:
+        _worker_whisper_models[key] = load_whisper_backend(key[0], model_size)
+    return _worker_whisper_models[key]
+
+
+def preload_whisper(model_size: str = "base", backend: str = "auto") -> bool:
+    """Load a Whisper backend into the current (worker) process ahead of the first segment"""
+    get_whisper_backend(model_size, backend)
+    return True
+
+
+def detect_speech_segments(
+    audio: np.ndarray,
+    sample_rate: int = TARGET_SAMPLE_RATE,
+    frame_ms: float = 30.0,
+    threshold_db: float = 12.0,
+    floor_db: float = -50.0,
+    min_silence_ms: float = 600.0,
+    min_speech_ms: float = 250.0,
+    pad_ms: float = 200.0,
+    max_segment_seconds: float = MAX_SEGMENT_SECONDS
+) -> List[Tuple[int, int]]:
+    """
+    Energy-based voice activity detection
+
+    A frame is speech when its RMS level is threshold_db above the recording's noise
+    floor (10th percentile frame level) and above floor_db. Speech runs separated by
+    less than min_silence_ms are merged, runs shorter than min_speech_ms are dropped,
+    and anything longer than max_segment_seconds is split at its quietest frame.
+
+    Returns:
+        List of (start_sample, end_sample)
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return [(0, len(audio))] if len(audio) else []
+
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    level_db = 20 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10)
+    noise_floor = np.percentile(level_db, 10)
+    voiced = level_db > max(floor_db, noise_floor + threshold_db)
+
+    # Speech runs as [start_frame, end_frame)
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    runs = list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+    if not runs:
+        return []
+
+    min_gap = int(min_silence_ms / frame_ms)
+    merged = [list(runs[0])]
+    for start, end in runs[1:]:
+        if start - merged[-1][1] < min_gap:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    min_frames = max(1, int(min_speech_ms / frame_ms))
+    pad = int(pad_ms / frame_ms)
+    max_frames = max(1, int(max_segment_seconds * 1000 / frame_ms))
+
+    segments = []
+    for start, end in merged:
+        if end - start < min_frames:
+            continue
+        start, end = max(0, start - pad), min(n_frames, end + pad)
+        while end - start > max_frames:
+            # Cut in the quietest frame of the last third of the window, not mid-word
+            window_start = start + max_frames * 2 // 3
+            cut = window_start + int(np.argmin(level_db[window_start:start + max_frames]))
+            segments.append((start, cut))
+            start = cut
+        segments.append((start, end))
+
+    return [(int(start) * frame, min(len(audio), int(end) * frame)) for start, end in segments]
+
+
+def transcribe_segment(
+    audio: np.ndarray,
+    offset_seconds: float,
+    model_size: str = "base",
+    model=None,
+    backend: str = "auto"
+) -> List[Dict]:
+    """
+    Transcribe one speech segment; timestamps are shifted to the original recording
+
+    Module-level so it can run in a process pool (each worker keeps its own backend).
+    """
+    if model is None:
+        model = get_whisper_backend(model_size, backend)
+
+    # Segments are independent, so earlier text must not steer decoding
+    result = model.transcribe(audio, condition_on_previous_text=False)
+    segments = [
+        {
+            "start": round(float(offset_seconds + segment["start"]), 2),
+            "end": round(float(offset_seconds + segment["end"]), 2),
+            "text": segment["text"]
+        }
+        for segment in result["segments"] if segment["text"]
+    ]
+    if not segments and result["text"]:
+        segments.append({
+            "start": round(offset_seconds, 2),
+            "end": round(offset_seconds + len(audio) / TARGET_SAMPLE_RATE, 2),
+            "text": result["text"]
+        })
+    return segments
+
+
+def transcribe_segmented(
+    audio: np.ndarray,
+    executor: Optional[Executor] = None,
+    model_size: str = "base",
+    model=None,
+    backend: str = "auto",
+    max_in_flight: int = 8,
+    progress: Optional[Callable[[str, int, Optional[int]], None]] = None
+) -> Dict:
+    """
+    Transcribe a long recording segment by segment
+
+    Args:
+        audio: float32 mono samples at 16 kHz
+        executor: Process pool to decode segments in parallel (sequential in-process when None)
+        model_size: Whisper model size loaded by each worker
+        model: Already-loaded backend for the sequential path (loaded lazily when None)
+        backend: "auto", "openai" or "faster" for backends loaded here or in workers
+        max_in_flight: Segments submitted to the executor at once (bounds memory)
+        progress: Optional callback(stage, done, total), called per finished segment
+
+    Returns:
+        Dict with the stitched text, timestamped segments, and speech/total durations
+    """
+    speech = detect_speech_segments(audio)
+    duration = len(audio) / TARGET_SAMPLE_RATE
+    speech_seconds = sum(end - start for start, end in speech) / TARGET_SAMPLE_RATE
+    logger.info(
+        f"VAD: {len(speech)} speech segments, {speech_seconds:.1f}s of {duration:.1f}s audio"
+    )
+
+    results: List[List[Dict]] = []
+    done = 0
+
+    def finished(segment_result: List[Dict]):
+        nonlocal done
+        results.append(segment_result)
+        done += 1
+        if progress is not None:
+            progress("transcribing", done, len(speech))
+
+    if executor is None:
+        for start, end in speech:
+            finished(transcribe_segment(audio[start:end], start / TARGET_SAMPLE_RATE, model_size, model, backend))
+    else:
+        # Results are collected in submission order, so the stitched text stays chronological
+        pending = deque()
+        queued = deque(speech)
+        try:
+            while queued or pending:
+                while queued and len(pending) < max_in_flight:
+                    start, end = queued.popleft()
+                    pending.append(executor.submit(
+                        transcribe_segment, audio[start:end], start / TARGET_SAMPLE_RATE, model_size, None, backend
+                    ))
+                finished(pending.popleft().result())
+        finally:
+            for future in pending:
+                future.cancel()
+
+    segments = [segment for segment_result in results for segment in segment_result]
+    return {
+        "text": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+        "duration_seconds": round(duration, 2),
+        "speech_seconds": round(speech_seconds, 2)
+    }
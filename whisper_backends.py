@@ -0,0 +1,124 @@
+"""
+Speech-to-text backends for transcription
+OpenAI Whisper (PyTorch fp32) and faster-whisper (CTranslate2, int8 on CPU), selected by configuration
+and loaded on first use
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+try:
+    import whisper
+    OPENAI_WHISPER_AVAILABLE = True
+except ImportError:
+    OPENAI_WHISPER_AVAILABLE = False
+
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+WHISPER_AVAILABLE = OPENAI_WHISPER_AVAILABLE or FASTER_WHISPER_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+# "auto" picks faster-whisper when it is installed
+BACKENDS = ("auto", "openai", "faster")
+MODEL_SIZES = ("tiny", "base", "small")
+
+
+class OpenAIWhisperBackend:
+    """Reference openai-whisper model (PyTorch, fp32 on CPU)"""
+
+    name = "openai"
+
+    def __init__(self, model_size: str = "base", device: str = "cpu"):
+        self.model_size = model_size
+        self.model = whisper.load_model(model_size, device=device)
+
+    def transcribe(self, audio: Union[str, np.ndarray], condition_on_previous_text: bool = True) -> Dict:
+        """Return {"text", "segments": [{start, end, text}]} with times relative to the input"""
+        result = self.model.transcribe(
+            audio,
+            fp16=False,
+            condition_on_previous_text=condition_on_previous_text
+        )
+        segments = [
+            {"start": float(s["start"]), "end": float(s["end"]), "text": s["text"].strip()}
+            for s in result.get("segments") or []
+        ]
+        return {"text": result["text"].strip(), "segments": segments}
+
+
+class FasterWhisperBackend:
+    """CTranslate2 reimplementation with int8 weights on CPU"""
+
+    name = "faster"
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0
+    ):
+        """
+        Args:
+            compute_type: CTranslate2 weight type ("int8", "int8_float32", "float32")
+            cpu_threads: Threads per model (0 = CTranslate2 default); keep low when
+                several worker processes each hold a model
+        """
+        self.model_size = model_size
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+    def transcribe(self, audio: Union[str, np.ndarray], condition_on_previous_text: bool = True) -> Dict:
+        segments_iter, _ = self.model.transcribe(
+            audio,
+            beam_size=5,
+            condition_on_previous_text=condition_on_previous_text
+        )
+        segments: List[Dict] = [
+            {"start": float(s.start), "end": float(s.end), "text": s.text.strip()}
+            for s in segments_iter
+        ]
+        return {"text": " ".join(s["text"] for s in segments if s["text"]), "segments": segments}
+
+
+def resolve_backend(backend: str) -> str:
+    """Map "auto" to the best installed implementation"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown Whisper backend '{backend}', expected one of {BACKENDS}")
+    if backend == "auto":
+        return "faster" if FASTER_WHISPER_AVAILABLE else "openai"
+    return backend
+
+
+def load_whisper_backend(backend: str = "auto", model_size: str = "base", cpu_threads: Optional[int] = None):
+    """
+    Load a transcription backend
+
+    Args:
+        backend: "auto", "openai" or "faster"
+        model_size: "tiny", "base" or "small"
+        cpu_threads: Threads for the faster-whisper model (WHISPER_CPU_THREADS env by default)
+    """
+    if model_size not in MODEL_SIZES:
+        raise ValueError(f"Unknown Whisper model size '{model_size}', expected one of {MODEL_SIZES}")
+
+    backend = resolve_backend(backend)
+    if backend == "faster":
+        if not FASTER_WHISPER_AVAILABLE:
+            raise RuntimeError("faster-whisper is not installed")
+        if cpu_threads is None:
+            cpu_threads = int(os.getenv("WHISPER_CPU_THREADS", "0"))
+        logger.info(f"Loading faster-whisper '{model_size}' (int8) in process {os.getpid()}")
+        return FasterWhisperBackend(model_size, compute_type="int8", cpu_threads=cpu_threads)
+
+    if not OPENAI_WHISPER_AVAILABLE:
+        raise RuntimeError("Whisper model not available")
+    logger.info(f"Loading Whisper '{model_size}' in process {os.getpid()}")
+    return OpenAIWhisperBackend(model_size)